@@ -3,6 +3,10 @@ from flask_cors import CORS
 from config import Config
 from extensions import db, migrate, jwt
 from routes import register_blueprints
+from commands import register_commands
+from services.ai_summary_service import single_flight_stats
+from services.llm_limiter import llm_limiter_stats
+from services.summary_jobs import summary_refresh_stats
 
 
 def create_app():
@@ -14,15 +18,34 @@ def create_app():
     migrate.init_app(app, db)
     jwt.init_app(app)
 
-    CORS(app, resources={r"/api/*": {"origins": "*"}})
+    CORS(
+        app,
+        resources={r"/api/*": {"origins": "*"}},
+        # cursor da próxima página e aviso de delta incompleto nas listagens sem envelope
+        expose_headers=["X-Next-Cursor", "X-Has-More"],
+    )
 
     # Blueprints
     register_blueprints(app)
 
+    # Comandos de CLI (flask ...)
+    register_commands(app)
+
     @app.route("/api/health", methods=["GET"])
     def health():
         return jsonify({"status": "ok"})
 
+    @app.route("/api/metrics", methods=["GET"])
+    def metrics():
+        """Contadores internos do processo, para monitoramento."""
+        return jsonify(
+            {
+                "summary_single_flight": single_flight_stats(),
+                "summary_refresh": summary_refresh_stats(),
+                "llm": llm_limiter_stats(),
+            }
+        )
+
     return app
 
 
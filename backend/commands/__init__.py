@@ -0,0 +1,10 @@
+from .notifications_commands import notifications_cli
+from .reminders_commands import reminders_cli
+from .triage_commands import triage_cli
+
+
+def register_commands(app):
+    # comandos de manutenção: flask <grupo> <comando>
+    app.cli.add_command(notifications_cli)
+    app.cli.add_command(triage_cli)
+    app.cli.add_command(reminders_cli)
@@ -0,0 +1,76 @@
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from services.notification_maintenance import (
+    MODE_ARCHIVE,
+    MODE_DELETE,
+    prune_notifications,
+)
+
+notifications_cli = AppGroup("notifications", help="Manutenção das notificações.")
+
+
+@notifications_cli.command("prune")
+@click.option(
+    "--older-than-days",
+    type=int,
+    default=None,
+    help="Idade mínima das notificações lidas (padrão: NOTIFICATION_RETENTION_DAYS).",
+)
+@click.option("--batch-size", type=int, default=1000, show_default=True)
+@click.option(
+    "--mode",
+    type=click.Choice([MODE_DELETE, MODE_ARCHIVE]),
+    default=MODE_DELETE,
+    show_default=True,
+    help="Apagar ou mover para notifications_archive.",
+)
+@click.option(
+    "--collapse/--no-collapse",
+    default=False,
+    help="Junta notificações lidas repetidas (mesmo usuário, tipo e link).",
+)
+@click.option(
+    "--collapse-older-than-days",
+    type=int,
+    default=None,
+    help="Só junta repetidas com pelo menos esta idade (padrão: NOTIFICATION_COLLAPSE_DAYS).",
+)
+@click.option(
+    "--pause",
+    type=float,
+    default=0.05,
+    show_default=True,
+    help="Segundos de pausa entre lotes.",
+)
+@click.option("--dry-run", is_flag=True, help="Só conta o que seria processado.")
+def prune(
+    older_than_days, batch_size, mode, collapse, collapse_older_than_days, pause, dry_run
+):
+    """Remove/arquiva notificações lidas antigas, em lotes."""
+    if older_than_days is None:
+        older_than_days = current_app.config.get("NOTIFICATION_RETENTION_DAYS", 90)
+    if collapse_older_than_days is None:
+        collapse_older_than_days = current_app.config.get("NOTIFICATION_COLLAPSE_DAYS", 7)
+
+    def report(step, processed, total, rate):
+        click.echo(f"[{step}] lote de {processed} (total {total}, {rate:.1f} linhas/s)")
+
+    result = prune_notifications(
+        older_than_days=older_than_days,
+        batch_size=batch_size,
+        mode=mode,
+        collapse=collapse,
+        collapse_older_than_days=collapse_older_than_days,
+        dry_run=dry_run,
+        pause_seconds=pause,
+        report=report,
+    )
+
+    prefix = "[dry-run] " if dry_run else ""
+    click.echo(
+        f"{prefix}expiradas: {result.get('expired', 0)}, "
+        f"repetidas: {result.get('collapsed', 0)}, "
+        f"{result['seconds']}s ({result['rows_per_second']} linhas/s)"
+    )
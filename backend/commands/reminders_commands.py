@@ -0,0 +1,44 @@
+import time
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from services.reminders import run_reminders
+
+reminders_cli = AppGroup("reminders", help="Lembretes automáticos.")
+
+
+@reminders_cli.command("run")
+@click.option("--once", is_flag=True, help="Faz uma varredura e sai.")
+@click.option(
+    "--interval",
+    type=float,
+    default=None,
+    help="Segundos entre varreduras (padrão: REMINDER_SCAN_INTERVAL_SECONDS).",
+)
+@click.option("--batch-size", type=int, default=500, show_default=True)
+def run(once, interval, batch_size):
+    """Agendador: envia lembretes de consultas, vacinas e retornos."""
+    config = current_app.config
+    if interval is None:
+        interval = config.get("REMINDER_SCAN_INTERVAL_SECONDS", 300)
+
+    def report(kind, processed, total, rate):
+        click.echo(f"[{kind}] lote de {processed} (total {total}, {rate:.1f} linhas/s)")
+
+    while True:
+        result = run_reminders(
+            batch_size=batch_size,
+            appointment_lead_hours=config.get("REMINDER_APPOINTMENT_LEAD_HOURS", 24),
+            due_days_ahead=config.get("REMINDER_DUE_DAYS_AHEAD", 7),
+            report=report,
+        )
+        click.echo(
+            f"consultas: {result['appointment']}, vacinas: {result['vaccine']}, "
+            f"retornos: {result['next_visit']}, {result['seconds']}s "
+            f"({result['rows_per_second']} linhas/s)"
+        )
+        if once:
+            return
+        time.sleep(interval)
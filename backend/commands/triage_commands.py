@@ -0,0 +1,108 @@
+import random
+import time
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from services.triage_rescore import rescore_triages
+from services.triage_rules import (
+    LEVEL_WARNING,
+    RuleMatcher,
+    TriageRule,
+    fold_text,
+    get_rule_set,
+)
+
+triage_cli = AppGroup("triage", help="Regras de triagem.")
+
+_SAMPLE_TEXTS = [
+    "Meu cachorro está vomitando desde ontem e não come nada, parece com febre.",
+    "A gata está mancando da pata traseira e se coçando muito perto da orelha.",
+    "Ele teve uma convulsão agora há pouco e está com dificuldade para respirar.",
+    "Está um pouco quieto hoje, mas bebe água e brinca normalmente.",
+]
+
+
+def _synthetic_rules(count: int, rng: random.Random):
+    """Regras em uso + termos aleatórios até `count` termos no total."""
+    rules = list(get_rule_set().default.matcher.rules)
+    total = sum(len(r.terms) for r in rules)
+    index = 0
+    while total < count:
+        term = "".join(rng.choice("abcdefghijlmnoprstuvxz") for _ in range(rng.randint(5, 12)))
+        rules.append(TriageRule(f"sintetica_{index}", LEVEL_WARNING, (term,)))
+        index += 1
+        total += 1
+    return rules
+
+
+def _per_call_us(fn, texts, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for text in texts:
+            fn(text)
+    return (time.perf_counter() - started) / (iterations * len(texts)) * 1e6
+
+
+@triage_cli.command("benchmark")
+@click.option(
+    "--sizes",
+    default="25,100,1000,5000",
+    show_default=True,
+    help="Quantidades de termos a comparar (separadas por vírgula).",
+)
+@click.option("--iterations", type=int, default=200, show_default=True)
+def benchmark(sizes, iterations):
+    """Custo por chamada: autômato compilado x uma busca por termo."""
+    rng = random.Random(42)
+    click.echo(f"{'termos':>8} {'autômato (µs)':>15} {'busca por termo (µs)':>22}")
+
+    for size in (int(s) for s in sizes.split(",") if s.strip()):
+        rules = _synthetic_rules(size, rng)
+        matcher = RuleMatcher(rules)
+        terms = [fold_text(t) for r in rules for t in r.terms]
+
+        def naive(text):
+            folded = fold_text(text)
+            return sum(1 for t in terms if t in folded)
+
+        compiled_us = _per_call_us(matcher.match, _SAMPLE_TEXTS, iterations)
+        naive_us = _per_call_us(naive, _SAMPLE_TEXTS, iterations)
+        click.echo(f"{size:>8} {compiled_us:>15.1f} {naive_us:>22.1f}")
+
+
+@triage_cli.command("rescore")
+@click.option("--chunk-size", type=int, default=500, show_default=True)
+@click.option("--workers", type=int, default=None, help="Processos (padrão: CPUs).")
+@click.option(
+    "--rules",
+    "rules_path",
+    default=None,
+    help="Arquivo de regras (padrão: TRIAGE_RULES_PATH).",
+)
+@click.option(
+    "--apply",
+    is_flag=True,
+    help="Grava o novo resultado; sem isso só mostra o drift.",
+)
+def rescore(chunk_size, workers, rules_path, apply):
+    """Reavalia as triagens gravadas com as regras atuais e mostra o drift."""
+    rules_path = rules_path or current_app.config["TRIAGE_RULES_PATH"]
+
+    def report(total, rate):
+        click.echo(f"{total} triagens ({rate:.1f} linhas/s)")
+
+    result = rescore_triages(
+        rules_path, chunk_size=chunk_size, workers=workers, apply=apply, report=report
+    )
+
+    click.echo(
+        f"versão {result['version']}: {result['processed']} triagens, "
+        f"{result['changed']} mudaram de risco, {result['seconds']}s "
+        f"({result['rows_per_second']} linhas/s)"
+    )
+    for transition, count in result["drift"].items():
+        click.echo(f"  {transition}: {count}")
+    if not apply:
+        click.echo("(dry-run: use --apply para gravar)")
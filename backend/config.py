@@ -16,5 +16,69 @@ class Config:
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "troca_essa_chave_por_uma_bem_grande")
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
 
+    # Threads que executam os jobs de resumo (IA) fora da request
+    SUMMARY_JOB_WORKERS = int(os.getenv("SUMMARY_JOB_WORKERS", "2"))
+
+    # Espera após a última consulta registrada antes de regerar o resumo do pet
+    SUMMARY_REFRESH_DEBOUNCE_SECONDS = float(
+        os.getenv("SUMMARY_REFRESH_DEBOUNCE_SECONDS", "30")
+    )
+
+    # Cache de resumos (tabela consultation_summaries)
+    SUMMARY_CACHE_TTL_MINUTES = int(os.getenv("SUMMARY_CACHE_TTL_MINUTES", "30"))
+    SUMMARY_CACHE_MAX_ENTRIES = int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "5000"))
+
+    # Lock consultivo no Postgres para não gerar o mesmo resumo em dois processos.
+    # Cada resumo em geração segura uma conexão do pool até o fim do LLM (até
+    # LLM_MAX_CONCURRENCY + LLM_MAX_QUEUE por processo): o pool padrão
+    # (5 + 10 de overflow) comporta os valores padrão; se aumentar os limites
+    # do LLM, aumente o pool junto (SQLALCHEMY_ENGINE_OPTIONS)
+    SUMMARY_SINGLE_FLIGHT_DB_LOCK = os.getenv("SUMMARY_SINGLE_FLIGHT_DB_LOCK", "1") == "1"
+
+    # Engine dos resumos: "llm", "extractive" ou "llm_with_extractive_fallback"
+    SUMMARY_ENGINE = os.getenv("SUMMARY_ENGINE", "llm_with_extractive_fallback")
+
+    # Limites das chamadas ao LLM local (por processo)
+    LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "2"))
+    LLM_MAX_QUEUE = int(os.getenv("LLM_MAX_QUEUE", "8"))
+    LLM_QUEUE_TIMEOUT_SECONDS = float(os.getenv("LLM_QUEUE_TIMEOUT_SECONDS", "10"))
+    # prazo total de cada geração (também usado como timeout de leitura do httpx)
+    LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "120"))
+
+    # Pub/sub das notificações em tempo real ("pacote.modulo:Classe"; vazio = em memória)
+    NOTIFICATION_BROKER = os.getenv("NOTIFICATION_BROKER", "")
+    NOTIFICATIONS_SSE_HEARTBEAT_SECONDS = float(
+        os.getenv("NOTIFICATIONS_SSE_HEARTBEAT_SECONDS", "15")
+    )
+
+    # Arquivo de regras da triagem (versionado); recarregado sem restart
+    # quando muda, conferindo o mtime no máximo a cada N segundos
+    TRIAGE_RULES_PATH = os.getenv(
+        "TRIAGE_RULES_PATH",
+        os.path.join(BASE_DIR, "triage_rules.json"),
+    )
+    TRIAGE_RULES_RELOAD_SECONDS = float(os.getenv("TRIAGE_RULES_RELOAD_SECONDS", "5"))
+
+    # Duração (min) de uma consulta quando o vet não tem agenda configurada
+    APPOINTMENT_DEFAULT_MINUTES = int(os.getenv("APPOINTMENT_DEFAULT_MINUTES", "30"))
+    # Maior intervalo aceito em GET /api/vets/<id>/availability
+    AVAILABILITY_MAX_DAYS = int(os.getenv("AVAILABILITY_MAX_DAYS", "31"))
+
+    # Lembretes (flask reminders run): antecedência das consultas, janela
+    # de vacinas/retornos e intervalo entre varreduras
+    REMINDER_APPOINTMENT_LEAD_HOURS = int(os.getenv("REMINDER_APPOINTMENT_LEAD_HOURS", "24"))
+    REMINDER_DUE_DAYS_AHEAD = int(os.getenv("REMINDER_DUE_DAYS_AHEAD", "7"))
+    REMINDER_SCAN_INTERVAL_SECONDS = float(os.getenv("REMINDER_SCAN_INTERVAL_SECONDS", "300"))
+
+    # Fuso/locale padrão para exibir horários (quando a requisição não manda
+    # ?tz= / X-Timezone / Accept-Language)
+    DISPLAY_TIMEZONE = os.getenv("DISPLAY_TIMEZONE", "America/Sao_Paulo")
+    DISPLAY_LOCALE = os.getenv("DISPLAY_LOCALE", "pt-BR")
+
+    # Idade (dias) a partir da qual notificações lidas saem da tabela principal
+    NOTIFICATION_RETENTION_DAYS = int(os.getenv("NOTIFICATION_RETENTION_DAYS", "90"))
+    # Idade (dias) a partir da qual lidas repetidas são juntadas (--collapse)
+    NOTIFICATION_COLLAPSE_DAYS = int(os.getenv("NOTIFICATION_COLLAPSE_DAYS", "7"))
+
     # Se quiser limitar CORS depois, dá para ajustar
     CORS_ORIGINS = os.getenv("CORS_ORIGINS", "*")
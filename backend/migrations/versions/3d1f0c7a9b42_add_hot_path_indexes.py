@@ -0,0 +1,70 @@
+"""add hot path indexes
+
+Revision ID: 3d1f0c7a9b42
+Revises: 97293600c284
+Create Date: 2026-10-17 10:12:05.418233
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3d1f0c7a9b42'
+down_revision = '97293600c284'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('appointments', schema=None) as batch_op:
+        batch_op.create_index('ix_appointments_vet_id_scheduled_at', ['vet_id', 'scheduled_at'], unique=False)
+        batch_op.create_index('ix_appointments_tutor_id_scheduled_at', ['tutor_id', 'scheduled_at'], unique=False)
+
+    with op.batch_alter_table('consultations', schema=None) as batch_op:
+        batch_op.create_index('ix_consultations_vet_id_date', ['vet_id', 'date'], unique=False)
+        batch_op.create_index('ix_consultations_tutor_id_date', ['tutor_id', 'date'], unique=False)
+        batch_op.create_index(batch_op.f('ix_consultations_pet_id'), ['pet_id'], unique=False)
+
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.create_index('ix_notifications_user_id_created_at', ['user_id', 'created_at'], unique=False)
+        batch_op.create_index('ix_notifications_user_id_read', ['user_id', 'read'], unique=False)
+
+    with op.batch_alter_table('pets', schema=None) as batch_op:
+        batch_op.create_index('ix_pets_owner_id_created_at', ['owner_id', 'created_at'], unique=False)
+
+    with op.batch_alter_table('pet_vaccines', schema=None) as batch_op:
+        batch_op.create_index('ix_pet_vaccines_pet_id_date', ['pet_id', 'date'], unique=False)
+
+    with op.batch_alter_table('triages', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_triages_pet_id'), ['pet_id'], unique=False)
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index('ix_users_role_clinic_id', ['role', 'clinic_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index('ix_users_role_clinic_id')
+
+    with op.batch_alter_table('triages', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_triages_pet_id'))
+
+    with op.batch_alter_table('pet_vaccines', schema=None) as batch_op:
+        batch_op.drop_index('ix_pet_vaccines_pet_id_date')
+
+    with op.batch_alter_table('pets', schema=None) as batch_op:
+        batch_op.drop_index('ix_pets_owner_id_created_at')
+
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.drop_index('ix_notifications_user_id_read')
+        batch_op.drop_index('ix_notifications_user_id_created_at')
+
+    with op.batch_alter_table('consultations', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_consultations_pet_id'))
+        batch_op.drop_index('ix_consultations_tutor_id_date')
+        batch_op.drop_index('ix_consultations_vet_id_date')
+
+    with op.batch_alter_table('appointments', schema=None) as batch_op:
+        batch_op.drop_index('ix_appointments_tutor_id_scheduled_at')
+        batch_op.drop_index('ix_appointments_vet_id_scheduled_at')
@@ -1,12 +1,41 @@
 from datetime import datetime, date
+from sqlalchemy.orm import validates
 from extensions import db
 
 
+def _search_key(value):
+    # import tardio: o pacote services importa models
+    from services.text_search import fold_text
+
+    return fold_text(value) or None
+
+
+def _trigram_index(name, column):
+    """
+    Índice da coluna de busca: GIN de trigramas no PostgreSQL (atende LIKE
+    'x%' e '% x%'); nos outros bancos vira um índice comum.
+    """
+    return db.Index(
+        name,
+        column,
+        postgresql_using="gin",
+        postgresql_ops={column: "gin_trgm_ops"},
+    )
+
+
 class User(db.Model):
     __tablename__ = "users"
+    __table_args__ = (
+        # listagem de veterinários por clínica
+        db.Index("ix_users_role_clinic_id", "role", "clinic_id"),
+        # busca de pets pelo nome do tutor
+        _trigram_index("ix_users_name_search", "name_search"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(120), nullable=False)
+    # nome sem acentos/minúsculo, mantido por _fold_name
+    name_search = db.Column(db.String(120), nullable=True)
 
     email = db.Column(db.String(120), unique=True, nullable=False, index=True)
     password_hash = db.Column(db.String(255), nullable=False)
@@ -23,24 +52,41 @@ class User(db.Model):
     # clínica principal do vet (pode ser nula para tutor)
     clinic_id = db.Column(db.Integer, db.ForeignKey("clinics.id"), nullable=True)
 
+    # token secreto do feed de calendário (.ics); nulo até ser gerado
+    calendar_token = db.Column(db.String(64), unique=True, index=True, nullable=True)
+
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # muda com o nome e com a agenda do vet; entra no ETag do feed de calendário
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # relação para acessar os dados da clínica
     clinic = db.relationship("Clinic", back_populates="vets")
 
+    @validates("name")
+    def _fold_name(self, key, value):
+        self.name_search = _search_key(value)
+        return value
+
 
 class Pet(db.Model):
     __tablename__ = "pets"
+    __table_args__ = (
+        db.Index("ix_pets_owner_id_created_at", "owner_id", "created_at"),
+        _trigram_index("ix_pets_name_search", "name_search"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(120), nullable=False)
+    name_search = db.Column(db.String(120), nullable=True)
     species = db.Column(db.String(80))      # cachorro, gato, etc.
     sex = db.Column(db.String(20))          # macho, fêmea, etc.
     age = db.Column(db.Integer)             # idade em anos (opcional)
     notes = db.Column(db.Text)
 
     owner_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # chave da paginação por cursor (created_at, id): não pode ser nulo
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     owner = db.relationship("User", backref=db.backref("pets", lazy=True))
 
@@ -58,6 +104,11 @@ class Pet(db.Model):
         lazy=True,
     )
 
+    @validates("name")
+    def _fold_name(self, key, value):
+        self.name_search = _search_key(value)
+        return value
+
     def to_dict(self, include_vaccines: bool = False):
         data = {
             "id": self.id,
@@ -77,13 +128,22 @@ class Pet(db.Model):
 
 class PetBreed(db.Model):
     __tablename__ = "pet_breeds"
+    __table_args__ = (
+        _trigram_index("ix_pet_breeds_name_search", "name_search"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     pet_id = db.Column(db.Integer, db.ForeignKey("pets.id"), nullable=False)
     name = db.Column(db.String(120), nullable=False)  # nome livre da raça
+    name_search = db.Column(db.String(120), nullable=True)
 
     pet = db.relationship("Pet", back_populates="breeds")
 
+    @validates("name")
+    def _fold_name(self, key, value):
+        self.name_search = _search_key(value)
+        return value
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -94,6 +154,9 @@ class PetBreed(db.Model):
 
 class PetVaccine(db.Model):
     __tablename__ = "pet_vaccines"
+    __table_args__ = (
+        db.Index("ix_pet_vaccines_pet_id_date", "pet_id", "date"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     pet_id = db.Column(db.Integer, db.ForeignKey("pets.id"), nullable=False)
@@ -101,7 +164,7 @@ class PetVaccine(db.Model):
     name = db.Column(db.String(120), nullable=False)
     lot = db.Column(db.String(80))
     date = db.Column(db.Date, nullable=False)
-    next_dose = db.Column(db.Date)
+    next_dose = db.Column(db.Date, index=True)
     notes = db.Column(db.Text)
 
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -123,15 +186,36 @@ class PetVaccine(db.Model):
 
 class Appointment(db.Model):
     __tablename__ = "appointments"
+    __table_args__ = (
+        # agenda do vet / do tutor, ordenada por horário
+        db.Index("ix_appointments_vet_id_scheduled_at", "vet_id", "scheduled_at"),
+        db.Index("ix_appointments_tutor_id_scheduled_at", "tutor_id", "scheduled_at"),
+        # ETag do feed de calendário: max(updated_at) por vet / por tutor
+        db.Index("ix_appointments_vet_id_updated_at", "vet_id", "updated_at"),
+        db.Index("ix_appointments_tutor_id_updated_at", "tutor_id", "updated_at"),
+        # um agendamento ativo por vet e horário: trava de banco contra
+        # marcações simultâneas no mesmo slot
+        db.Index(
+            "uq_appointments_vet_id_scheduled_at_active",
+            "vet_id",
+            "scheduled_at",
+            unique=True,
+            postgresql_where=db.text("status IN ('PENDING', 'CONFIRMED')"),
+            sqlite_where=db.text("status IN ('PENDING', 'CONFIRMED')"),
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     pet_id = db.Column(db.Integer, nullable=False)
     tutor_id = db.Column(db.Integer, nullable=False)
     vet_id = db.Column(db.Integer, nullable=False)
 
-    scheduled_at = db.Column(db.DateTime, nullable=False)
+    scheduled_at = db.Column(db.DateTime, nullable=False, index=True)
     reason = db.Column(db.Text, nullable=True)
 
+    # série recorrente de origem (nulo para agendamentos avulsos)
+    series_id = db.Column(db.Integer, nullable=True, index=True)
+
     status = db.Column(db.String(20), nullable=False, default="PENDING")
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(
@@ -153,11 +237,116 @@ class Appointment(db.Model):
             "scheduled_at": self.scheduled_at.isoformat() if self.scheduled_at else None,
             "reason": self.reason,
             "status": self.status,
+            "series_id": self.series_id,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
         }
 
 
+class AppointmentSeries(db.Model):
+    """Série de consultas recorrentes (ex.: fisioterapia toda semana)."""
+
+    __tablename__ = "appointment_series"
+
+    id = db.Column(db.Integer, primary_key=True)
+    pet_id = db.Column(db.Integer, nullable=False)
+    tutor_id = db.Column(db.Integer, nullable=False)
+    vet_id = db.Column(db.Integer, nullable=False)
+
+    # regra no formato RRULE, ex: "FREQ=WEEKLY;COUNT=8;BYDAY=MO"
+    rrule = db.Column(db.String(200), nullable=False)
+    starts_at = db.Column(db.DateTime, nullable=False)
+    reason = db.Column(db.Text, nullable=True)
+
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "pet_id": self.pet_id,
+            "tutor_id": self.tutor_id,
+            "vet_id": self.vet_id,
+            "rrule": self.rrule,
+            "starts_at": self.starts_at.isoformat() if self.starts_at else None,
+            "reason": self.reason,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
+
+
+class ReminderSent(db.Model):
+    """
+    Marca de lembrete já enviado (um por item e data de vencimento).
+
+    A restrição única impede lembrete duplicado mesmo com o agendador
+    reiniciado no meio ou rodando em mais de um processo.
+    """
+
+    __tablename__ = "reminders_sent"
+    __table_args__ = (
+        db.UniqueConstraint(
+            "kind", "item_id", "due_on", name="uq_reminders_sent_kind_item_due"
+        ),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    # 'appointment' | 'vaccine' | 'next_visit'
+    kind = db.Column(db.String(20), nullable=False)
+    item_id = db.Column(db.Integer, nullable=False)
+    # dia do vencimento lembrado (mudou a data, sai um lembrete novo)
+    due_on = db.Column(db.Date, nullable=False)
+
+    user_id = db.Column(db.Integer, nullable=False)
+    sent_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
+class VetWorkingHours(db.Model):
+    """Janela de atendimento semanal do veterinário (ex.: segunda 08:00-12:00)."""
+
+    __tablename__ = "vet_working_hours"
+
+    id = db.Column(db.Integer, primary_key=True)
+    vet_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False, index=True)
+
+    # 0 = segunda ... 6 = domingo (date.weekday())
+    weekday = db.Column(db.Integer, nullable=False)
+    start_time = db.Column(db.Time, nullable=False)
+    end_time = db.Column(db.Time, nullable=False)
+
+    # duração de cada consulta nessa janela
+    slot_minutes = db.Column(db.Integer, nullable=False, default=30)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "weekday": self.weekday,
+            "start": self.start_time.strftime("%H:%M"),
+            "end": self.end_time.strftime("%H:%M"),
+            "slot_minutes": self.slot_minutes,
+        }
+
+
+class VetBreak(db.Model):
+    """Pausa na agenda (ex.: almoço); weekday nulo vale para todos os dias."""
+
+    __tablename__ = "vet_breaks"
+
+    id = db.Column(db.Integer, primary_key=True)
+    vet_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False, index=True)
+
+    weekday = db.Column(db.Integer, nullable=True)
+    start_time = db.Column(db.Time, nullable=False)
+    end_time = db.Column(db.Time, nullable=False)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "weekday": self.weekday,
+            "start": self.start_time.strftime("%H:%M"),
+            "end": self.end_time.strftime("%H:%M"),
+        }
+
+
 class Clinic(db.Model):
     __tablename__ = "clinics"
 
@@ -196,7 +385,7 @@ class Triage(db.Model):
     __tablename__ = "triages"
 
     id = db.Column(db.Integer, primary_key=True)
-    pet_id = db.Column(db.Integer, db.ForeignKey("pets.id"), nullable=False)
+    pet_id = db.Column(db.Integer, db.ForeignKey("pets.id"), nullable=False, index=True)
     tutor_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
 
     symptoms = db.Column(db.Text, nullable=False)
@@ -204,6 +393,9 @@ class Triage(db.Model):
     ai_summary = db.Column(db.Text, nullable=False)
     recommendations = db.Column(db.Text, nullable=False)
 
+    # versão do arquivo de regras usada na análise (vazio nas triagens antigas)
+    rule_set_version = db.Column(db.String(40))
+
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     pet = db.relationship("Pet", backref="triages")
@@ -218,6 +410,7 @@ class Triage(db.Model):
             "risk_level": self.risk_level,
             "ai_summary": self.ai_summary,
             "recommendations": self.recommendations,
+            "rule_set_version": self.rule_set_version,
             "created_at": self.created_at.isoformat() if self.created_at else None,
         }
 
@@ -284,6 +477,15 @@ class EducationContent(db.Model):
 
 class Notification(db.Model):
     __tablename__ = "notifications"
+    __table_args__ = (
+        db.Index("ix_notifications_user_id_created_at", "user_id", "created_at"),
+        db.Index("ix_notifications_user_id_read", "user_id", "read"),
+        # busca da repetida mais nova no collapse da retenção
+        db.Index(
+            "ix_notifications_user_id_type_read_created_at",
+            "user_id", "type", "read", "created_at",
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(
@@ -298,9 +500,6 @@ class Notification(db.Model):
     title = db.Column(db.String(200), nullable=False)
     message = db.Column(db.String(500), nullable=False)
 
-    # texto pronto para exibir, exemplo "2 horas atrás" ou "05/11/2025 14:30"
-    time = db.Column(db.String(50), nullable=False)
-
     read = db.Column(db.Boolean, default=False, nullable=False)
 
     # link opcional para navegar no app, ex: "/tutor/appointment/123"
@@ -312,13 +511,49 @@ class Notification(db.Model):
         nullable=False,
     )
 
+    def to_dict(self):
+        # o texto de exibição ("time") é montado na serialização da rota,
+        # com o fuso/locale de quem pediu
+        return {
+            "id": self.id,
+            "type": self.type,
+            "title": self.title,
+            "message": self.message,
+            "read": self.read,
+            "link": self.link,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
+
+
+class NotificationArchive(db.Model):
+    """Notificações antigas já lidas, retiradas da tabela principal pela manutenção."""
+
+    __tablename__ = "notifications_archive"
+
+    # mesmo id da tabela notifications
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    user_id = db.Column(db.Integer, nullable=False, index=True)
+
+    type = db.Column(db.String(20), nullable=False)
+    title = db.Column(db.String(200), nullable=False)
+    message = db.Column(db.String(500), nullable=False)
+    read = db.Column(db.Boolean, nullable=False)
+    link = db.Column(db.String(255))
+
+    created_at = db.Column(db.DateTime, nullable=False)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
 
 class Consultation(db.Model):
     __tablename__ = "consultations"
+    __table_args__ = (
+        db.Index("ix_consultations_vet_id_date", "vet_id", "date"),
+        db.Index("ix_consultations_tutor_id_date", "tutor_id", "date"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
 
-    pet_id = db.Column(db.Integer, db.ForeignKey("pets.id"), nullable=False)
+    pet_id = db.Column(db.Integer, db.ForeignKey("pets.id"), nullable=False, index=True)
     tutor_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
     vet_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
 
@@ -332,7 +567,7 @@ class Consultation(db.Model):
     diagnosis = db.Column(db.Text, nullable=False)
     treatment = db.Column(db.Text, nullable=False)
     observations = db.Column(db.Text, nullable=True)
-    next_visit = db.Column(db.Date, nullable=True)
+    next_visit = db.Column(db.Date, nullable=True, index=True)
 
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(
@@ -372,3 +607,73 @@ class Consultation(db.Model):
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
         }
+
+
+class ConsultationSummary(db.Model):
+    """Cache compartilhado (entre processos) dos resumos de consultas gerados pela IA."""
+
+    __tablename__ = "consultation_summaries"
+    __table_args__ = (
+        db.UniqueConstraint(
+            "pet_id", "scope", "content_hash",
+            name="uq_consultation_summaries_pet_scope_hash",
+        ),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    pet_id = db.Column(db.Integer, db.ForeignKey("pets.id"), nullable=False)
+
+    # quem está vendo o resumo: "vet:<id>" ou "tutor:<id>"
+    scope = db.Column(db.String(40), nullable=False)
+
+    # sha256 do conteúdo das consultas usadas no resumo
+    content_hash = db.Column(db.String(64), nullable=False)
+
+    summary = db.Column(db.Text, nullable=False)
+    consultation_count = db.Column(db.Integer, nullable=False)
+
+    generated_at = db.Column(
+        db.DateTime,
+        default=datetime.utcnow,
+        nullable=False,
+        index=True,
+    )
+
+
+class SummaryJob(db.Model):
+    """
+    Job assíncrono de resumo de consultas. Fica no banco para que o polling
+    funcione em qualquer worker, não só no que enfileirou.
+    """
+
+    __tablename__ = "summary_jobs"
+
+    # uuid4 em hex, devolvido ao cliente
+    id = db.Column(db.String(32), primary_key=True)
+
+    # pending, running, done, error
+    status = db.Column(db.String(20), nullable=False, default="pending")
+
+    pet_id = db.Column(db.Integer, db.ForeignKey("pets.id"), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+
+    summary = db.Column(db.Text, nullable=True)
+    consultation_count = db.Column(db.Integer, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    # limpeza dos jobs finalizados antigos
+    finished_at = db.Column(db.DateTime, nullable=True, index=True)
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "pet_id": self.pet_id,
+            "user_id": self.user_id,
+            "summary": self.summary,
+            "consultation_count": self.consultation_count,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
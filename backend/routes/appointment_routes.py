@@ -1,14 +1,31 @@
+import secrets
 from datetime import datetime
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context, url_for
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
 
 from extensions import db
-from models import Appointment, Pet, User
+from models import Appointment, AppointmentSeries, Pet, User
+from services.availability import (
+    SLOT_CONFLICT,
+    check_slot,
+    check_slots,
+    lock_vet_schedule,
+)
+from services.calendar_feed import feed_etag, generate_feed
+from services.display_time import agenda_zone, parse_agenda_datetime
+from services.recurrence import RecurrenceError, expand, parse_rrule
 from services.notifications_service import create_notification
+from routes.pagination import PaginationError, keyset_page, page_response
 
 appointments_bp = Blueprint("appointments", __name__)
 
+_SLOT_TAKEN_MESSAGE = (
+    "Já existe uma consulta marcada para este veterinário neste horário."
+)
+
 
 def _get_current_user():
     """Retorna (user_id:int, role:str) baseado no JWT."""
@@ -21,31 +38,89 @@ def _get_current_user():
 
 
 def _parse_scheduled_at(value: str):
-    try:
-        return datetime.fromisoformat(value)
-    except Exception:
-        return None
+    # com fuso ("...Z", "-03:00") vira o horário local da agenda, sem fuso
+    return parse_agenda_datetime(value)
 
 
-def _serialize_appointment(appointment: Appointment):
+def _serialize_appointments(appointments):
     """
-    Monta o dicionário que será enviado para o frontend.
+    Monta os dicionários enviados para o frontend para uma lista de agendamentos.
 
     Usa o to_dict padrão do modelo e enriquece com nomes de pet, tutor e vet.
-    Ajuste os atributos .name se no seu modelo eles tiverem outro nome
-    (por exemplo full_name).
+    Os nomes são resolvidos em lote (uma consulta para pets e outra para
+    usuários), então o número de queries não cresce com a quantidade de
+    agendamentos.
     """
-    base = appointment.to_dict()
+    appointments = list(appointments)
+    if not appointments:
+        return []
+
+    pet_ids = {a.pet_id for a in appointments}
+    user_ids = {a.tutor_id for a in appointments} | {a.vet_id for a in appointments}
+
+    pet_names = dict(
+        db.session.query(Pet.id, Pet.name).filter(Pet.id.in_(pet_ids)).all()
+    )
+    user_names = dict(
+        db.session.query(User.id, User.name).filter(User.id.in_(user_ids)).all()
+    )
 
-    pet = Pet.query.get(appointment.pet_id)
-    tutor = User.query.get(appointment.tutor_id)
-    vet = User.query.get(appointment.vet_id)
+    results = []
+    for appointment in appointments:
+        base = appointment.to_dict()
+        base["pet_name"] = pet_names.get(appointment.pet_id)
+        base["tutor_name"] = user_names.get(appointment.tutor_id)
+        base["vet_name"] = user_names.get(appointment.vet_id)
+        results.append(base)
 
-    base["pet_name"] = pet.name if pet else None
-    base["tutor_name"] = tutor.name if tutor else None
-    base["vet_name"] = vet.name if vet else None
+    return results
 
-    return base
+
+def _serialize_appointment(appointment: Appointment):
+    """Serializa um único agendamento (atalho para _serialize_appointments)."""
+    return _serialize_appointments([appointment])[0]
+
+
+def _resolve_participants(user_id, role, pet_id, vet_id):
+    """
+    Carrega pet, vet e tutor de uma marcação e aplica as regras de acesso.
+
+    Devolve (pet, vet, tutor, None) ou (None, None, None, resposta_de_erro).
+    """
+    pet = Pet.query.get(pet_id)
+    if not pet:
+        return None, None, None, (jsonify({"message": "Pet não encontrado"}), 404)
+
+    # vet e tutor (sempre o dono do pet) numa única consulta
+    users = {
+        u.id: u
+        for u in User.query.filter(User.id.in_({vet_id, pet.owner_id})).all()
+    }
+
+    vet = users.get(vet_id)
+    if not vet or vet.role != "veterinarian":
+        return None, None, None, (jsonify({"message": "Veterinário inválido"}), 400)
+
+    # Regra: tutor dono do pet agenda consulta
+    if role != "veterinarian":
+        if pet.owner_id != user_id:
+            return None, None, None, (
+                jsonify({"message": "Você não é tutor deste pet"}),
+                403,
+            )
+        tutor_id = user_id
+    else:
+        # Se o vet criar a consulta, o tutor é o dono do pet
+        tutor_id = pet.owner_id
+
+    tutor = users.get(tutor_id) if tutor_id else None
+    if not tutor:
+        return None, None, None, (
+            jsonify({"message": "Tutor não encontrado para este pet"}),
+            404,
+        )
+
+    return pet, vet, tutor, None
 
 
 @appointments_bp.route("/appointments", methods=["POST"])
@@ -85,52 +160,24 @@ def create_appointment():
             }
         ), 400
 
-    # valida conflito de horário para o vet
-    conflict = (
-        Appointment.query
-        .filter_by(vet_id=vet_id)
-        .filter(Appointment.scheduled_at == scheduled_at)
-        .filter(Appointment.status.in_(["PENDING", "CONFIRMED"]))
-        .first()
-    )
-
-    if conflict:
-        return (
-            jsonify(
-                {
-                    "message": (
-                        "Já existe uma consulta marcada para este veterinário "
-                        "neste horário."
-                    )
-                }
-            ),
-            400,
-        )
-
-    pet = Pet.query.get(pet_id)
-    if not pet:
-        return jsonify({"message": "Pet não encontrado"}), 404
-
-    vet = User.query.get(vet_id)
-    if not vet or vet.role != "veterinarian":
-        return jsonify({"message": "Veterinário inválido"}), 400
-
-    # Regra: tutor dono do pet agenda consulta
-    if role != "veterinarian":
-        if pet.owner_id != user_id:
-            return jsonify({"message": "Você não é tutor deste pet"}), 403
-        tutor_id = user_id
-    else:
-        # Se o vet criar a consulta, o tutor é o dono do pet
-        tutor_id = pet.owner_id
-
-    tutor = User.query.get(tutor_id) if tutor_id else None
-    if not tutor:
-        return jsonify({"message": "Tutor não encontrado para este pet"}), 404
+    pet, vet, tutor, error = _resolve_participants(user_id, role, pet_id, vet_id)
+    if error:
+        return error
+
+    # Conflito de horário, atômico: trava a agenda do vet até o commit e só
+    # então confere sobreposição com agendamentos ativos (mesma engine da
+    # disponibilidade) e, se o vet tem agenda configurada, o horário de
+    # atendimento. Outra marcação para o mesmo vet espera o commit desta.
+    lock_vet_schedule(vet.id)
+    problem = check_slot(vet.id, scheduled_at)
+    if problem:
+        db.session.rollback()
+        reason, message = problem
+        return jsonify({"message": message}), 409 if reason == SLOT_CONFLICT else 400
 
     appointment = Appointment(
         pet_id=pet.id,
-        tutor_id=tutor_id,
+        tutor_id=tutor.id,
         vet_id=vet.id,
         scheduled_at=scheduled_at,
         reason=reason,
@@ -138,9 +185,15 @@ def create_appointment():
     )
 
     db.session.add(appointment)
-    db.session.commit()
+    # flush para ter o id do agendamento nos links das notificações; o
+    # índice único de horário ativo barra a corrida que escapar do lock
+    try:
+        db.session.flush()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({"message": _SLOT_TAKEN_MESSAGE}), 409
 
-    # notificações continuam igual...
+    # notificações entram no outbox e são gravadas no mesmo commit
     create_notification(
         user_id=vet.id,
         type="appointment",
@@ -163,9 +216,162 @@ def create_appointment():
         link=f"/tutor/appointment/{appointment.id}",
     )
 
+    db.session.commit()
+
     return jsonify(_serialize_appointment(appointment)), 201
 
 
+@appointments_bp.route("/appointments/series", methods=["POST"])
+@jwt_required()
+def create_appointment_series():
+    """
+    Série de consultas recorrentes (ex.: fisioterapia toda segunda).
+
+    Espera JSON:
+    {
+      "pet_id": number,
+      "vet_id": number,
+      "scheduled_at": "2025-11-24T14:30:00",   // primeira consulta
+      "rrule": "FREQ=WEEKLY;COUNT=8;BYDAY=MO,TH",
+      "reason": string (opcional)
+    }
+
+    Tudo ou nada: todos os horários são conferidos de uma vez (uma consulta
+    por intervalo) com a agenda do vet travada; se algum não puder ser
+    marcado, nada é gravado e a resposta lista os horários com problema
+    (409 para conflito, 400 para fora do atendimento). Caso contrário, as
+    consultas entram num único INSERT e cada participante recebe uma
+    notificação resumindo a série.
+
+    Retorna {"series": {...}, "appointments": [...]}.
+    """
+    user_id, role = _get_current_user()
+
+    if not user_id:
+        return jsonify({"message": "Usuário não identificado"}), 401
+
+    data = request.get_json() or {}
+
+    pet_id = data.get("pet_id")
+    vet_id = data.get("vet_id")
+    scheduled_at_raw = data.get("scheduled_at")
+    rrule = (data.get("rrule") or "").strip()
+    reason = (data.get("reason") or "").strip() or None
+
+    if not pet_id or not vet_id or not scheduled_at_raw or not rrule:
+        return jsonify(
+            {"message": "pet_id, vet_id, scheduled_at e rrule são obrigatórios"}
+        ), 400
+
+    try:
+        pet_id = int(pet_id)
+        vet_id = int(vet_id)
+    except (TypeError, ValueError):
+        return jsonify({"message": "pet_id e vet_id devem ser inteiros"}), 400
+
+    scheduled_at = _parse_scheduled_at(scheduled_at_raw)
+    if not scheduled_at:
+        return jsonify(
+            {
+                "message": (
+                    "scheduled_at inválido. Use formato ISO 8601, "
+                    "por exemplo 2025-11-22T14:30:00"
+                )
+            }
+        ), 400
+
+    try:
+        occurrences = expand(scheduled_at, parse_rrule(rrule, agenda_zone()))
+    except RecurrenceError as e:
+        return jsonify({"message": f"rrule inválida: {e}"}), 400
+    if not occurrences:
+        return jsonify({"message": "A regra não gera nenhuma consulta"}), 400
+
+    pet, vet, tutor, error = _resolve_participants(user_id, role, pet_id, vet_id)
+    if error:
+        return error
+
+    # mesma trava da marcação avulsa; todos os horários numa checagem só
+    lock_vet_schedule(vet.id)
+    problems = check_slots(vet.id, occurrences)
+    if problems:
+        db.session.rollback()
+        status = 409 if any(r == SLOT_CONFLICT for _, r, _ in problems) else 400
+        return jsonify(
+            {
+                "message": "Alguns horários da série não estão disponíveis.",
+                "conflicts": [
+                    {"scheduled_at": start.isoformat(), "reason": r, "message": m}
+                    for start, r, m in problems
+                ],
+            }
+        ), status
+
+    series = AppointmentSeries(
+        pet_id=pet.id,
+        tutor_id=tutor.id,
+        vet_id=vet.id,
+        rrule=rrule,
+        starts_at=occurrences[0],
+        reason=reason,
+    )
+    db.session.add(series)
+
+    try:
+        db.session.flush()
+        now = datetime.utcnow()
+        appointments = db.session.scalars(
+            insert(Appointment).returning(Appointment, sort_by_parameter_order=True),
+            [
+                {
+                    "pet_id": pet.id,
+                    "tutor_id": tutor.id,
+                    "vet_id": vet.id,
+                    "scheduled_at": moment,
+                    "reason": reason,
+                    "status": "PENDING",
+                    "series_id": series.id,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for moment in occurrences
+            ],
+        ).all()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({"message": _SLOT_TAKEN_MESSAGE}), 409
+
+    first = occurrences[0].strftime("%d/%m/%Y %H:%M")
+    last = occurrences[-1].strftime("%d/%m/%Y %H:%M")
+    summary = f"{len(occurrences)} consultas, de {first} a {last}"
+
+    # uma notificação por participante para a série inteira
+    create_notification(
+        user_id=vet.id,
+        type="appointment",
+        title="Nova série de consultas",
+        message=f"Série para o pet {pet.name} com o tutor {tutor.name}: {summary}.",
+        link=f"/vet/appointment/{appointments[0].id}",
+    )
+    create_notification(
+        user_id=tutor.id,
+        type="appointment",
+        title="Série de consultas agendada",
+        message=f"Série para o pet {pet.name} com {vet.name} agendada: {summary}.",
+        link=f"/tutor/appointment/{appointments[0].id}",
+    )
+
+    names = {"pet_name": pet.name, "tutor_name": tutor.name, "vet_name": vet.name}
+    result = {
+        "series": series.to_dict(),
+        "appointments": [{**a.to_dict(), **names} for a in appointments],
+    }
+
+    db.session.commit()
+
+    return jsonify(result), 201
+
+
 
 @appointments_bp.route("/appointments", methods=["GET"])
 @jwt_required()
@@ -180,9 +386,79 @@ def list_appointments():
     else:
         query = Appointment.query.filter_by(tutor_id=user_id)
 
-    appointments = query.order_by(Appointment.scheduled_at.desc()).all()
-    # enriquece todas as consultas com nomes
-    return jsonify([_serialize_appointment(a) for a in appointments]), 200
+    try:
+        appointments, next_cursor, paginated = keyset_page(
+            query, Appointment.scheduled_at, Appointment.id, datetime.fromisoformat
+        )
+    except PaginationError as e:
+        return jsonify({"message": str(e)}), 400
+
+    # enriquece todas as consultas com nomes em lote
+    return page_response(
+        _serialize_appointments(appointments), next_cursor, paginated
+    ), 200
+
+
+@appointments_bp.route("/appointments/calendar/token", methods=["POST"])
+@jwt_required()
+def rotate_calendar_token():
+    """
+    Gera (ou troca) o token do feed de calendário do usuário logado.
+
+    O link antigo para de funcionar. Retorna {"token", "url"}; a url é a
+    que vai no app de calendário do celular (assinatura de calendário).
+    """
+    user_id, _role = _get_current_user()
+    if not user_id:
+        return jsonify({"message": "Usuário não identificado"}), 401
+
+    user = User.query.get_or_404(user_id)
+    user.calendar_token = secrets.token_urlsafe(32)
+    db.session.commit()
+
+    url = url_for(
+        "appointments.calendar_feed", token=user.calendar_token, _external=True
+    )
+    return jsonify({"token": user.calendar_token, "url": url}), 200
+
+
+@appointments_bp.route("/appointments/calendar.ics", methods=["GET"])
+def calendar_feed():
+    """
+    Agenda do usuário em iCalendar, autenticada pelo token do link
+    (?token=), já que apps de calendário não mandam JWT.
+
+    Apps consultam o feed a cada poucos minutos: o ETag vem de uma
+    agregação só (feed_etag: updated_at/count da janela, dos nomes e da
+    agenda) e, se o If-None-Match bater, a resposta é 304 sem gerar evento
+    nenhum. Senão, os eventos
+    são gerados e enviados aos poucos (streaming).
+    """
+    token = request.args.get("token")
+    if not token:
+        return jsonify({"message": "token é obrigatório"}), 401
+
+    user = User.query.filter_by(calendar_token=token).first()
+    if not user:
+        return jsonify({"message": "Token de calendário inválido"}), 401
+
+    etag = feed_etag(user.id, user.role)
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+
+    response = Response(
+        stream_with_context(generate_feed(user.id, user.role)),
+        mimetype="text/calendar",
+        headers={
+            "Content-Disposition": 'inline; filename="univet.ics"',
+            # sempre revalida, mas com o ETag a revalidação é barata
+            "Cache-Control": "private, no-cache",
+        },
+    )
+    response.set_etag(etag)
+    return response
 
 
 @appointments_bp.route("/appointments/<int:appointment_id>", methods=["GET"])
@@ -259,31 +535,26 @@ def confirm_appointment(appointment_id: int):
         return jsonify(_serialize_appointment(appointment)), 200
 
     appointment.status = "CONFIRMED"
-    db.session.commit()
 
-    # Opcional: notificar o tutor que a consulta foi confirmada
-    try:
-        pet = Pet.query.get(appointment.pet_id)
-        tutor = User.query.get(appointment.tutor_id)
-        vet = User.query.get(appointment.vet_id)
-
-        if tutor:
-            from services.notifications_service import create_notification
-
-            create_notification(
-                user_id=tutor.id,
-                type="appointment",
-                title="Consulta confirmada",
-                message=(
-                    f"Sua consulta para o pet "
-                    f"{pet.name if pet else ''} com "
-                    f"{vet.name if vet else 'o veterinário'} "
-                    f"em {appointment.scheduled_at.strftime('%d/%m/%Y %H:%M')} foi confirmada."
-                ),
-                link=f"/tutor/appointment/{appointment.id}",
-            )
-    except Exception as e:
-        # Não quebra o fluxo se a notificação falhar
-        print(f"Erro ao criar notificação de confirmação: {e}")
+    # nomes resolvidos em lote para o texto da notificação
+    data = _serialize_appointment(appointment)
+
+    # notificação do tutor entra no outbox: gravada no mesmo commit do status
+    if data["tutor_name"] is not None:
+        create_notification(
+            user_id=appointment.tutor_id,
+            type="appointment",
+            title="Consulta confirmada",
+            message=(
+                f"Sua consulta para o pet "
+                f"{data['pet_name'] or ''} com "
+                f"{data['vet_name'] or 'o veterinário'} "
+                f"em {appointment.scheduled_at.strftime('%d/%m/%Y %H:%M')} foi confirmada."
+            ),
+            link=f"/tutor/appointment/{appointment.id}",
+        )
+
+    db.session.commit()
 
+    # serializado depois do commit: devolve o registro como ficou gravado
     return jsonify(_serialize_appointment(appointment)), 200
@@ -1,12 +1,29 @@
+import json
 from datetime import datetime
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 
 from extensions import db
 from models import Consultation, Pet, User, Appointment
 from services.notifications_service import create_notification
-from services.ai_summary_service import generate_consultations_summary
+from services.ai_summary_service import (
+    ENGINE_EXTRACTIVE,
+    ENGINE_LLM,
+    build_extractive_summary,
+    get_cached_summary,
+    get_summary_consultations,
+    stream_consultations_summary,
+    summary_engine,
+)
+from services.summary_cache import summary_scope
+from services.summary_jobs import (
+    enqueue_summary_job,
+    get_summary_job,
+    job_to_dict,
+    schedule_summary_refresh,
+)
+from routes.pagination import PaginationError, keyset_page, page_response
 
 
 consultations_bp = Blueprint("consultations", __name__)
@@ -30,6 +47,10 @@ def _parse_date(value: str):
         return None
 
 
+def _parse_cursor_date(value: str):
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
 @consultations_bp.route("/consultations", methods=["POST"])
 @jwt_required()
 def create_consultation():
@@ -153,9 +174,10 @@ def create_consultation():
         appointment.status = "COMPLETED"
         appointment.updated_at = datetime.utcnow()
 
-    db.session.commit()
+    # flush para ter o id da consulta no link da notificação
+    db.session.flush()
 
-    # Notificar tutor que a consulta foi registrada
+    # Notificar tutor que a consulta foi registrada (gravada no mesmo commit)
     try:
         date_label = consult_date.strftime("%d/%m/%Y")
     except Exception:
@@ -170,6 +192,14 @@ def create_consultation():
         link=f"/tutor/consultation/{consultation.id}",
     )
 
+    db.session.commit()
+
+    # o resumo (IA) deste pet mudou para o tutor e para o vet: pré-calcula
+    # em background, com debounce, para a próxima leitura já achar cache
+    schedule_summary_refresh(
+        pet.id, [(tutor_id, "tutor"), (user_id, "veterinarian")]
+    )
+
     return jsonify(consultation.to_dict()), 201
 
 
@@ -182,6 +212,8 @@ def list_consultations():
     - Se for veterinarian: filtra por vet_id
     - Se for tutor: filtra por tutor_id
     Aceita opcional ?pet_id=...
+
+    Paginação por cursor em (date, id): ?limit=&cursor=
     """
     user_id, role = _get_current_user()
     if not user_id:
@@ -201,7 +233,12 @@ def list_consultations():
         except (TypeError, ValueError):
             return jsonify({"message": "pet_id inválido"}), 400
 
-    consultations = query.order_by(Consultation.date.desc()).all()
+    try:
+        consultations, next_cursor, paginated = keyset_page(
+            query, Consultation.date, Consultation.id, _parse_cursor_date
+        )
+    except PaginationError as e:
+        return jsonify({"message": str(e)}), 400
 
     results = []
     for c in consultations:
@@ -214,7 +251,7 @@ def list_consultations():
 
         results.append(data)
 
-    return jsonify(results), 200
+    return page_response(results, next_cursor, paginated), 200
 
 
 
@@ -245,6 +282,15 @@ def get_consultation(consultation_id: int):
 @consultations_bp.route("/consultations/summary", methods=["GET"])
 @jwt_required()
 def consultations_summary():
+    """
+    Resumo (IA) do histórico de consultas de um pet.
+
+    - Se já existe resumo válido em cache: 200 com o resumo.
+    - Caso contrário: enfileira um job e devolve 202 com o job_id;
+      o resultado sai em GET /consultations/summary/jobs/<job_id>.
+      Fora do engine "llm", o 202 já traz um "preview" extrativo.
+    - Com SUMMARY_ENGINE="extractive": sempre 200 com o resumo extrativo.
+    """
     user_id, role = _get_current_user()
     if not user_id:
         return jsonify({"message": "Usuário não identificado"}), 401
@@ -266,18 +312,7 @@ def consultations_summary():
     if role != "veterinarian" and pet.owner_id != user_id:
         return jsonify({"message": "Você não é tutor deste pet"}), 403
 
-    query = Consultation.query.filter_by(pet_id=pet.id)
-
-    if role == "veterinarian":
-        query = query.filter_by(vet_id=user_id)
-    else:
-        query = query.filter_by(tutor_id=user_id)
-
-    consultations = (
-        query.order_by(Consultation.date.desc())
-        .limit(10)
-        .all()
-    )
+    consultations = get_summary_consultations(pet, user_id, role)
 
     if not consultations:
         return jsonify(
@@ -288,12 +323,119 @@ def consultations_summary():
             }
         ), 200
 
-    summary_text = generate_consultations_summary(pet, consultations)
+    engine = summary_engine()
+    if engine == ENGINE_EXTRACTIVE:
+        summary_text = build_extractive_summary(pet, consultations)
+    else:
+        summary_text = get_cached_summary(
+            pet, consultations, summary_scope(user_id, role)
+        )
+    if summary_text is not None:
+        return jsonify(
+            {
+                "pet_id": pet.id,
+                "summary": summary_text,
+                "consultation_count": len(consultations),
+            }
+        ), 200
+
+    job = enqueue_summary_job(pet.id, user_id, role)
+
+    data = job_to_dict(job)
+    if engine != ENGINE_LLM:
+        # resumo instantâneo enquanto o do LLM não fica pronto
+        data["preview"] = build_extractive_summary(pet, consultations)
+
+    response = jsonify(data)
+    response.headers["Location"] = f"/api/consultations/summary/jobs/{job['job_id']}"
+    return response, 202
+
+
+def _sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@consultations_bp.route("/consultations/summary/stream", methods=["GET"])
+@jwt_required()
+def consultations_summary_stream():
+    """
+    Resumo (IA) das consultas de um pet via Server-Sent Events.
+
+    Eventos:
+      - token: {"text": "..."} a cada pedaço gerado pelo modelo
+      - done:  {"pet_id", "summary", "consultation_count"} ao final
+      - error: {"message"} se a geração falhar no meio
+    """
+    user_id, role = _get_current_user()
+    if not user_id:
+        return jsonify({"message": "Usuário não identificado"}), 401
+
+    pet_id_raw = request.args.get("pet_id")
+    if not pet_id_raw:
+        return jsonify({"message": "pet_id é obrigatório"}), 400
+
+    try:
+        pet_id = int(pet_id_raw)
+    except (TypeError, ValueError):
+        return jsonify({"message": "pet_id deve ser um inteiro"}), 400
+
+    pet = Pet.query.get(pet_id)
+    if not pet:
+        return jsonify({"message": "Pet não encontrado"}), 404
+
+    # Regras de acesso
+    if role != "veterinarian" and pet.owner_id != user_id:
+        return jsonify({"message": "Você não é tutor deste pet"}), 403
+
+    consultations = get_summary_consultations(pet, user_id, role)
+    scope = summary_scope(user_id, role)
+
+    def generate():
+        pieces = []
+        try:
+            for piece in stream_consultations_summary(pet, consultations, scope):
+                pieces.append(piece)
+                yield _sse_event("token", {"text": piece})
+        except Exception as e:
+            print(f"[SUMMARY STREAM] Erro ao gerar resumo: {e}")
+            yield _sse_event(
+                "error", {"message": "Não foi possível gerar o resumo automático."}
+            )
+            return
+
+        yield _sse_event(
+            "done",
+            {
+                "pet_id": pet.id,
+                "summary": "".join(pieces).strip(),
+                "consultation_count": len(consultations),
+            },
+        )
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # evita que proxies (nginx) segurem os eventos em buffer
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+@consultations_bp.route("/consultations/summary/jobs/<job_id>", methods=["GET"])
+@jwt_required()
+def consultations_summary_job(job_id: str):
+    """Status (ou resultado) de um job de resumo criado pelo usuário logado."""
+    user_id, role = _get_current_user()
+    if not user_id:
+        return jsonify({"message": "Usuário não identificado"}), 401
+
+    job = get_summary_job(job_id)
+    if job is None:
+        return jsonify({"message": "Job não encontrado"}), 404
+
+    if job["user_id"] != user_id:
+        return jsonify({"message": "Acesso negado"}), 403
 
-    return jsonify(
-        {
-            "pet_id": pet.id,
-            "summary": summary_text,
-            "consultation_count": len(consultations),
-        }
-    ), 200
+    return jsonify(job_to_dict(job)), 200
@@ -1,8 +1,27 @@
 # notifications_routes.py
-from flask import Blueprint, jsonify
+import json
+import queue
+from datetime import datetime
+
+from flask import Blueprint, Response, current_app, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from extensions import db
 from models import Notification
+from routes.pagination import (
+    PaginationError,
+    delta_response,
+    forward_page,
+    keyset_page,
+    page_response,
+)
+from services.display_time import (
+    DisplaySettings,
+    as_utc,
+    format_display_time,
+    request_display_settings,
+)
+from services.notification_bus import get_broker, unread_count_event
+from services.notifications_service import publish_unread_count, unread_counts
 
 notifications_bp = Blueprint(
     "notifications",
@@ -11,37 +30,104 @@ notifications_bp = Blueprint(
 )
 
 
-def _notification_to_dict(n: Notification) -> dict:
+def _with_display_time(data: dict, settings: DisplaySettings) -> dict:
+    """Acrescenta o texto de exibição ("time") a partir do created_at."""
+    created_at = data.get("created_at")
+    if isinstance(created_at, str):
+        created_at = datetime.fromisoformat(created_at)
+    return {**data, "time": format_display_time(created_at, settings)}
+
+
+def _notification_to_dict(n: Notification, settings: DisplaySettings) -> dict:
     """Serialização centralizada da notificação."""
-    return {
-        "id": n.id,
-        "type": n.type,
-        "title": n.title,
-        "message": n.message,
-        # se você preferir, pode mandar created_at aqui e formatar no front
-        "time": n.time,
-        "read": n.read,
-        "link": n.link,
-    }
+    return _with_display_time(n.to_dict(), settings)
+
+
+def _parse_since(value: str):
+    """
+    Marca d'água do cliente: id da última notificação vista (inteiro) ou
+    timestamp ISO 8601. Devolve (filtro, ordenação crescente na mesma
+    grandeza) ou None se inválido.
+    """
+    if value.isdigit():
+        return Notification.id > int(value), (Notification.id,)
+    try:
+        since = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if since.tzinfo is not None:
+        # created_at é gravado em UTC sem fuso
+        since = as_utc(since).replace(tzinfo=None)
+    return Notification.created_at > since, (Notification.created_at, Notification.id)
 
 
 @notifications_bp.route("", methods=["GET"])
 @jwt_required()
 def list_notifications():
-    """Lista notificações do usuário logado, mais recentes primeiro."""
+    """
+    Lista notificações do usuário logado, mais recentes primeiro.
+
+    Paginação por cursor em (created_at, id): ?limit=&cursor=
+    Delta para polling: ?since=<id|timestamp ISO> devolve só as mais novas,
+    das mais antigas para as mais novas; se passar do limite, o resto vem
+    pedindo de novo com since=<id da última> (has_more / X-Has-More).
+    """
     identity = get_jwt_identity()
     if not identity:
         return jsonify({"message": "Usuário não identificado"}), 401
 
     user_id = int(identity)
 
-    notifs = (
-        Notification.query.filter_by(user_id=user_id)
-        .order_by(Notification.created_at.desc())
-        .all()
-    )
+    query = Notification.query.filter_by(user_id=user_id)
+
+    settings = request_display_settings()
+
+    since = request.args.get("since")
+    if since:
+        parsed = _parse_since(since)
+        if parsed is None:
+            return jsonify(
+                {"message": "since deve ser um id ou uma data ISO 8601"}
+            ), 400
+        since_filter, order_by = parsed
+
+        # delta em ordem crescente: com o limite de página, o resto vem no
+        # próximo polling a partir da última recebida (nada fica para trás)
+        try:
+            notifs, has_more, paginated = forward_page(
+                query.filter(since_filter), *order_by
+            )
+        except PaginationError as e:
+            return jsonify({"message": str(e)}), 400
+
+        return delta_response(
+            [_notification_to_dict(n, settings) for n in notifs], has_more, paginated
+        ), 200
+
+    try:
+        notifs, next_cursor, paginated = keyset_page(
+            query, Notification.created_at, Notification.id, datetime.fromisoformat
+        )
+    except PaginationError as e:
+        return jsonify({"message": str(e)}), 400
+
+    return page_response(
+        [_notification_to_dict(n, settings) for n in notifs], next_cursor, paginated
+    ), 200
+
+
+@notifications_bp.route("/unread-count", methods=["GET"])
+@jwt_required()
+def unread_notifications_count():
+    """Quantidade de notificações não lidas (para o badge), via índice (user_id, read)."""
+    identity = get_jwt_identity()
+    if not identity:
+        return jsonify({"message": "Usuário não identificado"}), 401
+
+    user_id = int(identity)
+    count = unread_counts(db.session, {user_id}).get(user_id, 0)
 
-    return jsonify([_notification_to_dict(n) for n in notifs]), 200
+    return jsonify({"unread_count": count}), 200
 
 
 @notifications_bp.route("/<int:notification_id>/read", methods=["PATCH"])
@@ -61,8 +147,9 @@ def mark_notification_read(notification_id: int):
     if not notif.read:
         notif.read = True
         db.session.commit()
+        publish_unread_count(user_id)
 
-    return jsonify(_notification_to_dict(notif)), 200
+    return jsonify(_notification_to_dict(notif, request_display_settings())), 200
 
 
 @notifications_bp.route("/read-all", methods=["PATCH"])
@@ -79,5 +166,73 @@ def mark_all_notifications_read():
         {"read": True}
     )
     db.session.commit()
+    publish_unread_count(user_id)
 
-    return jsonify({"status": "ok"}), 200
\ No newline at end of file
+    return jsonify({"status": "ok"}), 200
+
+
+def _sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@notifications_bp.route("/stream", methods=["GET"])
+@jwt_required(locations=["headers", "query_string"])
+def stream_notifications():
+    """
+    Stream (Server-Sent Events) de notificações do usuário logado.
+
+    Eventos:
+      - unread_count: {"unread_count"} ao conectar e quando o contador muda
+      - notification: {"notification", "unread_count"} a cada nova notificação
+    Linhas de comentário (": heartbeat") mantêm a conexão viva.
+
+    Como EventSource não manda headers, aceita o token também em ?jwt= e o
+    fuso/locale do "time" das notificações em ?tz= / ?locale=.
+    """
+    identity = get_jwt_identity()
+    if not identity:
+        return jsonify({"message": "Usuário não identificado"}), 401
+
+    user_id = int(identity)
+    heartbeat = current_app.config.get("NOTIFICATIONS_SSE_HEARTBEAT_SECONDS", 15)
+
+    initial_count = unread_counts(db.session, {user_id}).get(user_id, 0)
+    settings = request_display_settings()
+
+    broker = get_broker()
+    subscription = broker.subscribe(user_id)
+
+    # o generator não usa o banco: a conexão fica ociosa só esperando eventos
+    def generate():
+        try:
+            payload = unread_count_event(initial_count)
+            yield _sse_event(payload["event"], payload["data"])
+
+            while True:
+                try:
+                    payload = subscription.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield ": heartbeat\n\n"
+                    continue
+
+                data = payload["data"]
+                if payload["event"] == "notification":
+                    data = {
+                        **data,
+                        "notification": _with_display_time(
+                            data["notification"], settings
+                        ),
+                    }
+                yield _sse_event(payload["event"], data)
+        finally:
+            broker.unsubscribe(user_id, subscription)
+
+    return Response(
+        generate(),
+        mimetype="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # evita que proxies (nginx) segurem os eventos em buffer
+            "X-Accel-Buffering": "no",
+        },
+    )
@@ -0,0 +1,140 @@
+# backend/routes/pagination.py
+
+from __future__ import annotations
+
+import base64
+import json
+from typing import Any, Callable, List, Optional, Tuple
+
+from flask import request, jsonify
+from sqlalchemy import and_, or_
+
+
+# Tamanho de página usado quando o cliente não manda ?limit=
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+class PaginationError(ValueError):
+    """Parâmetros de paginação inválidos (vira 400 na rota)."""
+
+
+def encode_cursor(sort_value: Any, row_id: int) -> str:
+    """Codifica a posição (valor de ordenação, id) num token opaco."""
+    raw = json.dumps([sort_value.isoformat(), row_id])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, parse_value: Callable[[str], Any]) -> Tuple[Any, int]:
+    """Decodifica um cursor gerado por encode_cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        value, row_id = json.loads(raw)
+        return parse_value(value), int(row_id)
+    except Exception:
+        raise PaginationError("cursor inválido")
+
+
+def _parse_limit(value: Optional[str]) -> int:
+    if value in (None, ""):
+        return DEFAULT_PAGE_SIZE
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise PaginationError("limit deve ser um inteiro")
+    if limit < 1:
+        raise PaginationError("limit deve ser maior que zero")
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def keyset_page(query, sort_column, id_column, parse_value: Callable[[str], Any]):
+    """
+    Pagina `query` por keyset em ordem decrescente de (sort_column, id_column).
+
+    Lê ?limit= e ?cursor= da request atual. Em vez de OFFSET, filtra as linhas
+    estritamente "depois" do cursor, então o custo de cada página não depende
+    de quão longe o cliente já rolou no histórico.
+
+    Retorna (rows, next_cursor, paginated), onde `paginated` indica se o
+    cliente pediu paginação explicitamente (mandou limit ou cursor).
+    """
+    limit_raw = request.args.get("limit")
+    cursor_raw = request.args.get("cursor")
+    paginated = limit_raw is not None or cursor_raw is not None
+
+    limit = _parse_limit(limit_raw)
+
+    if cursor_raw:
+        sort_value, last_id = decode_cursor(cursor_raw, parse_value)
+        query = query.filter(
+            or_(
+                sort_column < sort_value,
+                and_(sort_column == sort_value, id_column < last_id),
+            )
+        )
+
+    rows: List[Any] = (
+        query.order_by(sort_column.desc(), id_column.desc())
+        .limit(limit + 1)
+        .all()
+    )
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            getattr(last, sort_column.key), getattr(last, id_column.key)
+        )
+
+    return rows, next_cursor, paginated
+
+
+def forward_page(query, *order_by):
+    """
+    Página em ordem crescente de `order_by`, para deltas (?since=): o
+    cliente avança a marca d'água até o último item recebido e pede de
+    novo enquanto houver mais, sem pular linhas.
+
+    Lê ?limit= da request atual. Retorna (rows, has_more, paginated).
+    """
+    limit_raw = request.args.get("limit")
+    paginated = limit_raw is not None
+    limit = _parse_limit(limit_raw)
+
+    rows: List[Any] = query.order_by(*order_by).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    return rows[:limit], has_more, paginated
+
+
+def delta_response(items: list, has_more: bool, paginated: bool):
+    """
+    Resposta de um delta (forward_page).
+
+    - Com ?limit=: {"items": [...], "has_more": bool}
+    - Sem: a lista pura; se ficou algo para trás, header X-Has-More: 1.
+    """
+    if paginated:
+        return jsonify({"items": items, "has_more": has_more})
+
+    response = jsonify(items)
+    if has_more:
+        response.headers["X-Has-More"] = "1"
+    return response
+
+
+def page_response(items: list, next_cursor: Optional[str], paginated: bool):
+    """
+    Monta a resposta de uma listagem paginada.
+
+    - Com ?limit= ou ?cursor=: {"items": [...], "next_cursor": "..."}
+    - Sem parâmetros (clientes antigos): a lista pura, limitada ao tamanho
+      de página padrão, com o próximo cursor no header X-Next-Cursor.
+    """
+    if paginated:
+        return jsonify({"items": items, "next_cursor": next_cursor})
+
+    response = jsonify(items)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response
@@ -1,9 +1,13 @@
 from datetime import datetime
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from sqlalchemy import func, or_
+from sqlalchemy.orm import aliased, selectinload
 from extensions import db
-from models import Pet, PetBreed, PetVaccine
+from models import Appointment, Pet, PetBreed, PetVaccine, User
+from routes.pagination import PaginationError, keyset_page, page_response
 from services.notifications_service import create_notification
+from services.text_search import search_terms, word_match
 
 pets_bp = Blueprint("pets", __name__)
 
@@ -18,9 +22,87 @@ def _get_current_user():
     return user_id, role
 
 
+def _pet_loading(include_vaccines: bool = False):
+    """
+    Carregamento das coleções usadas em Pet.to_dict: raças (e vacinas)
+    de todos os pets do resultado numa consulta extra cada (IN), em vez
+    de uma consulta por pet.
+    """
+    options = [selectinload(Pet.breeds)]
+    if include_vaccines:
+        options.append(selectinload(Pet.vaccines))
+    return options
+
+
+def _apply_pet_filters(query):
+    """
+    Filtros da listagem de pets (?q=&species=&owner=&clinic=).
+
+    - q: cada palavra precisa ser início de palavra do nome do pet, de uma
+      raça ou do nome do tutor (sem acentos/maiúsculas, via name_search);
+      no PostgreSQL vale também palavra parecida (pg_trgm, erro de digitação);
+    - species: espécie, sem diferenciar maiúsculas;
+    - owner: id do tutor, ou parte do nome dele (mesma regra do q);
+    - clinic: pets com agendamento com algum vet da clínica.
+
+    Devolve (query, mensagem de erro ou None).
+    """
+    fuzzy = db.session.get_bind().dialect.name == "postgresql"
+
+    terms = search_terms(request.args.get("q") or "")
+    if terms:
+        owner = aliased(User)
+        query = query.join(owner, owner.id == Pet.owner_id)
+        for term in terms:
+            breed_match = (
+                db.select(PetBreed.pet_id)
+                .where(word_match(PetBreed.name_search, term, fuzzy))
+            )
+            query = query.filter(
+                or_(
+                    word_match(Pet.name_search, term, fuzzy),
+                    word_match(owner.name_search, term, fuzzy),
+                    Pet.id.in_(breed_match),
+                )
+            )
+
+    species = (request.args.get("species") or "").strip()
+    if species:
+        query = query.filter(func.lower(Pet.species) == species.lower())
+
+    owner_raw = (request.args.get("owner") or "").strip()
+    if owner_raw.isdigit():
+        query = query.filter(Pet.owner_id == int(owner_raw))
+    elif owner_raw:
+        owner_ids = db.select(User.id)
+        for term in search_terms(owner_raw):
+            owner_ids = owner_ids.where(word_match(User.name_search, term, fuzzy))
+        query = query.filter(Pet.owner_id.in_(owner_ids))
+
+    clinic_raw = (request.args.get("clinic") or "").strip()
+    if clinic_raw:
+        if not clinic_raw.isdigit():
+            return query, "clinic deve ser o id da clínica"
+        # via índice (vet_id, scheduled_at) dos agendamentos
+        clinic_vets = db.select(User.id).where(User.clinic_id == int(clinic_raw))
+        query = query.filter(
+            Pet.id.in_(
+                db.select(Appointment.pet_id).where(Appointment.vet_id.in_(clinic_vets))
+            )
+        )
+
+    return query, None
+
+
 @pets_bp.route("/pets", methods=["GET"])
 @jwt_required()
 def list_pets():
+    """
+    Lista pets, mais recentes primeiro: o tutor vê os seus, o vet vê todos.
+
+    Busca/filtros em _apply_pet_filters; paginação por cursor em
+    (created_at, id): ?limit=&cursor=
+    """
     user_id, role = _get_current_user()
 
     if not user_id:
@@ -32,8 +114,21 @@ def list_pets():
     if role != "veterinarian":
         query = query.filter_by(owner_id=user_id)
 
-    pets = query.order_by(Pet.created_at.desc()).all()
-    return jsonify([p.to_dict() for p in pets]), 200
+    query, error = _apply_pet_filters(query)
+    if error:
+        return jsonify({"message": error}), 400
+
+    try:
+        pets, next_cursor, paginated = keyset_page(
+            query.options(*_pet_loading()),
+            Pet.created_at,
+            Pet.id,
+            datetime.fromisoformat,
+        )
+    except PaginationError as e:
+        return jsonify({"message": str(e)}), 400
+
+    return page_response([p.to_dict() for p in pets], next_cursor, paginated), 200
 
 
 @pets_bp.route("/pets", methods=["POST"])
@@ -102,7 +197,7 @@ def get_pet(pet_id: int):
     if not user_id:
         return jsonify({"message": "Usuário não identificado"}), 401
 
-    pet = Pet.query.get_or_404(pet_id)
+    pet = Pet.query.options(*_pet_loading(include_vaccines=True)).get_or_404(pet_id)
 
     if role != "veterinarian" and pet.owner_id != user_id:
         return jsonify({"message": "Acesso negado"}), 403
@@ -260,9 +355,8 @@ def create_pet_vaccine(pet_id: int):
     )
 
     db.session.add(vaccine)
-    db.session.commit()
 
-    # Notificação para o tutor: vacina registrada
+    # Notificação para o tutor: vacina registrada (gravada no mesmo commit)
     try:
         date_label = date_value.strftime("%d/%m/%Y")
     except Exception:
@@ -277,4 +371,6 @@ def create_pet_vaccine(pet_id: int):
         link=f"/tutor/animal/{pet.id}",
     )
 
+    db.session.commit()
+
     return jsonify(vaccine.to_dict()), 201
@@ -3,13 +3,18 @@ from datetime import datetime
 
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from sqlalchemy import insert
 
 from extensions import db
 from models import Pet, Triage
 from services.notifications_service import create_notification
+from services.triage_rules import get_rule_set
 
 triage_bp = Blueprint("triage", __name__)
 
+# tamanho máximo de um POST /triage/batch
+TRIAGE_BATCH_MAX_ITEMS = 200
+
 
 def _get_current_user():
     """Retorna (user_id:int, role:str) baseado no JWT."""
@@ -21,80 +26,39 @@ def _get_current_user():
     return user_id, role
 
 
-def _analyze_symptoms(symptoms: str) -> dict:
+def _analyze_symptoms(symptoms: str, species: str = None) -> dict:
     """
-    Regras simples de triagem (IA simulada) conforme visão do produto:
+    Regras de triagem (IA simulada) conforme visão do produto:
     - Palavras muito graves -> urgent
     - Sintomas moderados -> monitor
     - Restante -> ok
-    """
 
-    text = (symptoms or "").lower()
-
-    urgent_keywords = [
-        "convuls",             # convulsão
-        "não respira",
-        "nao respira",
-        "dificuldade para respirar",
-        "respiração rápida",
-        "respiracao rapida",
-        "sangue",
-        "sangrando",
-        "não levanta",
-        "nao levanta",
-        "inconsciente",
-        "não responde",
-        "nao responde",
-    ]
-
-    warning_keywords = [
-        "vômit", "vomit",      # vômito/vomitando
-        "diarre",              # diarreia
-        "febre", "febril",
-        "apatia", "letarg",
-        "não come", "nao come",
-        "não bebe", "nao bebe",
-        "mancando", "claudicação",
-        "coçando", "coceira",
-    ]
+    Vocabulário, pesos, limiares e textos vêm do arquivo de regras
+    (TRIAGE_RULES_PATH), com ajustes por espécie. Devolve também as regras
+    que dispararam (matched_rules) e a versão usada (rule_set_version).
+    """
+    return get_rule_set().analyze(symptoms or "", species)
 
-    urgent_hits = sum(1 for k in urgent_keywords if k in text)
-    warning_hits = sum(1 for k in warning_keywords if k in text)
-    length = len(text.split())
 
-    if urgent_hits >= 1 or warning_hits >= 3:
-        risk_level = "urgent"
-        ai_summary = (
-            "Os sintomas relatados indicam um quadro potencialmente grave ou emergencial."
-        )
-        recommendations = (
-            "Recomendo levar o animal imediatamente a um pronto-atendimento veterinário. "
-            "Evite oferecer alimentos ou medicamentos por conta própria e mantenha o animal em local calmo."
-        )
-    elif warning_hits >= 1 or length > 25:
-        risk_level = "monitor"
-        ai_summary = (
-            "Os sintomas sugerem um desconforto moderado que merece acompanhamento próximo."
-        )
-        recommendations = (
-            "Observe o animal pelas próximas horas, registrando mudanças de apetite, vômitos, fezes e comportamento. "
-            "Se os sintomas persistirem por mais de 24h ou piorarem, agende uma consulta o quanto antes."
-        )
+def _notify_triage_result(pet: Pet, analysis: dict) -> None:
+    """Enfileira a notificação do resultado para o tutor (vai no commit do chamador)."""
+    risk_level = analysis.get("risk_level")
+    if risk_level == "urgent":
+        risk_label = "Urgente"
+    elif risk_level == "monitor":
+        risk_label = "Atenção"
     else:
-        risk_level = "ok"
-        ai_summary = (
-            "Os sintomas descritos parecem leves ou inespecíficos neste momento."
-        )
-        recommendations = (
-            "Mantenha a rotina normal do animal, com água fresca e ambiente confortável. "
-            "Caso surjam novos sintomas ou haja piora, agende uma avaliação veterinária."
-        )
+        risk_label = "Leve"
 
-    return {
-        "risk_level": risk_level,
-        "ai_summary": ai_summary,
-        "recommendations": recommendations,
-    }
+    title = f"Triagem de {pet.name}: {risk_label}"
+    message = analysis.get("ai_summary") or "Sua triagem foi concluída."
+
+    create_notification(
+        user_id=pet.owner_id,
+        type="triage",
+        title=title,
+        message=message,
+    )
 
 
 @triage_bp.route("/triage/", methods=["POST"])
@@ -113,6 +77,7 @@ def create_triage():
       "risk_level": string,
       "ai_summary": string,
       "recommendations": string,
+      "matched_rules": {regra: [termos]},
       ...campos extras (pet_id, tutor_id, created_at)
     }
     """
@@ -142,7 +107,7 @@ def create_triage():
     if role != "veterinarian" and pet.owner_id != user_id:
         return jsonify({"message": "Você não é tutor deste pet"}), 403
 
-    analysis = _analyze_symptoms(symptoms)
+    analysis = _analyze_symptoms(symptoms, pet.species)
 
     triage = Triage(
         pet_id=pet.id,
@@ -151,29 +116,113 @@ def create_triage():
         risk_level=analysis["risk_level"],
         ai_summary=analysis["ai_summary"],
         recommendations=analysis["recommendations"],
+        rule_set_version=analysis["rule_set_version"],
         created_at=datetime.utcnow(),
     )
 
     db.session.add(triage)
+
+    # Notificação para o tutor com o resultado da triagem (mesmo commit)
+    _notify_triage_result(pet, analysis)
+
     db.session.commit()
 
-    # Notificação para o tutor com o resultado da triagem
-    risk_level = analysis.get("risk_level")
-    if risk_level == "urgent":
-        risk_label = "Urgente"
-    elif risk_level == "monitor":
-        risk_label = "Atenção"
-    else:
-        risk_label = "Leve"
+    return jsonify({**triage.to_dict(), "matched_rules": analysis["matched_rules"]}), 201
 
-    title = f"Triagem de {pet.name}: {risk_label}"
-    message = analysis.get("ai_summary") or "Sua triagem foi concluída."
 
-    create_notification(
-        user_id=pet.owner_id,
-        type="triage",
-        title=title,
-        message=message,
-    )
+@triage_bp.route("/triage/batch", methods=["POST"])
+@jwt_required()
+def create_triage_batch():
+    """
+    Várias triagens numa requisição (ex.: totem de recepção da clínica).
+
+    Espera JSON:
+    {
+      "items": [{"pet_id": number, "symptoms": string}, ...]
+    }
+
+    Tudo ou nada: se algum item for inválido, nada é gravado e a resposta
+    indica o índice (index) do item. Grava as triagens num único INSERT e
+    as notificações num único lote, na mesma transação.
+
+    Retorna {"items": [TriageResult, ...]} na ordem enviada.
+    """
+    user_id, role = _get_current_user()
+    if not user_id:
+        return jsonify({"message": "Usuário não identificado"}), 401
+
+    data = request.get_json() or {}
+    items = data.get("items")
+    if not isinstance(items, list) or not items:
+        return jsonify({"message": "items deve ser uma lista não vazia"}), 400
+    if len(items) > TRIAGE_BATCH_MAX_ITEMS:
+        return jsonify(
+            {"message": f"no máximo {TRIAGE_BATCH_MAX_ITEMS} itens por lote"}
+        ), 400
+
+    parsed = []
+    for index, item in enumerate(items):
+        item = item if isinstance(item, dict) else {}
+        symptoms = item.get("symptoms")
+        symptoms = symptoms.strip() if isinstance(symptoms, str) else ""
+        try:
+            pet_id = int(item.get("pet_id"))
+        except (TypeError, ValueError):
+            pet_id = None
+        if not pet_id or not symptoms:
+            return jsonify(
+                {"message": "pet_id e symptoms são obrigatórios", "index": index}
+            ), 400
+        parsed.append((pet_id, symptoms))
+
+    pets = {
+        p.id: p
+        for p in Pet.query.filter(Pet.id.in_({pet_id for pet_id, _ in parsed}))
+    }
+    for index, (pet_id, _) in enumerate(parsed):
+        pet = pets.get(pet_id)
+        if not pet:
+            return jsonify({"message": "Pet não encontrado", "index": index}), 404
+        if role != "veterinarian" and pet.owner_id != user_id:
+            return jsonify(
+                {"message": "Você não é tutor deste pet", "index": index}
+            ), 403
+
+    # uma versão de regras para o lote inteiro
+    rule_set = get_rule_set()
+    now = datetime.utcnow()
+    analyses = []
+    rows = []
+    for pet_id, symptoms in parsed:
+        pet = pets[pet_id]
+        analysis = rule_set.analyze(symptoms, pet.species)
+        analyses.append(analysis)
+        rows.append(
+            {
+                "pet_id": pet.id,
+                "tutor_id": pet.owner_id,
+                "symptoms": symptoms,
+                "risk_level": analysis["risk_level"],
+                "ai_summary": analysis["ai_summary"],
+                "recommendations": analysis["recommendations"],
+                "rule_set_version": analysis["rule_set_version"],
+                "created_at": now,
+            }
+        )
+
+    triages = db.session.scalars(
+        insert(Triage).returning(Triage, sort_by_parameter_order=True), rows
+    ).all()
+
+    # serializa antes do commit (que expira os objetos e obrigaria a recarregar)
+    result = [
+        {**t.to_dict(), "matched_rules": a["matched_rules"]}
+        for t, a in zip(triages, analyses)
+    ]
+
+    for (pet_id, _), analysis in zip(parsed, analyses):
+        _notify_triage_result(pets[pet_id], analysis)
+
+    db.session.commit()
 
-    return jsonify(triage.to_dict()), 201
+    return jsonify({"items": result}), 201
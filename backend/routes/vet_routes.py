@@ -1,7 +1,11 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required
-from extensions import db  # mantido para o futuro, se precisar
-from models import User, Clinic
+from datetime import datetime, time, timedelta
+
+from flask import Blueprint, abort, current_app, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from extensions import db
+from models import User, Clinic, VetBreak, VetWorkingHours
+from services.availability import free_slots
+from services.display_time import agenda_now, parse_agenda_datetime
 
 vets_bp = Blueprint("vets", __name__, url_prefix="/api/vets")
 
@@ -47,3 +51,198 @@ def list_vets():
         )
 
     return jsonify(result), 200
+
+
+def _get_current_user():
+    """Retorna (user_id:int, role:str) baseado no JWT."""
+    identity = get_jwt_identity()
+    claims = get_jwt()
+
+    user_id = int(identity) if identity is not None else None
+    role = claims.get("role") if isinstance(claims, dict) else None
+    return user_id, role
+
+
+def _parse_bound(value, default, end_of_day=False):
+    """
+    Data (2025-11-22) ou data/hora ISO. Só com a data, `to` vale até o fim
+    do dia (end_of_day). Com fuso, vira horário local da agenda
+    (agenda_time). Vazio usa `default`; inválido devolve None.
+    """
+    if not value:
+        return default
+    parsed = parse_agenda_datetime(value)
+    if parsed is None:
+        return None
+    if end_of_day and len(value) == 10:
+        parsed += timedelta(days=1)
+    return parsed
+
+
+def _parse_time(value):
+    """Hora "HH:MM"; inválida devolve None."""
+    try:
+        return time.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _get_vet_or_404(vet_id: int):
+    vet = User.query.filter_by(id=vet_id, role="veterinarian").first()
+    if not vet:
+        abort(404, description="Veterinário não encontrado")
+    return vet
+
+
+@vets_bp.route("/<int:vet_id>/availability", methods=["GET"])
+@jwt_required()
+def vet_availability(vet_id: int):
+    """
+    Horários livres do veterinário: ?from=&to= (data ou data/hora ISO).
+
+    Padrão: de agora até 7 dias depois; no máximo AVAILABILITY_MAX_DAYS.
+    Retorna {"vet_id", "from", "to", "slots": [{"start", "end"}]}.
+    """
+    _get_vet_or_404(vet_id)
+
+    now = agenda_now().replace(second=0, microsecond=0)
+    start = _parse_bound(request.args.get("from"), now)
+    if start is None:
+        return jsonify({"message": "from inválido (use ISO 8601)"}), 400
+    end = _parse_bound(
+        request.args.get("to"), start + timedelta(days=7), end_of_day=True
+    )
+    if end is None:
+        return jsonify({"message": "to inválido (use ISO 8601)"}), 400
+
+    if end <= start:
+        return jsonify({"message": "to deve ser depois de from"}), 400
+    max_days = current_app.config.get("AVAILABILITY_MAX_DAYS", 31)
+    if end - start > timedelta(days=max_days):
+        return jsonify(
+            {"message": f"o intervalo pode ter no máximo {max_days} dias"}
+        ), 400
+
+    # horários que já passaram não são oferecidos
+    start = max(start, now)
+    slots = free_slots(vet_id, start, end) if start < end else []
+
+    return jsonify(
+        {
+            "vet_id": vet_id,
+            "from": start.isoformat(),
+            "to": end.isoformat(),
+            "slots": slots,
+        }
+    ), 200
+
+
+@vets_bp.route("/<int:vet_id>/schedule", methods=["GET"])
+@jwt_required()
+def get_vet_schedule(vet_id: int):
+    """Agenda semanal configurada do veterinário (janelas e pausas)."""
+    _get_vet_or_404(vet_id)
+
+    hours = (
+        VetWorkingHours.query.filter_by(vet_id=vet_id)
+        .order_by(VetWorkingHours.weekday, VetWorkingHours.start_time)
+        .all()
+    )
+    breaks = VetBreak.query.filter_by(vet_id=vet_id).order_by(VetBreak.start_time).all()
+
+    return jsonify(
+        {
+            "working_hours": [h.to_dict() for h in hours],
+            "breaks": [b.to_dict() for b in breaks],
+        }
+    ), 200
+
+
+@vets_bp.route("/<int:vet_id>/schedule", methods=["PUT"])
+@jwt_required()
+def update_vet_schedule(vet_id: int):
+    """
+    Substitui a agenda semanal (só o próprio veterinário).
+
+    Espera JSON:
+    {
+      "working_hours": [{"weekday": 0-6, "start": "08:00", "end": "12:00", "slot_minutes": 30}],
+      "breaks": [{"weekday": 0-6 | null, "start": "12:00", "end": "13:00"}]
+    }
+    """
+    user_id, role = _get_current_user()
+    if not user_id:
+        return jsonify({"message": "Usuário não identificado"}), 401
+
+    if role != "veterinarian" or user_id != vet_id:
+        return jsonify({"message": "Você só pode alterar a sua própria agenda"}), 403
+
+    data = request.get_json() or {}
+    if not isinstance(data, dict):
+        return jsonify({"message": "Envie um objeto JSON"}), 400
+
+    for field in ("working_hours", "breaks"):
+        items = data.get(field) or []
+        if not isinstance(items, list) or not all(isinstance(i, dict) for i in items):
+            return jsonify(
+                {"message": f"{field} deve ser uma lista de objetos"}
+            ), 400
+
+    hours = []
+    for item in data.get("working_hours") or []:
+        weekday = item.get("weekday")
+        start, end = _parse_time(item.get("start")), _parse_time(item.get("end"))
+        slot_minutes = item.get("slot_minutes", 30)
+        if (
+            not isinstance(weekday, int) or not 0 <= weekday <= 6
+            or start is None or end is None or start >= end
+            or not isinstance(slot_minutes, int) or not 5 <= slot_minutes <= 480
+        ):
+            return jsonify(
+                {
+                    "message": (
+                        "working_hours: weekday 0-6, start < end (HH:MM) "
+                        "e slot_minutes entre 5 e 480"
+                    )
+                }
+            ), 400
+        hours.append((weekday, start, end, slot_minutes))
+
+    # janelas do mesmo dia não podem se sobrepor
+    by_day = sorted(hours)
+    for prev, cur in zip(by_day, by_day[1:]):
+        if prev[0] == cur[0] and cur[1] < prev[2]:
+            return jsonify(
+                {"message": "working_hours: janelas sobrepostas no mesmo dia"}
+            ), 400
+
+    breaks = []
+    for item in data.get("breaks") or []:
+        weekday = item.get("weekday")
+        start, end = _parse_time(item.get("start")), _parse_time(item.get("end"))
+        if (
+            (weekday is not None and (not isinstance(weekday, int) or not 0 <= weekday <= 6))
+            or start is None or end is None or start >= end
+        ):
+            return jsonify(
+                {"message": "breaks: weekday 0-6 ou null e start < end (HH:MM)"}
+            ), 400
+        breaks.append((weekday, start, end))
+
+    VetWorkingHours.query.filter_by(vet_id=vet_id).delete()
+    VetBreak.query.filter_by(vet_id=vet_id).delete()
+    db.session.add_all(
+        VetWorkingHours(
+            vet_id=vet_id, weekday=w, start_time=s, end_time=e, slot_minutes=m
+        )
+        for w, s, e, m in hours
+    )
+    db.session.add_all(
+        VetBreak(vet_id=vet_id, weekday=w, start_time=s, end_time=e)
+        for w, s, e in breaks
+    )
+    # a duração das consultas mudou: invalida o ETag do feed de calendário
+    db.session.get(User, vet_id).updated_at = datetime.utcnow()
+    db.session.commit()
+
+    return get_vet_schedule(vet_id)
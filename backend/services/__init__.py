@@ -1,3 +1,4 @@
 from .notifications_service import create_notification
 from .ai_summary_service import generate_consultations_summary
-from .local_llm_client import generate_summary_from_prompt
\ No newline at end of file
+from .local_llm_client import generate_summary_from_prompt
+from .summary_jobs import enqueue_summary_job, get_summary_job
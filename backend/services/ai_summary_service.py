@@ -2,19 +2,78 @@
 
 from __future__ import annotations
 
-from datetime import date, datetime, timedelta
-from typing import Sequence, Dict, List, Any
+import hashlib
+from contextlib import contextmanager
+from datetime import date
+from typing import Sequence, List, Dict, Iterator
 
+from flask import current_app
+from sqlalchemy import text
+
+from extensions import db
 from models import Consultation, Pet
-from services.local_llm_client import generate_summary_from_prompt
+from services import summary_cache
+from services.extractive_summary import summarize_consultations
+from services.local_llm_client import (
+    generate_summary_from_prompt,
+    is_fallback_text,
+    stream_summary_from_prompt,
+)
+from services.single_flight import SingleFlight
+
+# quantas consultas (mais recentes) entram no resumo
+SUMMARY_CONSULTATIONS_LIMIT = 10
+
+# engines de resumo aceitos em SUMMARY_ENGINE
+ENGINE_LLM = "llm"
+ENGINE_EXTRACTIVE = "extractive"
+ENGINE_LLM_WITH_EXTRACTIVE_FALLBACK = "llm_with_extractive_fallback"
+
+# gerações em andamento, por (pet, conteúdo das consultas)
+_single_flight = SingleFlight()
+
+# contador (nas estatísticas do single-flight) das gerações evitadas porque
+# outro processo terminou enquanto esperávamos o lock
+_CROSS_PROCESS_HITS = "cross_process_hits"
 
 
-# Cache em memória:
-# chave: pet_id
-# valor: dict com summary, generated_at e lista de ids de consultas usados
-_summary_cache: Dict[int, Dict[str, Any]] = {}
+def summary_engine() -> str:
+    """Engine configurado (SUMMARY_ENGINE); valores desconhecidos caem no padrão."""
+    engine = current_app.config.get("SUMMARY_ENGINE", ENGINE_LLM_WITH_EXTRACTIVE_FALLBACK)
+    if engine not in (ENGINE_LLM, ENGINE_EXTRACTIVE, ENGINE_LLM_WITH_EXTRACTIVE_FALLBACK):
+        return ENGINE_LLM_WITH_EXTRACTIVE_FALLBACK
+    return engine
 
-_CACHE_TTL = timedelta(minutes=30)
+
+def build_extractive_summary(pet: Pet, consultations: Sequence[Consultation]) -> str:
+    """Resumo extrativo instantâneo (não usa LLM nem cache)."""
+    return summarize_consultations(pet, consultations)
+
+
+def _replace_fallback(pet: Pet, consultations: Sequence[Consultation], text: str) -> str:
+    """Troca o texto de falha do LLM pelo resumo extrativo, se o engine permitir."""
+    if is_fallback_text(text) and summary_engine() == ENGINE_LLM_WITH_EXTRACTIVE_FALLBACK:
+        return build_extractive_summary(pet, consultations)
+    return text
+
+
+def get_summary_consultations(pet: Pet, user_id: int, role: str | None) -> List[Consultation]:
+    """
+    Carrega as consultas que entram no resumo do pet, respeitando o escopo
+    de quem está vendo (vet vê as que ele atendeu, tutor as dele).
+    """
+    query = Consultation.query.filter_by(pet_id=pet.id)
+
+    if role == "veterinarian":
+        query = query.filter_by(vet_id=user_id)
+    else:
+        query = query.filter_by(tutor_id=user_id)
+
+    return (
+        query.order_by(Consultation.date.desc())
+        .limit(SUMMARY_CONSULTATIONS_LIMIT)
+        .all()
+    )
 
 
 def _build_consultations_context(pet: Pet, consultations: Sequence[Consultation]) -> str:
@@ -55,59 +114,179 @@ def _build_consultations_context(pet: Pet, consultations: Sequence[Consultation]
     return "\n".join(lines)
 
 
-def _get_consultation_signature(consultations: Sequence[Consultation]) -> List[int]:
-    """Assinatura simples: lista ordenada de IDs de consulta."""
-    return sorted(c.id for c in consultations if c.id is not None)
+def _build_summary_prompt(pet: Pet, consultations: Sequence[Consultation]) -> str:
+    context = _build_consultations_context(pet, consultations)
+
+    return (
+        "Com base no histórico abaixo, gere um resumo em no máximo 2 a 3 parágrafos, "
+        "em português do Brasil, ressaltando:\n"
+        "- principais diagnósticos e problemas recorrentes;\n"
+        "- tratamentos já realizados e resposta observada (se aparecer na descrição);\n"
+        "- pontos de atenção para o próximo atendimento.\n\n"
+        "HISTÓRICO DE CONSULTAS:\n"
+        f"{context}"
+    )
+
+
+def get_cached_summary(
+    pet: Pet, consultations: Sequence[Consultation], scope: str
+) -> str | None:
+    """
+    Devolve o resumo em cache se ainda for válido para estas consultas.
+
+    Não chama o modelo; serve para a rota responder na hora quando já
+    existe um resumo pronto.
+    """
+    content_hash = summary_cache.consultations_content_hash(consultations)
+    return summary_cache.get_cached(pet.id, scope, content_hash)
+
+
+@contextmanager
+def _cross_process_lock(key: str):
+    """
+    Lock consultivo no PostgreSQL para a chave (não faz nada em outros bancos
+    ou se SUMMARY_SINGLE_FLIGHT_DB_LOCK estiver desligado).
 
+    Usa uma conexão própria: o lock é de sessão e não pode ir parar no pool
+    no meio da geração por causa de um commit da sessão do ORM.
 
-def generate_consultations_summary(pet: Pet, consultations: Sequence[Consultation]) -> str:
+    Essa conexão fica fora do pool durante toda a geração (inclusive na fila
+    do limitador do LLM): são até LLM_MAX_CONCURRENCY + LLM_MAX_QUEUE
+    conexões por processo, que o pool precisa comportar além das requisições.
+    """
+    enabled = current_app.config.get("SUMMARY_SINGLE_FLIGHT_DB_LOCK", True)
+    if not enabled or db.engine.dialect.name != "postgresql":
+        yield
+        return
+
+    lock_id = int(hashlib.sha256(key.encode("utf-8")).hexdigest()[:15], 16)
+    with db.engine.connect() as conn:
+        conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": lock_id})
+        try:
+            yield
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": lock_id})
+
+
+def single_flight_stats() -> Dict[str, int]:
+    """Métricas do single-flight de resumos (para monitoramento)."""
+    data = _single_flight.stats()
+    data.setdefault(_CROSS_PROCESS_HITS, 0)
+    return data
+
+
+def generate_consultations_summary(
+    pet: Pet, consultations: Sequence[Consultation], scope: str
+) -> str:
     """
     Gera (ou reutiliza) o resumo das consultas de um pet.
 
-    Regras de cache:
-      - TTL de 30 minutos (_CACHE_TTL)
-      - Só reutiliza se a lista de consultas (ids) for a mesma
+    Regras de cache (tabela consultation_summaries, compartilhada entre
+    processos):
+      - chave: pet, escopo de quem vê (summary_cache.summary_scope) e hash
+        do conteúdo das consultas
+      - TTL e limite de entradas vêm da config (SUMMARY_CACHE_*)
+
+    Em caso de miss, pedidos concorrentes para o mesmo pet e mesmo conteúdo
+    (mesmo prompt) esperam uma única geração, inclusive entre escopos
+    diferentes; no PostgreSQL, um lock consultivo estende isso a outros
+    processos.
+
+    Com SUMMARY_ENGINE="extractive" não chama o LLM; com
+    "llm_with_extractive_fallback", falhas do LLM viram o resumo extrativo
+    (que não é cacheado, para o LLM ser tentado de novo depois).
     """
     if not consultations:
         return "Não há consultas registradas para esse pet ainda."
 
-    now = datetime.utcnow()
-    sig = _get_consultation_signature(consultations)
-    cache_key = pet.id
+    if summary_engine() == ENGINE_EXTRACTIVE:
+        return build_extractive_summary(pet, consultations)
+
+    content_hash = summary_cache.consultations_content_hash(consultations)
 
     # Tenta usar cache
-    cached = _summary_cache.get(cache_key)
-    if cached is not None:
-        cached_at: datetime = cached["generated_at"]
-        cached_sig: List[int] = cached["consultation_ids"]
+    cached_summary = summary_cache.get_cached(pet.id, scope, content_hash)
+    if cached_summary is not None:
+        return cached_summary
 
-        is_fresh = now - cached_at < _CACHE_TTL
-        same_consultations = cached_sig == sig
+    flight_key = f"{pet.id}:{content_hash}"
 
-        if is_fresh and same_consultations:
-            # Reaproveita resumo
-            return cached["summary"]
+    def _generate() -> str:
+        with _cross_process_lock(flight_key):
+            # outro processo pode ter gerado enquanto esperávamos o lock
+            ready = summary_cache.get_cached_any_scope(pet.id, content_hash)
+            if ready is not None:
+                _single_flight.record(_CROSS_PROCESS_HITS)
+                summary_cache.store(
+                    pet.id, scope, content_hash, ready, len(consultations)
+                )
+                return ready
 
-    # Se chegou aqui, precisa gerar um novo resumo
-    context = _build_consultations_context(pet, consultations)
+            # Se chegou aqui, precisa gerar um novo resumo
+            prompt = _build_summary_prompt(pet, consultations)
+            summary_text = generate_summary_from_prompt(prompt)
 
-    prompt = (
-        "Com base no histórico abaixo, gere um resumo em no máximo 2 a 3 parágrafos, "
-        "em português do Brasil, ressaltando:\n"
-        "- principais diagnósticos e problemas recorrentes;\n"
-        "- tratamentos já realizados e resposta observada (se aparecer na descrição);\n"
-        "- pontos de atenção para o próximo atendimento.\n\n"
-        "HISTÓRICO DE CONSULTAS:\n"
-        f"{context}"
-    )
+            # Atualiza cache (antes de soltar o lock); falhas não são cacheadas
+            if not is_fallback_text(summary_text):
+                summary_cache.store(
+                    pet.id, scope, content_hash, summary_text, len(consultations)
+                )
+            return summary_text
+
+    summary_text, shared = _single_flight.do(flight_key, _generate)
+
+    # quem pegou carona grava o resumo no próprio escopo
+    if (
+        shared
+        and not is_fallback_text(summary_text)
+        and summary_cache.get_cached(pet.id, scope, content_hash) is None
+    ):
+        summary_cache.store(
+            pet.id, scope, content_hash, summary_text, len(consultations)
+        )
+
+    return _replace_fallback(pet, consultations, summary_text)
+
+
+def stream_consultations_summary(
+    pet: Pet, consultations: Sequence[Consultation], scope: str
+) -> Iterator[str]:
+    """
+    Versão em streaming de generate_consultations_summary.
+
+    Se houver resumo em cache, devolve o texto inteiro de uma vez; senão
+    repassa os pedaços do modelo e, ao final, grava o texto completo no
+    cache de resumos.
+    """
+    if not consultations:
+        yield "Não há consultas registradas para esse pet ainda."
+        return
 
-    summary_text = generate_summary_from_prompt(prompt)
+    if summary_engine() == ENGINE_EXTRACTIVE:
+        yield build_extractive_summary(pet, consultations)
+        return
 
-    # Atualiza cache
-    _summary_cache[cache_key] = {
-        "summary": summary_text,
-        "generated_at": now,
-        "consultation_ids": sig,
-    }
+    content_hash = summary_cache.consultations_content_hash(consultations)
 
-    return summary_text
+    cached_summary = summary_cache.get_cached(pet.id, scope, content_hash)
+    if cached_summary is not None:
+        yield cached_summary
+        return
+
+    prompt = _build_summary_prompt(pet, consultations)
+
+    pieces: List[str] = []
+    failed = False
+    for piece in stream_summary_from_prompt(prompt):
+        # o fallback só aparece como pedaço único, então dá para trocar aqui
+        if is_fallback_text(piece):
+            failed = True
+            piece = _replace_fallback(pet, consultations, piece)
+        pieces.append(piece)
+        yield piece
+
+    summary_text = "".join(pieces).strip()
+    if summary_text and not failed:
+        summary_cache.store(
+            pet.id, scope, content_hash, summary_text, len(consultations)
+        )
@@ -0,0 +1,258 @@
+# backend/services/availability.py
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from flask import current_app
+
+from extensions import db
+from models import Appointment, User, VetBreak, VetWorkingHours
+
+
+# status que ocupam a agenda do veterinário
+ACTIVE_STATUSES = ("PENDING", "CONFIRMED")
+
+# motivos devolvidos por check_slot
+SLOT_OUTSIDE_HOURS = "outside_hours"
+SLOT_CONFLICT = "conflict"
+
+Interval = Tuple[datetime, datetime]
+
+
+def merge_intervals(intervals: Sequence[Interval]) -> List[Interval]:
+    """Ordena e junta intervalos que se sobrepõem ou encostam."""
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_intervals(window: Interval, holes: Sequence[Interval]) -> List[Interval]:
+    """Partes de `window` que sobram depois de tirar `holes` (já mescladas)."""
+    start, end = window
+    pieces: List[Interval] = []
+    for hole_start, hole_end in holes:
+        if hole_end <= start or hole_start >= end:
+            continue
+        if hole_start > start:
+            pieces.append((start, hole_start))
+        start = max(start, hole_end)
+        if start >= end:
+            break
+    if start < end:
+        pieces.append((start, end))
+    return pieces
+
+
+def _default_minutes() -> int:
+    return current_app.config.get("APPOINTMENT_DEFAULT_MINUTES", 30)
+
+
+def _load_schedule(vet_id: int):
+    hours = VetWorkingHours.query.filter_by(vet_id=vet_id).all()
+    breaks = VetBreak.query.filter_by(vet_id=vet_id).all()
+    return hours, breaks
+
+
+def slot_minutes_at(hours: Sequence[VetWorkingHours], moment: datetime) -> int:
+    """Duração da consulta no horário `moment` (a da janela que o contém)."""
+    for h in hours:
+        if h.weekday == moment.weekday() and h.start_time <= moment.time() < h.end_time:
+            return h.slot_minutes
+    return _default_minutes()
+
+
+def _working_windows(
+    hours: Sequence[VetWorkingHours],
+    breaks: Sequence[VetBreak],
+    start: datetime,
+    end: datetime,
+) -> List[Tuple[Interval, int]]:
+    """Janelas de atendimento (sem as pausas) entre start e end, com a duração do slot."""
+    windows: List[Tuple[Interval, int]] = []
+    day = start.date()
+    while day <= end.date():
+        day_breaks = merge_intervals(
+            [
+                (datetime.combine(day, b.start_time), datetime.combine(day, b.end_time))
+                for b in breaks
+                if b.weekday is None or b.weekday == day.weekday()
+            ]
+        )
+        for h in hours:
+            if h.weekday != day.weekday():
+                continue
+            window = (
+                max(datetime.combine(day, h.start_time), start),
+                min(datetime.combine(day, h.end_time), end),
+            )
+            if window[0] >= window[1]:
+                continue
+            for piece in subtract_intervals(window, day_breaks):
+                windows.append((piece, h.slot_minutes))
+        day += timedelta(days=1)
+    return sorted(windows)
+
+
+def busy_intervals(
+    vet_id: int,
+    start: datetime,
+    end: datetime,
+    hours: Optional[Sequence[VetWorkingHours]] = None,
+) -> List[Interval]:
+    """
+    Horários ocupados do vet entre start e end, já mesclados.
+
+    Uma única consulta por intervalo (índice vet_id, scheduled_at); cada
+    agendamento ocupa a duração do slot da janela em que cai.
+    """
+    if hours is None:
+        hours = VetWorkingHours.query.filter_by(vet_id=vet_id).all()
+
+    # o agendamento mais longo possível que ainda invade `start`
+    longest = max([h.slot_minutes for h in hours] + [_default_minutes()])
+
+    query = (
+        db.session.query(Appointment.scheduled_at)
+        .filter(
+            Appointment.vet_id == vet_id,
+            Appointment.status.in_(ACTIVE_STATUSES),
+            Appointment.scheduled_at > start - timedelta(minutes=longest),
+            Appointment.scheduled_at < end,
+        )
+    )
+    intervals = []
+    for (scheduled_at,) in query:
+        busy_end = scheduled_at + timedelta(minutes=slot_minutes_at(hours, scheduled_at))
+        if busy_end > start:
+            intervals.append((scheduled_at, busy_end))
+    return merge_intervals(intervals)
+
+
+def free_slots(vet_id: int, start: datetime, end: datetime) -> List[Dict[str, str]]:
+    """
+    Horários livres do vet entre start e end.
+
+    Gera a grade de slots de cada janela de atendimento (sem pausas) e
+    descarta os que se sobrepõem a um horário ocupado, varrendo as duas listas
+    ordenadas juntas (sem uma consulta por slot).
+    """
+    hours, breaks = _load_schedule(vet_id)
+    if not hours:
+        return []
+
+    busy = busy_intervals(vet_id, start, end, hours=hours)
+    slots = []
+    cursor = 0
+    for (window_start, window_end), minutes in _working_windows(hours, breaks, start, end):
+        step = timedelta(minutes=minutes)
+        slot_start = window_start
+        while slot_start + step <= window_end:
+            slot_end = slot_start + step
+            # intervalos ocupados que já terminaram não voltam a importar
+            while cursor < len(busy) and busy[cursor][1] <= slot_start:
+                cursor += 1
+            if cursor < len(busy) and busy[cursor][0] < slot_end:
+                # pula direto para o fim do intervalo ocupado, no passo da grade
+                blocked_until = busy[cursor][1]
+                while slot_start < blocked_until:
+                    slot_start += step
+                continue
+            slots.append(
+                {"start": slot_start.isoformat(), "end": slot_end.isoformat()}
+            )
+            slot_start = slot_end
+    return slots
+
+
+def check_slots(
+    vet_id: int, starts: Sequence[datetime]
+) -> List[Tuple[datetime, str, str]]:
+    """
+    Confere vários horários de uma vez (ex.: uma série recorrente).
+
+    Carrega a agenda uma vez e os agendamentos ativos de todo o período
+    numa única consulta; cada horário é comparado com os intervalos
+    ocupados mesclados numa varredura só. Devolve (horário, motivo,
+    mensagem) dos que não podem ser marcados: SLOT_OUTSIDE_HOURS (fora do
+    atendimento; só para vets com agenda configurada) ou SLOT_CONFLICT
+    (sobreposição com outro agendamento ativo ou com outro horário da
+    própria lista).
+
+    Para ser seguro sob concorrência, chame com a agenda do vet travada
+    (lock_vet_schedule) na mesma transação do INSERT.
+    """
+    if not starts:
+        return []
+
+    hours, breaks = _load_schedule(vet_id)
+    wanted = sorted(
+        (start, start + timedelta(minutes=slot_minutes_at(hours, start)))
+        for start in starts
+    )
+    busy = busy_intervals(vet_id, wanted[0][0], wanted[-1][1], hours=hours)
+
+    problems = []
+    cursor = 0
+    previous_end = None
+    for start, end in wanted:
+        if hours:
+            windows = _working_windows(hours, breaks, start, end)
+            if not any(w[0] <= start and end <= w[1] for w, _ in windows):
+                problems.append(
+                    (start, SLOT_OUTSIDE_HOURS, "Horário fora do atendimento deste veterinário.")
+                )
+                continue
+
+        while cursor < len(busy) and busy[cursor][1] <= start:
+            cursor += 1
+        overlaps_busy = cursor < len(busy) and busy[cursor][0] < end
+        overlaps_previous = previous_end is not None and start < previous_end
+        if overlaps_busy or overlaps_previous:
+            problems.append(
+                (
+                    start,
+                    SLOT_CONFLICT,
+                    "Já existe uma consulta marcada para este veterinário neste horário.",
+                )
+            )
+            continue
+        previous_end = end
+
+    return problems
+
+
+def check_slot(vet_id: int, scheduled_at: datetime) -> Optional[Tuple[str, str]]:
+    """
+    Confere se dá para marcar com o vet em `scheduled_at` (check_slots de
+    um horário só). Devolve None se estiver livre ou (motivo, mensagem).
+    """
+    problems = check_slots(vet_id, [scheduled_at])
+    if not problems:
+        return None
+    _, reason, message = problems[0]
+    return reason, message
+
+
+def lock_vet_schedule(vet_id: int) -> Optional[User]:
+    """
+    Trava a linha do veterinário (SELECT ... FOR UPDATE) até o fim da
+    transação, serializando as marcações do mesmo vet: a checagem de
+    sobreposição e o INSERT de uma requisição não se intercalam com os de
+    outra. Devolve o usuário (ou None se não existir).
+
+    No SQLite o FOR UPDATE é ignorado; lá o índice único parcial de
+    (vet_id, scheduled_at) ativo segura a disputa pelo mesmo horário.
+    """
+    return (
+        User.query.filter_by(id=vet_id)
+        .with_for_update()
+        .populate_existing()
+        .first()
+    )
@@ -0,0 +1,204 @@
+# backend/services/calendar_feed.py
+
+from __future__ import annotations
+
+import hashlib
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import aliased
+
+from extensions import db
+from models import Appointment, Pet, User, VetWorkingHours
+from services.availability import slot_minutes_at
+from services.display_time import agenda_now
+
+
+# quantos dias para trás o feed ainda mostra
+FEED_PAST_DAYS = 90
+
+# linhas buscadas por vez ao gerar o feed (cursor no servidor)
+_FETCH_BATCH = 200
+
+_STATUS = {
+    "PENDING": "TENTATIVE",
+    "CONFIRMED": "CONFIRMED",
+    "CANCELLED": "CANCELLED",
+    "COMPLETED": "CONFIRMED",
+}
+
+
+def _owner_column(role: Optional[str]):
+    return Appointment.vet_id if role == "veterinarian" else Appointment.tutor_id
+
+
+def _other_column(role: Optional[str]):
+    return Appointment.tutor_id if role == "veterinarian" else Appointment.vet_id
+
+
+def _feed_since() -> datetime:
+    """
+    Início da janela do feed: meia-noite (horário da agenda) de
+    FEED_PAST_DAYS dias atrás. Muda à meia-noite da clínica, não do servidor.
+    """
+    today = agenda_now().date()
+    return datetime.combine(today - timedelta(days=FEED_PAST_DAYS), time.min)
+
+
+def feed_etag(user_id: int, role: Optional[str]) -> str:
+    """
+    ETag do calendário: uma agregação sobre os agendamentos da janela
+    (max(updated_at), count) mais o updated_at dos pets e da outra parte
+    (nomes nos eventos) e do próprio usuário (a agenda do vet define a
+    duração). Entra também o dia de início da janela, que anda à meia-noite.
+    Qualquer coisa que mude o conteúdo do feed muda o valor.
+    """
+    since = _feed_since()
+    other = aliased(User)
+    owner_update = (
+        db.select(User.updated_at).where(User.id == user_id).scalar_subquery()
+    )
+    row = db.session.execute(
+        db.select(
+            func.max(Appointment.updated_at),
+            func.count(Appointment.id),
+            func.max(Pet.updated_at),
+            func.max(other.updated_at),
+            owner_update,
+        )
+        .select_from(Appointment)
+        .outerjoin(Pet, Pet.id == Appointment.pet_id)
+        .outerjoin(other, other.id == _other_column(role))
+        .where(_owner_column(role) == user_id, Appointment.scheduled_at >= since)
+    ).one()
+    stamps = ":".join(
+        value.isoformat() if isinstance(value, datetime) else str(value or "")
+        for value in row
+    )
+    raw = f"{user_id}:{role}:{since.date().isoformat()}:{stamps}"
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+def _escape(text: str) -> str:
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """Quebra linhas com mais de 75 octetos (RFC 5545, 3.1)."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line + "\r\n"
+
+    parts = []
+    current = ""
+    size = 0
+    limit = 75
+    for ch in line:
+        ch_size = len(ch.encode("utf-8"))
+        if size + ch_size > limit:
+            parts.append(current)
+            current, size, limit = "", 0, 74  # continuação começa com espaço
+        current += ch
+        size += ch_size
+    parts.append(current)
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _local(value: datetime) -> str:
+    # horários da agenda são locais (sem fuso): "floating time" no iCalendar
+    return value.strftime("%Y%m%dT%H%M%S")
+
+
+def _utc(value: datetime) -> str:
+    return value.strftime("%Y%m%dT%H%M%SZ")
+
+
+def _event_lines(
+    appointment: Appointment,
+    pet_name: Optional[str],
+    other_name: Optional[str],
+    role: Optional[str],
+    hours: List[VetWorkingHours],
+) -> Iterable[str]:
+    start = appointment.scheduled_at
+    # mesma duração que a disponibilidade usa (a janela do vet naquele horário)
+    end = start + timedelta(minutes=slot_minutes_at(hours, start))
+
+    pet = pet_name or "pet"
+    if role == "veterinarian":
+        summary = f"Consulta: {pet}" + (f" ({other_name})" if other_name else "")
+    else:
+        summary = f"Consulta de {pet}" + (f" com {other_name}" if other_name else "")
+
+    yield "BEGIN:VEVENT"
+    yield f"UID:appointment-{appointment.id}@univet"
+    yield f"DTSTAMP:{_utc(appointment.updated_at or appointment.created_at)}"
+    yield f"DTSTART:{_local(start)}"
+    yield f"DTEND:{_local(end)}"
+    yield f"SUMMARY:{_escape(summary)}"
+    if appointment.reason:
+        yield f"DESCRIPTION:{_escape(appointment.reason)}"
+    yield f"STATUS:{_STATUS.get(appointment.status, 'TENTATIVE')}"
+    yield "END:VEVENT"
+
+
+def _feed_rows(
+    user_id: int, role: Optional[str], since: datetime
+) -> Iterator[Tuple[Appointment, str, str]]:
+    """Agendamentos do feed com nome do pet e da outra parte, em lotes."""
+    other = aliased(User)
+
+    query = (
+        db.select(Appointment, Pet.name, other.name)
+        .outerjoin(Pet, Pet.id == Appointment.pet_id)
+        .outerjoin(other, other.id == _other_column(role))
+        .where(_owner_column(role) == user_id, Appointment.scheduled_at >= since)
+        .order_by(Appointment.scheduled_at)
+        .execution_options(yield_per=_FETCH_BATCH)
+    )
+    for appointment, pet_name, other_name in db.session.execute(query):
+        yield appointment, pet_name, other_name
+
+
+def _working_hours_by_vet(
+    user_id: int, role: Optional[str], since: datetime
+) -> Dict[int, List[VetWorkingHours]]:
+    """Janelas de atendimento de todos os vets do feed, numa consulta só."""
+    vet_ids = db.select(Appointment.vet_id).where(
+        _owner_column(role) == user_id, Appointment.scheduled_at >= since
+    )
+    by_vet: Dict[int, List[VetWorkingHours]] = defaultdict(list)
+    for hours in VetWorkingHours.query.filter(VetWorkingHours.vet_id.in_(vet_ids)):
+        by_vet[hours.vet_id].append(hours)
+    return by_vet
+
+
+def generate_feed(user_id: int, role: Optional[str]) -> Iterator[str]:
+    """
+    Calendário (iCalendar) gerado aos poucos: cabeçalho, um VEVENT por
+    agendamento (lidos do banco em lotes) e rodapé. Nada de montar tudo
+    numa string só.
+    """
+    yield "BEGIN:VCALENDAR\r\n"
+    yield "VERSION:2.0\r\n"
+    yield "PRODID:-//UniVet//Agenda//PT-BR\r\n"
+    yield "CALSCALE:GREGORIAN\r\n"
+    yield _fold("X-WR-CALNAME:UniVet - Consultas")
+
+    since = _feed_since()
+    hours_by_vet = _working_hours_by_vet(user_id, role, since)
+    for appointment, pet_name, other_name in _feed_rows(user_id, role, since):
+        lines = _event_lines(
+            appointment, pet_name, other_name, role, hours_by_vet[appointment.vet_id]
+        )
+        yield "".join(_fold(line) for line in lines)
+
+    yield "END:VCALENDAR\r\n"
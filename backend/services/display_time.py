@@ -0,0 +1,118 @@
+# backend/services/display_time.py
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from flask import current_app, has_request_context, request
+
+
+# formatos de exibição por locale (o primeiro é o padrão)
+_FORMATS = {
+    "pt-BR": "%d/%m/%Y %H:%M",
+    "en-US": "%m/%d/%Y %I:%M %p",
+}
+
+
+@dataclass(frozen=True)
+class DisplaySettings:
+    zone: ZoneInfo
+    locale: str
+
+
+def _zone(name: Optional[str]) -> Optional[ZoneInfo]:
+    if not name:
+        return None
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return None
+
+
+def _locale(value: Optional[str]) -> Optional[str]:
+    """Casa "pt", "pt-br", "en_US"... com um dos locales suportados."""
+    if not value:
+        return None
+    value = value.replace("_", "-").lower()
+    for locale in _FORMATS:
+        if locale.lower() == value:
+            return locale
+    language = value.split("-")[0]
+    for locale in _FORMATS:
+        if locale.lower().split("-")[0] == language:
+            return locale
+    return None
+
+
+def request_display_settings() -> DisplaySettings:
+    """
+    Fuso e locale de exibição da requisição atual.
+
+    Fuso: ?tz= ou header X-Timezone (nome IANA, ex. "America/Sao_Paulo").
+    Locale: ?locale= ou o primeiro idioma suportado do Accept-Language.
+    Valores inválidos caem no padrão (DISPLAY_TIMEZONE / DISPLAY_LOCALE).
+    """
+    config = current_app.config
+    zone = locale = None
+
+    if has_request_context():
+        zone = _zone(request.args.get("tz") or request.headers.get("X-Timezone"))
+        locale = _locale(request.args.get("locale"))
+        if locale is None:
+            for value, _quality in request.accept_languages:
+                locale = _locale(value)
+                if locale:
+                    break
+
+    return DisplaySettings(
+        zone=zone or _zone(config.get("DISPLAY_TIMEZONE")) or ZoneInfo("UTC"),
+        locale=locale or _locale(config.get("DISPLAY_LOCALE")) or "pt-BR",
+    )
+
+
+def agenda_zone() -> ZoneInfo:
+    """Fuso da agenda: DISPLAY_TIMEZONE (UTC se inválido)."""
+    return _zone(current_app.config.get("DISPLAY_TIMEZONE")) or ZoneInfo("UTC")
+
+
+def agenda_now() -> datetime:
+    """Agora no horário da agenda (DISPLAY_TIMEZONE, sem tzinfo)."""
+    return datetime.now(agenda_zone()).replace(tzinfo=None)
+
+
+def agenda_time(value: datetime) -> datetime:
+    """
+    Horários da agenda (scheduled_at, janelas de atendimento, disponibilidade)
+    são horário local da clínica, sem fuso. Um datetime com fuso (ex.: vindo
+    como "...Z") vira o mesmo instante em DISPLAY_TIMEZONE, sem tzinfo; sem
+    fuso, fica como está.
+    """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(agenda_zone()).replace(tzinfo=None)
+
+
+def parse_agenda_datetime(value) -> Optional[datetime]:
+    """Data/hora ISO 8601 da agenda (ver agenda_time); inválida devolve None."""
+    try:
+        return agenda_time(datetime.fromisoformat(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def as_utc(value: datetime) -> datetime:
+    """Datetimes do banco são UTC sem tzinfo; devolve com tzinfo=UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def format_display_time(value: Optional[datetime], settings: DisplaySettings) -> str:
+    """Texto de exibição ("05/11/2025 14:30") de um datetime UTC."""
+    if value is None:
+        return ""
+    local = as_utc(value).astimezone(settings.zone)
+    return local.strftime(_FORMATS[settings.locale])
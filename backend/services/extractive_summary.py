@@ -0,0 +1,111 @@
+# backend/services/extractive_summary.py
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from collections import OrderedDict
+from datetime import date
+from typing import Dict, List, Sequence
+
+from models import Consultation, Pet
+
+
+# separadores usados para quebrar um diagnóstico em termos ("otite; dermatite")
+_TERM_SPLIT = re.compile(r"[;,\n/]+")
+
+# quantos tratamentos aparecem no resumo
+_MAX_TREATMENTS = 5
+
+
+def _fold(text: str) -> str:
+    """Minúsculas, sem acentos e sem espaços/pontuação nas pontas."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    without_accents = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return re.sub(r"\s+", " ", without_accents).strip(" .;:-")
+
+
+def _fmt(d: date | None) -> str:
+    return d.strftime("%d/%m/%Y") if d else "data não informada"
+
+
+def _diagnosis_terms(consultations: Sequence[Consultation]) -> "OrderedDict[str, Dict]":
+    """
+    Agrupa os termos de diagnóstico (normalizados) das consultas.
+
+    Cada termo conta uma vez por consulta; guarda a grafia mais recente.
+    """
+    terms: "OrderedDict[str, Dict]" = OrderedDict()
+    for c in consultations:
+        seen = set()
+        for raw in _TERM_SPLIT.split(c.diagnosis or ""):
+            label = raw.strip(" .;:-")
+            key = _fold(label)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+
+            entry = terms.setdefault(key, {"label": label, "count": 0})
+            entry["count"] += 1
+            entry["label"] = label
+    return terms
+
+
+def summarize_consultations(pet: Pet, consultations: Sequence[Consultation]) -> str:
+    """
+    Resumo extrativo (sem LLM) do histórico de consultas de um pet.
+
+    Agrupa diagnósticos recorrentes, lista os tratamentos mais recentes e
+    destaca o próximo retorno sugerido. Roda em milissegundos, então serve
+    como resposta imediata ou como fallback quando o modelo não responde.
+    """
+    if not consultations:
+        return "Não há consultas registradas para esse pet ainda."
+
+    # da mais antiga para a mais recente, como no contexto enviado ao LLM
+    ordered = sorted(consultations, key=lambda c: c.date or date.today())
+    first, last = ordered[0], ordered[-1]
+
+    paragraphs: List[str] = []
+
+    if len(ordered) == 1:
+        paragraphs.append(
+            f"{pet.name} tem 1 consulta registrada, em {_fmt(first.date)}."
+        )
+    else:
+        paragraphs.append(
+            f"{pet.name} tem {len(ordered)} consultas registradas, "
+            f"entre {_fmt(first.date)} e {_fmt(last.date)}."
+        )
+
+    terms = _diagnosis_terms(ordered)
+    recurring = sorted(
+        (t for t in terms.values() if t["count"] > 1),
+        key=lambda t: (-t["count"], t["label"].lower()),
+    )
+    if recurring:
+        listed = ", ".join(f"{t['label']} ({t['count']}x)" for t in recurring)
+        paragraphs.append(f"Diagnósticos recorrentes: {listed}.")
+
+    last_diagnosis = (last.diagnosis or "").strip()
+    if last_diagnosis:
+        paragraphs.append(
+            f"Diagnóstico mais recente ({_fmt(last.date)}): {last_diagnosis.rstrip('.')}."
+        )
+
+    treatments: "OrderedDict[str, str]" = OrderedDict()
+    for c in reversed(ordered):
+        treatment = (c.treatment or "").strip().rstrip(".")
+        key = _fold(treatment)
+        if key and key not in treatments:
+            treatments[key] = f"{treatment} ({_fmt(c.date)})"
+        if len(treatments) >= _MAX_TREATMENTS:
+            break
+    if treatments:
+        paragraphs.append("Tratamentos realizados: " + "; ".join(treatments.values()) + ".")
+
+    next_visits = [c.next_visit for c in ordered if c.next_visit]
+    if next_visits:
+        paragraphs.append(f"Próximo retorno sugerido: {_fmt(max(next_visits))}.")
+
+    return "\n\n".join(paragraphs)
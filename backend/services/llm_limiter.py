@@ -0,0 +1,136 @@
+# backend/services/llm_limiter.py
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+from flask import current_app
+
+
+class LimiterRejected(Exception):
+    """A chamada não conseguiu vaga (fila cheia ou tempo de espera esgotado)."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class ConcurrencyLimiter:
+    """
+    Limita quantas chamadas ao LLM rodam ao mesmo tempo no processo.
+
+    - no máximo `max_in_flight` gerações simultâneas;
+    - no máximo `max_queue` chamadas esperando vaga (além disso, rejeita na hora);
+    - cada chamada espera no máximo `queue_timeout` segundos na fila.
+    """
+
+    def __init__(self, max_in_flight: int, max_queue: int, queue_timeout: float):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._waiting = 0
+
+        self._stats = {
+            "acquired": 0,
+            "rejected_queue_full": 0,
+            "rejected_timeout": 0,
+            "errors": 0,
+            "queue_wait_seconds_total": 0.0,
+            "queue_wait_seconds_max": 0.0,
+            "generation_seconds_total": 0.0,
+            "generation_seconds_max": 0.0,
+        }
+
+    def _acquire(self) -> float:
+        """Reserva uma vaga e devolve quanto tempo esperou na fila."""
+        started = time.monotonic()
+        deadline = started + self.queue_timeout
+
+        with self._cond:
+            if self._in_flight >= self.max_in_flight:
+                if self._waiting >= self.max_queue:
+                    self._stats["rejected_queue_full"] += 1
+                    raise LimiterRejected("queue_full")
+
+                self._waiting += 1
+                try:
+                    while self._in_flight >= self.max_in_flight:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._stats["rejected_timeout"] += 1
+                            raise LimiterRejected("timeout")
+                        self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+
+            self._in_flight += 1
+            waited = time.monotonic() - started
+            self._stats["acquired"] += 1
+            self._stats["queue_wait_seconds_total"] += waited
+            self._stats["queue_wait_seconds_max"] = max(
+                self._stats["queue_wait_seconds_max"], waited
+            )
+            return waited
+
+    def _release(self, generation_seconds: float, failed: bool) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            self._stats["generation_seconds_total"] += generation_seconds
+            self._stats["generation_seconds_max"] = max(
+                self._stats["generation_seconds_max"], generation_seconds
+            )
+            if failed:
+                self._stats["errors"] += 1
+            self._cond.notify()
+
+    @contextmanager
+    def slot(self):
+        """Segura uma vaga durante o bloco; levanta LimiterRejected se não conseguir."""
+        self._acquire()
+        started = time.monotonic()
+        failed = False
+        try:
+            yield
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self._release(time.monotonic() - started, failed)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            data: Dict[str, Any] = dict(self._stats)
+            data["in_flight"] = self._in_flight
+            data["waiting"] = self._waiting
+            data["max_in_flight"] = self.max_in_flight
+            data["max_queue"] = self.max_queue
+        return data
+
+
+_limiter: Optional[ConcurrencyLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_llm_limiter() -> ConcurrencyLimiter:
+    """Limitador único do processo, configurado na primeira chamada (LLM_*)."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            config = current_app.config
+            _limiter = ConcurrencyLimiter(
+                max_in_flight=config.get("LLM_MAX_CONCURRENCY", 2),
+                max_queue=config.get("LLM_MAX_QUEUE", 8),
+                queue_timeout=config.get("LLM_QUEUE_TIMEOUT_SECONDS", 10.0),
+            )
+        return _limiter
+
+
+def llm_limiter_stats() -> Dict[str, Any]:
+    """Métricas do limitador (vazio se o LLM ainda não foi chamado)."""
+    return _limiter.stats() if _limiter is not None else {}
@@ -2,45 +2,157 @@
 
 from __future__ import annotations
 
+import threading
+import time
+from typing import Iterator, Optional
+
 import ollama
+from flask import current_app
+
+from services.llm_limiter import LimiterRejected, get_llm_limiter
+
+
+SYSTEM_PROMPT = (
+    "Você é um(a) médico(a) veterinário(a) assistente. "
+    "Receberá o histórico de consultas de um pet e deve gerar um "
+    "resumo curto, em português do Brasil, para que o tutor e o "
+    "veterinário entendam rapidamente a evolução clínica."
+)
+
+# textos devolvidos quando o modelo não responde; não devem ir para o cache
+EMPTY_SUMMARY = "Não foi possível gerar o resumo automático."
+FALLBACK_SUMMARY = (
+    "Não foi possível gerar o resumo automático neste momento. "
+    "Consulte o histórico de consultas acima."
+)
+
+
+_client: Optional[ollama.Client] = None
+_client_lock = threading.Lock()
+
+
+class LLMTimeout(TimeoutError):
+    """A geração passou do prazo total (LLM_TIMEOUT_SECONDS)."""
+
+
+def _timeout_seconds() -> float:
+    return current_app.config.get("LLM_TIMEOUT_SECONDS", 120.0)
+
+
+def _get_client() -> ollama.Client:
+    """
+    Client do ollama. O timeout do httpx vale por leitura (conexão parada);
+    o prazo total da chamada é conferido em _chat_pieces.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = ollama.Client(timeout=_timeout_seconds())
+        return _client
+
+
+def is_fallback_text(text: str) -> bool:
+    """True se o texto é uma das mensagens de falha acima."""
+    return text in (EMPTY_SUMMARY, FALLBACK_SUMMARY)
+
+
+def _build_messages(prompt: str) -> list[dict]:
+    return [
+        {
+            "role": "system",
+            "content": SYSTEM_PROMPT,
+        },
+        {
+            "role": "user",
+            "content": prompt,
+        },
+    ]
+
+
+def _chat_pieces(prompt: str, model: str) -> Iterator[str]:
+    """
+    Pedaços de texto do modelo, com prazo total de LLM_TIMEOUT_SECONDS
+    contado a partir do início da chamada.
+
+    O timeout do client só pega leituras paradas; um modelo que continua
+    mandando tokens devagar nunca estouraria. Aqui o prazo é conferido a
+    cada pedaço e, ao estourar, a resposta é fechada e sai LLMTimeout.
+    """
+    timeout = _timeout_seconds()
+    deadline = time.monotonic() + timeout
+    chunks = _get_client().chat(
+        model=model,
+        messages=_build_messages(prompt),
+        stream=True,
+    )
+    try:
+        for chunk in chunks:
+            if time.monotonic() > deadline:
+                raise LLMTimeout(f"geração passou de {timeout:g}s")
+            message = chunk.get("message") or {}
+            piece = message.get("content") or ""
+            if piece:
+                yield piece
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            # fecha o stream HTTP (o modelo para de gerar para nós)
+            close()
 
 
 def generate_summary_from_prompt(prompt: str, model: str = "llama3") -> str:
     """
     Chama o modelo local via lib ollama e retorna apenas o texto do resumo.
+
+    Passa pelo limitador de concorrência: se não houver vaga a tempo, ou se
+    a geração passar do prazo total (LLM_TIMEOUT_SECONDS), devolve o texto
+    de fallback.
     """
     try:
-        response = ollama.chat(
-            model=model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "Você é um(a) médico(a) veterinário(a) assistente. "
-                        "Receberá o histórico de consultas de um pet e deve gerar um "
-                        "resumo curto, em português do Brasil, para que o tutor e o "
-                        "veterinário entendam rapidamente a evolução clínica."
-                    ),
-                },
-                {
-                    "role": "user",
-                    "content": prompt,
-                },
-            ],
-            stream=False,
-        )
-
-        message = response.get("message") or {}
-        content = (message.get("content") or "").strip()
+        with get_llm_limiter().slot():
+            content = "".join(_chat_pieces(prompt, model)).strip()
 
         if not content:
-            return "Não foi possível gerar o resumo automático."
+            return EMPTY_SUMMARY
 
         return content
 
+    except LimiterRejected as e:
+        print(f"[LLM LOCAL] Chamada rejeitada pelo limitador: {e.reason}")
+        return FALLBACK_SUMMARY
+
     except Exception as e:
         print(f"[LLM LOCAL] Erro ao chamar o modelo: {e}")
-        return (
-            "Não foi possível gerar o resumo automático neste momento. "
-            "Consulte o histórico de consultas acima."
-        )
+        return FALLBACK_SUMMARY
+
+
+def stream_summary_from_prompt(prompt: str, model: str = "llama3") -> Iterator[str]:
+    """
+    Versão em streaming: devolve os pedaços de texto conforme o modelo gera.
+
+    Se o modelo falhar antes de mandar qualquer texto, devolve a mensagem
+    de fallback como único pedaço; se falhar no meio (inclusive por passar
+    do prazo total, LLMTimeout), repassa a exceção (o texto parcial não é
+    um resumo válido).
+    """
+    produced = False
+    try:
+        with get_llm_limiter().slot():
+            for piece in _chat_pieces(prompt, model):
+                produced = True
+                yield piece
+
+    except LimiterRejected as e:
+        print(f"[LLM LOCAL] Chamada rejeitada pelo limitador: {e.reason}")
+        yield FALLBACK_SUMMARY
+        return
+
+    except Exception as e:
+        print(f"[LLM LOCAL] Erro no streaming do modelo: {e}")
+        if produced:
+            raise
+        yield FALLBACK_SUMMARY
+        return
+
+    if not produced:
+        yield EMPTY_SUMMARY
@@ -0,0 +1,111 @@
+# backend/services/notification_bus.py
+
+from __future__ import annotations
+
+import importlib
+import queue
+import threading
+from typing import Any, Dict, Optional, Set
+
+from flask import current_app
+
+
+class NotificationBroker:
+    """
+    Interface do pub/sub de notificações em tempo real.
+
+    A implementação padrão (InMemoryBroker) só entrega para conexões do
+    próprio processo. Para vários workers, basta uma subclasse com o mesmo
+    contrato apoiada num backend compartilhado (Redis, LISTEN/NOTIFY...),
+    configurada em NOTIFICATION_BROKER.
+    """
+
+    def subscribe(self, user_id: int) -> "queue.Queue[Dict[str, Any]]":
+        raise NotImplementedError
+
+    def unsubscribe(self, user_id: int, subscription: "queue.Queue[Dict[str, Any]]") -> None:
+        raise NotImplementedError
+
+    def publish(self, user_id: int, event: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+
+class InMemoryBroker(NotificationBroker):
+    """Fan-out em memória: uma fila por conexão aberta do usuário."""
+
+    # eventos acumulados por conexão lenta antes de começar a descartar
+    MAX_PENDING_EVENTS = 100
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._subscribers: Dict[int, Set["queue.Queue[Dict[str, Any]]"]] = {}
+
+    def subscribe(self, user_id: int) -> "queue.Queue[Dict[str, Any]]":
+        subscription: "queue.Queue[Dict[str, Any]]" = queue.Queue(
+            maxsize=self.MAX_PENDING_EVENTS
+        )
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, user_id: int, subscription: "queue.Queue[Dict[str, Any]]") -> None:
+        with self._lock:
+            subs = self._subscribers.get(user_id)
+            if subs is None:
+                return
+            subs.discard(subscription)
+            if not subs:
+                del self._subscribers[user_id]
+
+    def publish(self, user_id: int, event: Dict[str, Any]) -> None:
+        with self._lock:
+            subs = list(self._subscribers.get(user_id, ()))
+        for subscription in subs:
+            try:
+                subscription.put_nowait(event)
+            except queue.Full:
+                # conexão não está consumindo; o cliente recupera pelo GET
+                pass
+
+    def connection_count(self) -> int:
+        with self._lock:
+            return sum(len(subs) for subs in self._subscribers.values())
+
+
+_broker: Optional[NotificationBroker] = None
+_broker_lock = threading.Lock()
+
+
+def _load_broker(path: str) -> NotificationBroker:
+    """Instancia o broker a partir de "pacote.modulo:Classe"."""
+    module_name, _, class_name = path.partition(":")
+    cls = getattr(importlib.import_module(module_name), class_name)
+    return cls()
+
+
+def get_broker() -> NotificationBroker:
+    """Broker do processo (NOTIFICATION_BROKER; padrão: em memória)."""
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            path = current_app.config.get("NOTIFICATION_BROKER")
+            _broker = _load_broker(path) if path else InMemoryBroker()
+        return _broker
+
+
+def set_broker(broker: NotificationBroker) -> None:
+    """Troca o broker do processo (ex.: backend entre processos)."""
+    global _broker
+    with _broker_lock:
+        _broker = broker
+
+
+def notification_event(notification: Dict[str, Any], unread_count: int) -> Dict[str, Any]:
+    return {
+        "event": "notification",
+        "data": {"notification": notification, "unread_count": unread_count},
+    }
+
+
+def unread_count_event(unread_count: int) -> Dict[str, Any]:
+    return {"event": "unread_count", "data": {"unread_count": unread_count}}
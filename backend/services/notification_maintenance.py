@@ -0,0 +1,159 @@
+# backend/services/notification_maintenance.py
+
+from __future__ import annotations
+
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Iterator, List, Optional
+
+from sqlalchemy import and_, delete, func, insert, literal, select
+from sqlalchemy.orm import aliased
+
+from extensions import db
+from models import Notification, NotificationArchive
+
+
+MODE_ARCHIVE = "archive"
+MODE_DELETE = "delete"
+
+_ARCHIVE_COLUMNS = [
+    "id", "user_id", "type", "title", "message", "read", "link", "created_at",
+]
+
+
+def _expired_query(cutoff: datetime):
+    """Notificações lidas criadas antes de `cutoff`."""
+    return select(Notification.id).where(
+        Notification.read.is_(True), Notification.created_at < cutoff
+    )
+
+
+def _duplicates_query(since: datetime, until: datetime):
+    """
+    Notificações lidas repetidas criadas entre `since` e `until`: mesmo
+    usuário, tipo e link de outra notificação lida mais nova (que é a que
+    fica). A janela limita a varredura; a busca da mais nova usa o índice
+    (user_id, type, read, created_at).
+    """
+    newer = aliased(Notification)
+    return select(Notification.id).where(
+        Notification.read.is_(True),
+        Notification.link.isnot(None),
+        Notification.created_at >= since,
+        Notification.created_at < until,
+        select(newer.id)
+        .where(
+            and_(
+                newer.user_id == Notification.user_id,
+                newer.type == Notification.type,
+                newer.read.is_(True),
+                newer.created_at >= Notification.created_at,
+                newer.link == Notification.link,
+                newer.id > Notification.id,
+            )
+        )
+        .exists(),
+    )
+
+
+def _remove_batch(ids: List[int], mode: str) -> None:
+    """Arquiva (se pedido) e apaga um lote, numa transação curta."""
+    if mode == MODE_ARCHIVE:
+        source = [getattr(Notification, name) for name in _ARCHIVE_COLUMNS]
+        db.session.execute(
+            insert(NotificationArchive).from_select(
+                _ARCHIVE_COLUMNS + ["archived_at"],
+                select(*source, literal(datetime.utcnow())).where(
+                    Notification.id.in_(ids)
+                ),
+            )
+        )
+    db.session.execute(
+        delete(Notification)
+        .where(Notification.id.in_(ids))
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+
+
+def _run_batches(query, batch_size: int, mode: str, pause_seconds: float) -> Iterator[int]:
+    """
+    Processa lotes até acabar; devolve o tamanho de cada lote.
+
+    Keyset por id: cada lote continua depois do último id do anterior, sem
+    reavaliar as linhas que já ficaram para trás.
+    """
+    last_id = 0
+    while True:
+        ids = list(
+            db.session.scalars(
+                query.where(Notification.id > last_id)
+                .order_by(Notification.id)
+                .limit(batch_size)
+            )
+        )
+        if not ids:
+            return
+        last_id = ids[-1]
+        _remove_batch(ids, mode)
+        yield len(ids)
+        if pause_seconds:
+            # solta a tabela entre lotes para não disputar com o tráfego
+            time.sleep(pause_seconds)
+
+
+def prune_notifications(
+    older_than_days: int,
+    batch_size: int = 1000,
+    mode: str = MODE_DELETE,
+    collapse: bool = False,
+    collapse_older_than_days: int = 7,
+    dry_run: bool = False,
+    pause_seconds: float = 0.05,
+    report: Optional[Callable[[str, int, int, float], None]] = None,
+) -> dict:
+    """
+    Retenção da tabela notifications.
+
+    - Remove (ou move para notifications_archive) notificações lidas mais
+      antigas que `older_than_days`; não lidas nunca são tocadas.
+    - Com `collapse`, também junta notificações lidas repetidas (mesmo
+      usuário, tipo e link), mantendo só a mais nova; só olha as criadas
+      entre o corte da retenção e `collapse_older_than_days` atrás.
+
+    Trabalha em lotes de `batch_size` ids, cada um na sua transação, então
+    nenhum lock fica preso por muito tempo. `report(etapa, lote, total,
+    linhas_por_segundo)` é chamado após cada lote.
+    """
+    now = datetime.utcnow()
+    cutoff = now - timedelta(days=older_than_days)
+
+    steps = [("expired", _expired_query(cutoff))]
+    if collapse:
+        collapse_until = now - timedelta(days=collapse_older_than_days)
+        steps.append(("collapsed", _duplicates_query(cutoff, collapse_until)))
+
+    result = {}
+    started = time.monotonic()
+    for step, query in steps:
+        if dry_run:
+            # só conta (a contagem de repetidas ignora o que "expired" levaria)
+            result[step] = db.session.scalar(
+                select(func.count()).select_from(query.subquery())
+            )
+            continue
+
+        step_started = time.monotonic()
+        total = 0
+        for processed in _run_batches(query, batch_size, mode, pause_seconds):
+            total += processed
+            if report is not None:
+                elapsed = time.monotonic() - step_started
+                report(step, processed, total, total / elapsed if elapsed else 0.0)
+        result[step] = total
+
+    elapsed = time.monotonic() - started
+    processed = sum(result.values())
+    result["seconds"] = round(elapsed, 3)
+    result["rows_per_second"] = round(processed / elapsed, 1) if elapsed else 0.0
+    return result
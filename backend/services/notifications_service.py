@@ -2,13 +2,33 @@
 
 from datetime import datetime
 
+from sqlalchemy import event, func, insert
+from sqlalchemy.orm import Session
+
 from extensions import db
 from models import Notification, User
+from services.notification_bus import get_broker, notification_event, unread_count_event
+
+
+# chave em session.info onde ficam as notificações ainda não gravadas
+_OUTBOX_KEY = "notification_outbox"
+
+# eventos de tempo real montados no commit, publicados depois dele
+_EVENTS_KEY = "notification_events"
+
+
+def _outbox(session) -> list:
+    return session.info.setdefault(_OUTBOX_KEY, [])
 
 
 def create_notification(user_id, type, title, message, link=None):
     """
-    Cria uma notificação simples para o usuário.
+    Enfileira uma notificação simples para o usuário (outbox).
+
+    A notificação não é gravada na hora: entra no outbox da sessão atual e
+    é inserida no próximo db.session.commit() do chamador, na mesma
+    transação dos dados que a originaram. Se a transação for desfeita, a
+    notificação também é descartada.
 
     Parâmetros:
       - user_id: ID do usuário que vai receber
@@ -17,22 +37,85 @@ def create_notification(user_id, type, title, message, link=None):
       - message: texto da mensagem
       - link: rota do frontend, ex: '/tutor/appointment/123'
     """
+    _outbox(db.session).append(
+        {
+            "user_id": user_id,
+            "type": type,
+            "title": title,
+            "message": message,
+            "read": False,
+            "link": link,
+            "created_at": datetime.utcnow(),
+        }
+    )
+
+
+def _flush_outbox(session) -> None:
+    """Grava o outbox da sessão: um SELECT de destinatários e um INSERT em lote."""
+    pending = session.info.pop(_OUTBOX_KEY, None)
+    if not pending:
+        return
+
+    # Se o usuário não existir, a notificação dele é descartada
+    recipient_ids = {n["user_id"] for n in pending}
+    existing = {
+        row[0]
+        for row in session.execute(
+            db.select(User.id).where(User.id.in_(recipient_ids))
+        )
+    }
 
-    # Se o usuário não existir, não faz nada
-    user = User.query.get(user_id)
-    if not user:
+    rows = [n for n in pending if n["user_id"] in existing]
+    if not rows:
         return
 
-    notif = Notification(
-        user_id=user.id,
-        type=type,
-        title=title,
-        message=message,
-        # mesmo campo que o notifications_routes devolve para o front :contentReference[oaicite:1]{index=1}
-        time=datetime.now().strftime("%d/%m/%Y %H:%M"),
-        read=False,
-        link=link,
+    created = session.scalars(
+        insert(Notification).returning(Notification), rows
+    ).all()
+
+    # eventos para o stream em tempo real (com o contador de não lidas)
+    counts = unread_counts(session, {n.user_id for n in created})
+    session.info.setdefault(_EVENTS_KEY, []).extend(
+        (n.user_id, notification_event(n.to_dict(), counts.get(n.user_id, 0)))
+        for n in created
     )
 
-    db.session.add(notif)
-    db.session.commit()
+
+def unread_counts(session, user_ids) -> dict:
+    """Quantidade de notificações não lidas por usuário (uma consulta)."""
+    if not user_ids:
+        return {}
+    rows = session.execute(
+        db.select(Notification.user_id, func.count())
+        .where(Notification.user_id.in_(user_ids), Notification.read.is_(False))
+        .group_by(Notification.user_id)
+    )
+    return {user_id: count for user_id, count in rows}
+
+
+def publish_unread_count(user_id: int) -> None:
+    """Publica o contador atual de não lidas (ex.: após marcar como lida)."""
+    count = unread_counts(db.session, {user_id}).get(user_id, 0)
+    get_broker().publish(user_id, unread_count_event(count))
+
+
+@event.listens_for(Session, "before_commit")
+def _before_commit(session):
+    _flush_outbox(session)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session):
+    events = session.info.pop(_EVENTS_KEY, None)
+    if not events:
+        return
+
+    broker = get_broker()
+    for user_id, payload in events:
+        broker.publish(user_id, payload)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session):
+    session.info.pop(_OUTBOX_KEY, None)
+    session.info.pop(_EVENTS_KEY, None)
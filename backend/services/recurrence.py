@@ -0,0 +1,155 @@
+# backend/services/recurrence.py
+
+from __future__ import annotations
+
+import calendar
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, tzinfo
+from typing import List, Optional, Tuple
+
+
+# limite de ocorrências de uma série (um ano de consultas semanais)
+MAX_OCCURRENCES = 52
+
+FREQ_DAILY = "DAILY"
+FREQ_WEEKLY = "WEEKLY"
+FREQ_MONTHLY = "MONTHLY"
+
+_WEEKDAYS = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
+
+
+class RecurrenceError(ValueError):
+    """Regra de recorrência inválida (mensagem pronta para o usuário)."""
+
+
+@dataclass(frozen=True)
+class Recurrence:
+    freq: str
+    interval: int = 1
+    count: Optional[int] = None
+    until: Optional[datetime] = None
+    byweekday: Tuple[int, ...] = ()
+
+
+def parse_rrule(text: str, zone: Optional[tzinfo] = None) -> Recurrence:
+    """
+    Subconjunto do RRULE (RFC 5545): FREQ=DAILY|WEEKLY|MONTHLY, INTERVAL,
+    COUNT, UNTIL e BYDAY (só em WEEKLY).
+
+    UNTIL aceita data (20251124 ou 2025-11-24, vale o dia inteiro) ou
+    data/hora ISO. Com fuso (ex.: 20300401T000000Z) é convertido para o
+    horário local de `zone`, o mesmo das ocorrências; sem `zone`, é recusado.
+
+    Exemplo: "FREQ=WEEKLY;INTERVAL=1;COUNT=8;BYDAY=MO,TH"
+    """
+    parts = {}
+    for chunk in (text or "").strip().removeprefix("RRULE:").split(";"):
+        if not chunk:
+            continue
+        key, sep, value = chunk.partition("=")
+        if not sep:
+            raise RecurrenceError(f"parte inválida na regra: {chunk!r}")
+        parts[key.strip().upper()] = value.strip()
+
+    freq = parts.pop("FREQ", "").upper()
+    if freq not in (FREQ_DAILY, FREQ_WEEKLY, FREQ_MONTHLY):
+        raise RecurrenceError("FREQ deve ser DAILY, WEEKLY ou MONTHLY")
+
+    try:
+        interval = int(parts.pop("INTERVAL", "1"))
+        count = int(parts["COUNT"]) if "COUNT" in parts else None
+    except ValueError:
+        raise RecurrenceError("INTERVAL e COUNT devem ser inteiros")
+    parts.pop("COUNT", None)
+    if interval < 1 or (count is not None and count < 1):
+        raise RecurrenceError("INTERVAL e COUNT devem ser positivos")
+
+    until = _parse_until(parts.pop("UNTIL"), zone) if "UNTIL" in parts else None
+
+    if count is None and until is None:
+        raise RecurrenceError("informe COUNT ou UNTIL")
+
+    byweekday: Tuple[int, ...] = ()
+    if "BYDAY" in parts:
+        if freq != FREQ_WEEKLY:
+            raise RecurrenceError("BYDAY só é aceito com FREQ=WEEKLY")
+        try:
+            byweekday = tuple(
+                sorted({_WEEKDAYS[d.strip().upper()] for d in parts.pop("BYDAY").split(",")})
+            )
+        except KeyError:
+            raise RecurrenceError("BYDAY usa MO,TU,WE,TH,FR,SA,SU")
+
+    if parts:
+        raise RecurrenceError(f"parte não suportada: {', '.join(sorted(parts))}")
+
+    return Recurrence(freq, interval, count, until, byweekday)
+
+
+def _parse_until(raw: str, zone: Optional[tzinfo]) -> datetime:
+    """UNTIL como datetime sem fuso, comparável às ocorrências."""
+    try:
+        # só a data (básica ou estendida): vale o dia inteiro
+        return datetime.combine(date.fromisoformat(raw), time.max)
+    except ValueError:
+        pass
+    try:
+        until = datetime.fromisoformat(raw)
+    except ValueError:
+        raise RecurrenceError("UNTIL deve ser uma data ISO 8601")
+    if until.tzinfo is not None:
+        if zone is None:
+            raise RecurrenceError("UNTIL com fuso não é suportado; use o horário local")
+        until = until.astimezone(zone).replace(tzinfo=None)
+    return until
+
+
+def _add_months(d: date, months: int) -> Optional[date]:
+    """Mesmo dia `months` meses depois; None se o mês não tem esse dia (31/02)."""
+    month_index = d.month - 1 + months
+    year, month = d.year + month_index // 12, month_index % 12 + 1
+    if d.day > calendar.monthrange(year, month)[1]:
+        return None
+    return d.replace(year=year, month=month)
+
+
+def _candidates(start: datetime, rule: Recurrence):
+    """Gera os horários da série em ordem, sem limite (quem chama corta)."""
+    step = 0
+    while True:
+        if rule.freq == FREQ_DAILY:
+            yield start + timedelta(days=step * rule.interval)
+        elif rule.freq == FREQ_WEEKLY and not rule.byweekday:
+            yield start + timedelta(weeks=step * rule.interval)
+        elif rule.freq == FREQ_WEEKLY:
+            monday = start.date() - timedelta(days=start.weekday())
+            week = monday + timedelta(weeks=step * rule.interval)
+            for weekday in rule.byweekday:
+                moment = datetime.combine(week + timedelta(days=weekday), start.time())
+                if moment >= start:
+                    yield moment
+        else:
+            day = _add_months(start.date(), step * rule.interval)
+            if day is not None:
+                yield datetime.combine(day, start.time())
+        step += 1
+
+
+def expand(start: datetime, rule: Recurrence) -> List[datetime]:
+    """
+    Ocorrências da série a partir de `start` (a primeira é `start`, ou o
+    primeiro BYDAY a partir dele). Levanta RecurrenceError se passar de
+    MAX_OCCURRENCES.
+    """
+    occurrences: List[datetime] = []
+    for moment in _candidates(start, rule):
+        if rule.until is not None and moment > rule.until:
+            break
+        if rule.count is not None and len(occurrences) >= rule.count:
+            break
+        if len(occurrences) >= MAX_OCCURRENCES:
+            raise RecurrenceError(
+                f"a série pode ter no máximo {MAX_OCCURRENCES} consultas"
+            )
+        occurrences.append(moment)
+    return occurrences
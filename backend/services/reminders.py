@@ -0,0 +1,262 @@
+# backend/services/reminders.py
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Callable, Iterator, List, Optional
+
+from sqlalchemy import and_, func, insert, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased
+
+from extensions import db
+from models import Appointment, Consultation, Pet, PetVaccine, ReminderSent, User
+from services.availability import ACTIVE_STATUSES
+from services.display_time import agenda_now
+from services.notifications_service import create_notification
+
+
+KIND_APPOINTMENT = "appointment"
+KIND_VACCINE = "vaccine"
+KIND_NEXT_VISIT = "next_visit"
+
+
+@dataclass(frozen=True)
+class _Source:
+    """Uma fonte de lembretes: a consulta da janela e como montar o texto."""
+
+    kind: str
+    query: object  # select(item_id, due, user_id, ...) já filtrado pela janela
+    due_column: object
+    id_column: object
+    due_on: object  # expressão do dia do vencimento (para o marcador)
+    build: Callable  # row -> (title, message, link)
+
+
+def _fmt_date(value) -> str:
+    return value.strftime("%d/%m/%Y")
+
+
+def _appointment_source(now: datetime, lead_hours: int) -> _Source:
+    vet = aliased(User)
+    query = (
+        select(
+            Appointment.id,
+            Appointment.scheduled_at,
+            Appointment.tutor_id,
+            Pet.name,
+            vet.name,
+        )
+        .outerjoin(Pet, Pet.id == Appointment.pet_id)
+        .outerjoin(vet, vet.id == Appointment.vet_id)
+        .where(
+            Appointment.status.in_(ACTIVE_STATUSES),
+            Appointment.scheduled_at >= now,
+            Appointment.scheduled_at < now + timedelta(hours=lead_hours),
+        )
+    )
+
+    def build(row):
+        item_id, scheduled_at, _, pet_name, vet_name = row
+        return (
+            "Lembrete de consulta",
+            f"Consulta do pet {pet_name or ''} com {vet_name or 'o veterinário'} "
+            f"em {scheduled_at.strftime('%d/%m/%Y %H:%M')}.",
+            f"/tutor/appointment/{item_id}",
+        )
+
+    return _Source(
+        KIND_APPOINTMENT,
+        query,
+        Appointment.scheduled_at,
+        Appointment.id,
+        func.date(Appointment.scheduled_at),
+        build,
+    )
+
+
+def _vaccine_source(today: date, days_ahead: int) -> _Source:
+    query = (
+        select(
+            PetVaccine.id,
+            PetVaccine.next_dose,
+            Pet.owner_id,
+            Pet.name,
+            PetVaccine.name,
+            Pet.id,
+        )
+        .join(Pet, Pet.id == PetVaccine.pet_id)
+        .where(
+            PetVaccine.next_dose >= today,
+            PetVaccine.next_dose <= today + timedelta(days=days_ahead),
+        )
+    )
+
+    def build(row):
+        _, next_dose, _, pet_name, vaccine_name, pet_id = row
+        return (
+            "Próxima dose de vacina",
+            f"A próxima dose da vacina {vaccine_name} do pet {pet_name} "
+            f"é em {_fmt_date(next_dose)}.",
+            f"/tutor/animal/{pet_id}",
+        )
+
+    return _Source(
+        KIND_VACCINE,
+        query,
+        PetVaccine.next_dose,
+        PetVaccine.id,
+        PetVaccine.next_dose,
+        build,
+    )
+
+
+def _next_visit_source(today: date, days_ahead: int) -> _Source:
+    query = (
+        select(
+            Consultation.id,
+            Consultation.next_visit,
+            Consultation.tutor_id,
+            Pet.name,
+        )
+        .outerjoin(Pet, Pet.id == Consultation.pet_id)
+        .where(
+            Consultation.next_visit >= today,
+            Consultation.next_visit <= today + timedelta(days=days_ahead),
+        )
+    )
+
+    def build(row):
+        item_id, next_visit, _, pet_name = row
+        return (
+            "Retorno sugerido",
+            f"O retorno do pet {pet_name or ''} foi sugerido para "
+            f"{_fmt_date(next_visit)}. Que tal agendar?",
+            f"/tutor/consultation/{item_id}",
+        )
+
+    return _Source(
+        KIND_NEXT_VISIT,
+        query,
+        Consultation.next_visit,
+        Consultation.id,
+        Consultation.next_visit,
+        build,
+    )
+
+
+def _pending_batches(source: _Source, batch_size: int) -> Iterator[List]:
+    """
+    Itens da janela ainda sem lembrete, em lotes ordenados por
+    (vencimento, id). Anti-join com reminders_sent e paginação por keyset:
+    cada lote é uma consulta curta e a memória não cresce com o total.
+    """
+    pending = source.query.outerjoin(
+        ReminderSent,
+        and_(
+            ReminderSent.kind == source.kind,
+            ReminderSent.item_id == source.id_column,
+            ReminderSent.due_on == source.due_on,
+        ),
+    ).where(ReminderSent.id.is_(None))
+
+    last = None
+    while True:
+        query = pending
+        if last is not None:
+            last_due, last_id = last
+            query = query.where(
+                or_(
+                    source.due_column > last_due,
+                    and_(source.due_column == last_due, source.id_column > last_id),
+                )
+            )
+        rows = db.session.execute(
+            query.order_by(source.due_column, source.id_column).limit(batch_size)
+        ).all()
+        if not rows:
+            return
+        last = (rows[-1][1], rows[-1][0])
+        yield rows
+
+
+def _send_batch(source: _Source, rows) -> int:
+    """
+    Notificações e marcadores do lote numa transação só: ou o lote inteiro
+    conta como enviado, ou nada (e volta na próxima varredura).
+    """
+    markers = []
+    for row in rows:
+        item_id, due, user_id = row[0], row[1], row[2]
+        title, message, link = source.build(row)
+        create_notification(
+            user_id=user_id, type="info", title=title, message=message, link=link
+        )
+        markers.append(
+            {
+                "kind": source.kind,
+                "item_id": item_id,
+                "due_on": due.date() if isinstance(due, datetime) else due,
+                "user_id": user_id,
+                "sent_at": datetime.utcnow(),
+            }
+        )
+
+    try:
+        db.session.execute(insert(ReminderSent), markers)
+        db.session.commit()
+    except IntegrityError:
+        # outro processo marcou parte do lote antes; desfaz (inclusive as
+        # notificações do outbox) e deixa o resto para a próxima varredura
+        db.session.rollback()
+        return 0
+    return len(rows)
+
+
+def run_reminders(
+    batch_size: int = 500,
+    appointment_lead_hours: int = 24,
+    due_days_ahead: int = 7,
+    now: Optional[datetime] = None,
+    report: Optional[Callable[[str, int, int, float], None]] = None,
+) -> dict:
+    """
+    Uma varredura do agendador de lembretes.
+
+    - consultas PENDING/CONFIRMED nas próximas `appointment_lead_hours`;
+    - próximas doses de vacina e retornos sugeridos nos próximos
+      `due_days_ahead` dias.
+
+    Cada fonte é lida por janela de tempo indexada, em lotes; cada lote
+    grava notificações (outbox, INSERT em lote) e marcadores no mesmo
+    commit. Rodar de novo não duplica nada.
+
+    `now` é horário da agenda (DISPLAY_TIMEZONE), o mesmo de scheduled_at.
+    """
+    now = now or agenda_now()
+    sources = [
+        _appointment_source(now, appointment_lead_hours),
+        _vaccine_source(now.date(), due_days_ahead),
+        _next_visit_source(now.date(), due_days_ahead),
+    ]
+
+    result = {}
+    started = time.monotonic()
+    for source in sources:
+        source_started = time.monotonic()
+        total = 0
+        for rows in _pending_batches(source, batch_size):
+            sent = _send_batch(source, rows)
+            total += sent
+            if report is not None:
+                elapsed = time.monotonic() - source_started
+                report(source.kind, sent, total, total / elapsed if elapsed else 0.0)
+        result[source.kind] = total
+
+    elapsed = time.monotonic() - started
+    processed = sum(result.values())
+    result["seconds"] = round(elapsed, 3)
+    result["rows_per_second"] = round(processed / elapsed, 1) if elapsed else 0.0
+    return result
@@ -0,0 +1,82 @@
+# backend/services/single_flight.py
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, Tuple
+
+
+class _Call:
+    """Uma execução em andamento; os seguidores esperam no evento."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Junta chamadas concorrentes com a mesma chave numa única execução.
+
+    A primeira thread que pede uma chave executa `fn` (líder); as que chegam
+    enquanto ela roda só esperam e recebem o mesmo resultado (ou a mesma
+    exceção). Vale dentro do processo; a coordenação entre processos fica
+    por conta de quem chama (ex.: lock no banco).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._stats = {"calls": 0, "executions": 0, "coalesced": 0}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Executa `fn` uma vez por chave em voo.
+
+        Retorna (resultado, shared), onde `shared` é True quando o resultado
+        veio da execução de outra thread.
+        """
+        with self._lock:
+            self._stats["calls"] += 1
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self._stats["coalesced"] += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self._stats["executions"] += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result, False
+
+    def record(self, counter: str, amount: int = 1) -> None:
+        """Soma `amount` a um contador extra, sob o mesmo lock das estatísticas."""
+        with self._lock:
+            self._stats[counter] = self._stats.get(counter, 0) + amount
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores desde o início do processo, mais as chaves em voo agora."""
+        with self._lock:
+            data = dict(self._stats)
+            data["in_flight"] = len(self._calls)
+        return data
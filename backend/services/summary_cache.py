@@ -0,0 +1,139 @@
+# backend/services/summary_cache.py
+
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime, timedelta
+from typing import Optional, Sequence
+
+from flask import current_app
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from extensions import db
+from models import Consultation, ConsultationSummary
+
+
+def summary_scope(user_id: int, role: str | None) -> str:
+    """
+    Escopo de quem vê o resumo.
+
+    Vet e tutor enxergam conjuntos diferentes de consultas do mesmo pet,
+    então o resumo de um não pode ser servido para o outro.
+    """
+    prefix = "vet" if role == "veterinarian" else "tutor"
+    return f"{prefix}:{user_id}"
+
+
+def consultations_content_hash(consultations: Sequence[Consultation]) -> str:
+    """Hash (sha256) do conteúdo clínico das consultas usadas no resumo."""
+    h = hashlib.sha256()
+    for c in sorted(consultations, key=lambda c: c.id or 0):
+        parts = [
+            str(c.id),
+            c.date.isoformat() if c.date else "",
+            c.diagnosis or "",
+            c.treatment or "",
+            c.observations or "",
+            c.next_visit.isoformat() if c.next_visit else "",
+        ]
+        h.update("\x1f".join(parts).encode("utf-8"))
+        h.update(b"\x1e")
+    return h.hexdigest()
+
+
+def _ttl() -> timedelta:
+    return timedelta(minutes=current_app.config.get("SUMMARY_CACHE_TTL_MINUTES", 30))
+
+
+def get_cached(pet_id: int, scope: str, content_hash: str) -> Optional[str]:
+    """Busca um resumo ainda dentro do TTL para (pet, escopo, conteúdo)."""
+    min_generated_at = datetime.utcnow() - _ttl()
+
+    row = (
+        ConsultationSummary.query
+        .filter_by(pet_id=pet_id, scope=scope, content_hash=content_hash)
+        .filter(ConsultationSummary.generated_at >= min_generated_at)
+        .first()
+    )
+    return row.summary if row else None
+
+
+def get_cached_any_scope(pet_id: int, content_hash: str) -> Optional[str]:
+    """
+    Busca um resumo válido para o mesmo conteúdo, gerado para qualquer escopo.
+
+    Mesmo conteúdo significa mesmo prompt, então o texto pode ser reaproveitado.
+    """
+    min_generated_at = datetime.utcnow() - _ttl()
+
+    row = (
+        ConsultationSummary.query
+        .filter_by(pet_id=pet_id, content_hash=content_hash)
+        .filter(ConsultationSummary.generated_at >= min_generated_at)
+        .first()
+    )
+    return row.summary if row else None
+
+
+def _evict(session: Session) -> None:
+    """Remove entradas expiradas e, se passar do limite, as mais antigas."""
+    session.execute(
+        delete(ConsultationSummary).where(
+            ConsultationSummary.generated_at < datetime.utcnow() - _ttl()
+        )
+    )
+
+    max_entries = current_app.config.get("SUMMARY_CACHE_MAX_ENTRIES", 5000)
+    cutoff = session.scalar(
+        select(ConsultationSummary.generated_at)
+        .order_by(ConsultationSummary.generated_at.desc())
+        .offset(max_entries)
+        .limit(1)
+    )
+    if cutoff is not None:
+        session.execute(
+            delete(ConsultationSummary).where(ConsultationSummary.generated_at <= cutoff)
+        )
+
+
+def store(
+    pet_id: int,
+    scope: str,
+    content_hash: str,
+    summary: str,
+    consultation_count: int,
+) -> None:
+    """
+    Grava o resumo no cache compartilhado.
+
+    Resumos antigos do mesmo pet/escopo são descartados (o conteúdo mudou).
+    Se outro processo gravou o mesmo resumo ao mesmo tempo, mantém o dele.
+
+    A gravação usa uma sessão (e transação) própria: não confirma nem
+    descarta o que a sessão de quem chamou tiver pendente.
+    """
+    try:
+        with Session(db.engine) as session, session.begin():
+            session.execute(
+                delete(ConsultationSummary).where(
+                    ConsultationSummary.pet_id == pet_id,
+                    ConsultationSummary.scope == scope,
+                )
+            )
+            session.add(
+                ConsultationSummary(
+                    pet_id=pet_id,
+                    scope=scope,
+                    content_hash=content_hash,
+                    summary=summary,
+                    consultation_count=consultation_count,
+                    generated_at=datetime.utcnow(),
+                )
+            )
+            session.flush()
+            _evict(session)
+    except IntegrityError:
+        # session.begin() já desfez a transação do cache
+        pass
@@ -0,0 +1,220 @@
+# backend/services/summary_jobs.py
+
+from __future__ import annotations
+
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from flask import current_app
+from sqlalchemy import delete, update
+
+from extensions import db
+from models import Pet, SummaryJob
+from services.ai_summary_service import (
+    ENGINE_EXTRACTIVE,
+    generate_consultations_summary,
+    get_summary_consultations,
+    summary_engine,
+)
+from services.summary_cache import summary_scope
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+# jobs finalizados ficam disponíveis para consulta por este tempo
+_FINISHED_JOB_TTL = timedelta(minutes=10)
+
+# regerações agendadas após escrita, por (pet_id, user_id, role)
+_refresh_timers: Dict[Tuple[int, int, Optional[str]], threading.Timer] = {}
+_refresh_lock = threading.Lock()
+_refresh_stats = {"scheduled": 0, "debounced": 0, "runs": 0}
+
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_ERROR = "error"
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=current_app.config.get("SUMMARY_JOB_WORKERS", 2),
+                thread_name_prefix="summary-job",
+            )
+        return _executor
+
+
+def _prune_finished_jobs(now: datetime) -> None:
+    """Remove jobs finalizados há mais tempo que _FINISHED_JOB_TTL (índice em finished_at)."""
+    db.session.execute(
+        delete(SummaryJob).where(SummaryJob.finished_at < now - _FINISHED_JOB_TTL)
+    )
+
+
+def _update_job(job_id: str, **fields) -> None:
+    """Grava o novo estado do job e confirma na hora (quem faz polling lê do banco)."""
+    try:
+        db.session.execute(
+            update(SummaryJob).where(SummaryJob.id == job_id).values(**fields)
+        )
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+def _run_job(app, job_id: str, pet_id: int, user_id: int, role: str | None) -> None:
+    """Executa a geração do resumo numa thread do pool, com app context próprio."""
+    with app.app_context():
+        try:
+            # dentro do try: se nem isso gravar, o job termina em erro (e o
+            # polling do frontend para) em vez de ficar pendente para sempre
+            _update_job(job_id, status=STATUS_RUNNING)
+            pet = Pet.query.get(pet_id)
+            if pet is None:
+                raise LookupError("Pet não encontrado")
+
+            consultations = get_summary_consultations(pet, user_id, role)
+            summary = generate_consultations_summary(
+                pet, consultations, summary_scope(user_id, role)
+            )
+
+            _update_job(
+                job_id,
+                status=STATUS_DONE,
+                summary=summary,
+                consultation_count=len(consultations),
+                finished_at=datetime.utcnow(),
+            )
+        except Exception as e:
+            print(f"[SUMMARY JOB] Erro no job {job_id}: {e}")
+            db.session.rollback()
+            _update_job(
+                job_id,
+                status=STATUS_ERROR,
+                error=str(e),
+                finished_at=datetime.utcnow(),
+            )
+
+
+def enqueue_summary_job(pet_id: int, user_id: int, role: str | None) -> Dict[str, Any]:
+    """
+    Enfileira a geração do resumo de consultas de um pet e retorna o job.
+
+    O trabalho pesado (chamada ao LLM) roda no pool de threads, liberando o
+    worker HTTP na hora.
+    """
+    now = datetime.utcnow()
+    _prune_finished_jobs(now)
+
+    job = SummaryJob(
+        id=uuid.uuid4().hex,
+        status=STATUS_PENDING,
+        pet_id=pet_id,
+        user_id=user_id,
+        created_at=now,
+    )
+    db.session.add(job)
+    # o job precisa estar visível antes de a thread (e o polling) procurar por ele
+    db.session.commit()
+    data = job.to_dict()
+
+    app = current_app._get_current_object()
+    _get_executor().submit(_run_job, app, data["job_id"], pet_id, user_id, role)
+
+    return data
+
+
+def get_summary_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """Retorna o job (ou None se não existir / já expirou), de qualquer processo."""
+    job = db.session.get(SummaryJob, job_id)
+    return job.to_dict() if job is not None else None
+
+
+def job_to_dict(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Serialização do job para a API."""
+    data = {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "pet_id": job["pet_id"],
+    }
+    if job["status"] == STATUS_DONE:
+        data["summary"] = job["summary"]
+        data["consultation_count"] = job["consultation_count"]
+    elif job["status"] == STATUS_ERROR:
+        data["message"] = "Não foi possível gerar o resumo automático."
+    return data
+
+
+def _run_refresh(app, pet_id: int, user_id: int, role: str | None) -> None:
+    """Regera (e grava no cache) o resumo de um pet para um visualizador."""
+    with app.app_context():
+        try:
+            pet = Pet.query.get(pet_id)
+            if pet is None:
+                return
+
+            consultations = get_summary_consultations(pet, user_id, role)
+            generate_consultations_summary(
+                pet, consultations, summary_scope(user_id, role)
+            )
+        except Exception as e:
+            print(f"[SUMMARY REFRESH] Erro ao regerar resumo do pet {pet_id}: {e}")
+
+
+def _fire_refresh(app, key: Tuple[int, int, Optional[str]]) -> None:
+    with _refresh_lock:
+        _refresh_timers.pop(key, None)
+        _refresh_stats["runs"] += 1
+
+    with app.app_context():
+        executor = _get_executor()
+    executor.submit(_run_refresh, app, *key)
+
+
+def schedule_summary_refresh(
+    pet_id: int, viewers: Iterable[Tuple[int, Optional[str]]]
+) -> None:
+    """
+    Agenda a regeneração do resumo de um pet após uma escrita.
+
+    `viewers` são pares (user_id, role) cujos resumos mudaram (ex.: o tutor
+    e o vet da consulta). Cada par tem debounce de
+    SUMMARY_REFRESH_DEBOUNCE_SECONDS: várias consultas seguidas geram uma
+    única regeneração, feita no mesmo pool dos jobs.
+    """
+    if summary_engine() == ENGINE_EXTRACTIVE:
+        # resumo extrativo é instantâneo, não precisa pré-calcular
+        return
+
+    app = current_app._get_current_object()
+    delay = app.config.get("SUMMARY_REFRESH_DEBOUNCE_SECONDS", 30)
+
+    with _refresh_lock:
+        for user_id, role in viewers:
+            key = (pet_id, user_id, role)
+
+            previous = _refresh_timers.pop(key, None)
+            if previous is not None:
+                previous.cancel()
+                _refresh_stats["debounced"] += 1
+
+            timer = threading.Timer(delay, _fire_refresh, args=(app, key))
+            timer.daemon = True
+            _refresh_timers[key] = timer
+            _refresh_stats["scheduled"] += 1
+            timer.start()
+
+
+def summary_refresh_stats() -> Dict[str, int]:
+    """Métricas das regenerações agendadas após escrita."""
+    with _refresh_lock:
+        data = dict(_refresh_stats)
+        data["pending"] = len(_refresh_timers)
+    return data
@@ -0,0 +1,47 @@
+# backend/services/text_search.py
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import List
+
+from sqlalchemy import literal, or_
+
+
+def fold_text(text: str) -> str:
+    """Minúsculas, sem acentos e com espaços normalizados ("Não  RESPIRA" -> "nao respira")."""
+    decomposed = unicodedata.normalize("NFKD", (text or "").lower())
+    without_accents = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return re.sub(r"\s+", " ", without_accents).strip()
+
+
+def search_terms(query: str) -> List[str]:
+    """Palavras da busca já normalizadas, sem curingas do LIKE (e sem as que só tinham isso)."""
+    words = (re.sub(r"[%_\\]", "", word) for word in fold_text(query).split(" "))
+    return [word for word in words if word]
+
+
+def word_prefix(column, term: str):
+    """
+    `column` (texto normalizado com fold_text) tem uma palavra que começa
+    com `term`. No PostgreSQL os dois LIKE usam o índice GIN de trigramas.
+    """
+    return or_(column.like(f"{term}%"), column.like(f"% {term}%"))
+
+
+# termos menores que isso têm poucos trigramas: só a busca por prefixo
+FUZZY_MIN_LENGTH = 3
+
+
+def word_match(column, term: str, fuzzy: bool = False):
+    """
+    word_prefix; com `fuzzy` (PostgreSQL com pg_trgm) aceita também uma
+    palavra parecida, tolerando erro de digitação ("toby" acha "tobby"):
+    operador <% (word_similarity acima de pg_trgm.word_similarity_threshold),
+    atendido pelo mesmo índice GIN de trigramas.
+    """
+    match = word_prefix(column, term)
+    if fuzzy and len(term) >= FUZZY_MIN_LENGTH:
+        match = or_(match, literal(term).op("<%")(column))
+    return match
@@ -0,0 +1,133 @@
+# backend/services/triage_rescore.py
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select, update
+
+from extensions import db
+from models import Pet, Triage
+from services.triage_rules import TriageRuleSet, load_rule_set
+
+
+# (id, sintomas, espécie, risco atual)
+_Row = Tuple[int, str, Optional[str], str]
+
+# regras carregadas em cada processo do pool (initializer)
+_worker_rule_set: Optional[TriageRuleSet] = None
+
+
+def _init_worker(rules_path: str) -> None:
+    global _worker_rule_set
+    _worker_rule_set = load_rule_set(rules_path)
+
+
+def _score_chunk(rows: List[_Row]) -> List[Tuple[int, str, Dict[str, str]]]:
+    """Roda no pool: (id, risco antigo, análise nova) para cada triagem."""
+    results = []
+    for triage_id, symptoms, species, old_risk in rows:
+        analysis = _worker_rule_set.analyze(symptoms, species)
+        results.append(
+            (
+                triage_id,
+                old_risk,
+                {
+                    "risk_level": analysis["risk_level"],
+                    "ai_summary": analysis["ai_summary"],
+                    "recommendations": analysis["recommendations"],
+                    "rule_set_version": analysis["rule_set_version"],
+                },
+            )
+        )
+    return results
+
+
+def _chunks(chunk_size: int) -> Iterator[List[_Row]]:
+    """Triagens em ordem de id, por keyset (nunca carrega a tabela inteira)."""
+    last_id = 0
+    while True:
+        rows = db.session.execute(
+            select(Triage.id, Triage.symptoms, Pet.species, Triage.risk_level)
+            .join(Pet, Pet.id == Triage.pet_id)
+            .where(Triage.id > last_id)
+            .order_by(Triage.id)
+            .limit(chunk_size)
+        ).all()
+        if not rows:
+            return
+        last_id = rows[-1][0]
+        yield [tuple(r) for r in rows]
+
+
+def rescore_triages(
+    rules_path: str,
+    chunk_size: int = 500,
+    workers: Optional[int] = None,
+    apply: bool = False,
+    report: Optional[Callable[[int, float], None]] = None,
+) -> dict:
+    """
+    Reavalia todas as triagens com as regras de `rules_path`.
+
+    Lê em lotes de `chunk_size`, avalia num pool de processos (no máximo
+    2 lotes por processo em voo, para não acumular memória) e conta a
+    mudança de risco (drift) antigo -> novo. Com `apply`, grava o novo
+    resultado e a versão das regras, um commit por lote.
+
+    `report(total_processado, linhas_por_segundo)` é chamado a cada lote.
+    """
+    # carrega uma vez aqui também: arquivo inválido falha antes de abrir o pool
+    version = load_rule_set(rules_path).version
+
+    drift: Counter = Counter()
+    processed = 0
+    started = time.monotonic()
+
+    def consume(results):
+        nonlocal processed
+        for triage_id, old_risk, new in results:
+            drift[(old_risk, new["risk_level"])] += 1
+        if apply and results:
+            db.session.execute(
+                update(Triage), [{"id": tid, **new} for tid, _, new in results]
+            )
+            db.session.commit()
+        processed += len(results)
+        if report is not None:
+            elapsed = time.monotonic() - started
+            report(processed, processed / elapsed if elapsed else 0.0)
+
+    workers = workers or os.cpu_count() or 1
+    window = 2 * workers
+
+    # spawn: os filhos não herdam as conexões abertas do pool do SQLAlchemy
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(rules_path,),
+    ) as pool:
+        pending = []
+        for rows in _chunks(chunk_size):
+            pending.append(pool.submit(_score_chunk, rows))
+            if len(pending) >= window:
+                consume(pending.pop(0).result())
+        for future in pending:
+            consume(future.result())
+
+    elapsed = time.monotonic() - started
+    changed = sum(n for (old, new), n in drift.items() if old != new)
+    return {
+        "version": version,
+        "processed": processed,
+        "changed": changed,
+        "drift": {f"{old}->{new}": n for (old, new), n in sorted(drift.items())},
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(processed / elapsed, 1) if elapsed else 0.0,
+    }
@@ -0,0 +1,321 @@
+# backend/services/triage_rules.py
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from flask import current_app
+
+from services.text_search import fold_text
+
+
+# níveis das regras (que somam pontos) e níveis de risco do resultado
+LEVEL_URGENT = "urgent"
+LEVEL_WARNING = "warning"
+
+RISK_URGENT = "urgent"
+RISK_MONITOR = "monitor"
+RISK_OK = "ok"
+
+
+@dataclass(frozen=True)
+class TriageRule:
+    """Um sinal clínico: id estável, nível, termos (radicais) e peso por termo."""
+
+    id: str
+    level: str
+    terms: Tuple[str, ...]
+    weight: float = 1.0
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick: acha todas as ocorrências de todos os termos numa única
+    passada pelo texto. O custo por chamada depende do tamanho do texto, não
+    da quantidade de termos.
+    """
+
+    def __init__(self, patterns: Sequence[str]):
+        self.patterns = list(patterns)
+
+        # estado 0 é a raiz; _goto[s][ch] -> próximo estado
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = nxt
+            self._out[state] += (index,)
+
+        # links de falha em largura; cada estado herda as saídas do seu link
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def find(self, text: str, word_start: bool = False) -> set:
+        """
+        Índices (em `patterns`) dos termos presentes no texto. Com
+        `word_start`, só conta ocorrência que começa uma palavra (termos são
+        radicais: "convuls" acha "convulsão", mas "febre" não acha "antifebre").
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        state = 0
+        for position, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            if not word_start:
+                found.update(out[state])
+                continue
+            for index in out[state]:
+                start = position - len(self.patterns[index]) + 1
+                if start == 0 or not text[start - 1].isalnum():
+                    found.add(index)
+        return found
+
+
+@dataclass(frozen=True)
+class TriageMatch:
+    urgent_score: float
+    warning_score: float
+    # {rule_id: [termos encontrados]}, na ordem das regras
+    fired: Dict[str, List[str]]
+
+
+class RuleMatcher:
+    """Regras compiladas uma vez (no carregamento) num único autômato."""
+
+    def __init__(self, rules: Iterable[TriageRule]):
+        self.rules = list(rules)
+
+        # termo normalizado -> regras que o usam
+        owners: Dict[str, List[int]] = {}
+        for rule_index, rule in enumerate(self.rules):
+            for term in rule.terms:
+                folded = fold_text(term)
+                if folded:
+                    owners.setdefault(folded, []).append(rule_index)
+
+        self._terms = list(owners)
+        self._owners = [owners[t] for t in self._terms]
+        self._automaton = KeywordAutomaton(self._terms)
+
+    def match(self, text: str) -> TriageMatch:
+        scores = {LEVEL_URGENT: 0.0, LEVEL_WARNING: 0.0}
+        fired: Dict[int, List[str]] = {}
+
+        for term_index in sorted(self._automaton.find(fold_text(text), word_start=True)):
+            term = self._terms[term_index]
+            for rule_index in self._owners[term_index]:
+                rule = self.rules[rule_index]
+                fired.setdefault(rule_index, []).append(term)
+                scores[rule.level] += rule.weight
+
+        return TriageMatch(
+            urgent_score=scores[LEVEL_URGENT],
+            warning_score=scores[LEVEL_WARNING],
+            fired={self.rules[i].id: fired[i] for i in sorted(fired)},
+        )
+
+
+class TriageProfile:
+    """Regras + limiares + textos de um público (padrão ou uma espécie)."""
+
+    def __init__(self, rules, thresholds, texts):
+        self.matcher = RuleMatcher(rules)
+        self.thresholds = thresholds
+        self.texts = texts
+
+    def _reaches(self, risk: str, metrics: Dict[str, float]) -> bool:
+        # o nível é atingido se qualquer métrica listada chegar ao limiar
+        return any(
+            metrics.get(name, 0) >= limit
+            for name, limit in self.thresholds.get(risk, {}).items()
+        )
+
+    def analyze(self, symptoms: str) -> Dict[str, Any]:
+        match = self.matcher.match(symptoms)
+        metrics = {
+            "urgent_score": match.urgent_score,
+            "warning_score": match.warning_score,
+            "word_count": len((symptoms or "").split()),
+        }
+
+        if self._reaches(RISK_URGENT, metrics):
+            risk_level = RISK_URGENT
+        elif self._reaches(RISK_MONITOR, metrics):
+            risk_level = RISK_MONITOR
+        else:
+            risk_level = RISK_OK
+
+        texts = self.texts[risk_level]
+        return {
+            "risk_level": risk_level,
+            "ai_summary": texts["ai_summary"],
+            "recommendations": texts["recommendations"],
+            "matched_rules": match.fired,
+        }
+
+
+class TriageRuleSet:
+    """Versão carregada das regras: perfil padrão + perfis por espécie."""
+
+    def __init__(self, version: str, default: TriageProfile, species: Dict[str, TriageProfile]):
+        self.version = version
+        self.default = default
+        self.species = species
+
+    def profile_for(self, species: Optional[str]) -> TriageProfile:
+        return self.species.get(fold_text(species or ""), self.default)
+
+    def analyze(self, symptoms: str, species: Optional[str] = None) -> Dict[str, Any]:
+        result = self.profile_for(species).analyze(symptoms)
+        result["rule_set_version"] = self.version
+        return result
+
+
+def _parse_rules(items) -> List[TriageRule]:
+    rules = []
+    for item in items or []:
+        level = item.get("level")
+        if level not in (LEVEL_URGENT, LEVEL_WARNING):
+            raise ValueError(f"regra {item.get('id')!r}: nível inválido {level!r}")
+        if not item.get("id") or not item.get("terms"):
+            raise ValueError("toda regra precisa de id e terms")
+        rules.append(
+            TriageRule(
+                id=item["id"],
+                level=level,
+                terms=tuple(item["terms"]),
+                weight=float(item.get("weight", 1)),
+            )
+        )
+    return rules
+
+
+def _merge_rules(base: List[TriageRule], extra: List[TriageRule]) -> List[TriageRule]:
+    """Regras da espécie substituem as de mesmo id e acrescentam as novas."""
+    by_id = {rule.id: rule for rule in base}
+    by_id.update((rule.id, rule) for rule in extra)
+    return list(by_id.values())
+
+
+def parse_rule_set(data: Dict[str, Any]) -> TriageRuleSet:
+    """Valida e compila o conteúdo de um arquivo de regras."""
+    version = str(data.get("version") or "").strip()
+    if not version:
+        raise ValueError("o arquivo de regras precisa de version")
+
+    thresholds = data.get("thresholds") or {}
+    texts = data.get("texts") or {}
+    for risk in (RISK_URGENT, RISK_MONITOR, RISK_OK):
+        entry = texts.get(risk) or {}
+        if not entry.get("ai_summary") or not entry.get("recommendations"):
+            raise ValueError(f"faltam os textos do nível {risk!r}")
+
+    rules = _parse_rules(data.get("rules"))
+    default = TriageProfile(rules, thresholds, texts)
+
+    species = {}
+    for name, override in (data.get("species") or {}).items():
+        # limiares e textos da espécie sobrescrevem os padrão, nível a nível
+        species_thresholds = {risk: dict(v) for risk, v in thresholds.items()}
+        for risk, values in (override.get("thresholds") or {}).items():
+            species_thresholds.setdefault(risk, {}).update(values)
+
+        species_texts = {risk: dict(v) for risk, v in texts.items()}
+        for risk, values in (override.get("texts") or {}).items():
+            species_texts.setdefault(risk, {}).update(values)
+
+        species[fold_text(name)] = TriageProfile(
+            _merge_rules(rules, _parse_rules(override.get("rules"))),
+            species_thresholds,
+            species_texts,
+        )
+
+    return TriageRuleSet(version, default, species)
+
+
+def load_rule_set(path: str) -> TriageRuleSet:
+    with open(path, encoding="utf-8") as f:
+        return parse_rule_set(json.load(f))
+
+
+# Regras em uso: trocadas por inteiro (uma atribuição) quando o arquivo muda,
+# então cada triagem vê uma versão só, sem lock na leitura.
+_rule_set: Optional[TriageRuleSet] = None
+_loaded_mtime: Optional[float] = None
+_checked_at = 0.0
+_reload_lock = threading.Lock()
+
+
+def _rules_path() -> str:
+    return current_app.config["TRIAGE_RULES_PATH"]
+
+
+def get_rule_set() -> TriageRuleSet:
+    """
+    Regras em uso pela triagem.
+
+    A cada TRIAGE_RULES_RELOAD_SECONDS confere o mtime do arquivo
+    (TRIAGE_RULES_PATH); se mudou, compila a nova versão e troca. Um arquivo
+    inválido mantém a versão anterior (só na primeira carga o erro sobe).
+    """
+    global _rule_set, _loaded_mtime, _checked_at
+
+    interval = current_app.config.get("TRIAGE_RULES_RELOAD_SECONDS", 5)
+    current = _rule_set
+    if current is not None and time.monotonic() - _checked_at < interval:
+        return current
+
+    with _reload_lock:
+        if _rule_set is not None and time.monotonic() - _checked_at < interval:
+            return _rule_set
+
+        path = _rules_path()
+        _checked_at = time.monotonic()
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            if _rule_set is None:
+                raise
+            return _rule_set
+
+        if _rule_set is not None and mtime == _loaded_mtime:
+            return _rule_set
+
+        # o mtime é registrado mesmo se falhar: só tenta de novo quando o
+        # arquivo for salvo outra vez
+        _loaded_mtime = mtime
+        try:
+            _rule_set = load_rule_set(path)
+        except Exception as e:
+            if _rule_set is None:
+                raise
+            print(f"[TRIAGE RULES] Mantendo versão {_rule_set.version}: {e}")
+        return _rule_set
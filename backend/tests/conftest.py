@@ -0,0 +1,88 @@
+# backend/tests/conftest.py
+
+import os
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from config import Config
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """
+    App com banco próprio por teste: SQLite num arquivo temporário, ou o
+    banco de TEST_DATABASE_URL (ex.: um PostgreSQL local descartável).
+    """
+    url = os.getenv("TEST_DATABASE_URL") or f"sqlite:///{tmp_path / 'test.db'}"
+    monkeypatch.setattr(Config, "SQLALCHEMY_DATABASE_URI", url)
+
+    from app import create_app
+    from extensions import db
+
+    app = create_app()
+    app.config["TESTING"] = True
+
+    with app.app_context():
+        if db.engine.dialect.name == "postgresql":
+            with db.engine.begin() as conn:
+                conn.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def register(client):
+    """register(nome, email, role) -> (headers com o JWT, id do usuário)."""
+
+    def _register(name, email, role="tutor"):
+        body = {"name": name, "email": email, "password": "senha123", "role": role}
+        if role == "veterinarian":
+            body["crmv"] = "CRMV-SP 12345"
+        response = client.post("/api/auth/register", json=body)
+        assert response.status_code == 201, response.json
+
+        response = client.post(
+            "/api/auth/login", json={"email": email, "password": "senha123"}
+        )
+        assert response.status_code == 200, response.json
+        headers = {"Authorization": f"Bearer {response.json['access_token']}"}
+        return headers, response.json["user"]["id"]
+
+    return _register
+
+
+@pytest.fixture
+def count_queries(app):
+    """
+    Conta os comandos SQL emitidos dentro do bloco:
+
+        with count_queries() as statements:
+            client.get(...)
+        assert len(statements) == 2
+    """
+    from extensions import db
+
+    @contextmanager
+    def _count():
+        statements = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append((statement, parameters))
+
+        event.listen(db.engine, "before_cursor_execute", _record)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, "before_cursor_execute", _record)
+
+    return _count
@@ -0,0 +1,161 @@
+# backend/tests/test_appointments.py
+
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from extensions import db
+from models import Appointment, Notification, Pet
+
+
+@pytest.fixture
+def vet_and_tutor(register):
+    vet_headers, vet_id = register("Dra. Ana", "ana@vet.com", "veterinarian")
+    tutor_headers, tutor_id = register("João", "joao@x.com")
+    return vet_headers, vet_id, tutor_headers, tutor_id
+
+
+def _seed_appointments(
+    vet_id,
+    tutor_id,
+    count,
+    start=datetime(2030, 1, 7, 8, 0),
+    step=timedelta(minutes=30),
+    status="PENDING",
+):
+    """Cria `count` agendamentos, cada um com um pet diferente do tutor."""
+    pets = [Pet(name=f"Pet {i}", owner_id=tutor_id) for i in range(count)]
+    db.session.add_all(pets)
+    db.session.flush()
+    db.session.add_all(
+        Appointment(
+            pet_id=pet.id,
+            tutor_id=tutor_id,
+            vet_id=vet_id,
+            scheduled_at=start + i * step,
+            status=status,
+        )
+        for i, pet in enumerate(pets)
+    )
+    db.session.commit()
+
+
+def _list_statement_count(client, headers, count_queries, limit):
+    with count_queries() as statements:
+        response = client.get(f"/api/appointments?limit={limit}", headers=headers)
+    assert response.status_code == 200
+    assert len(response.json["items"]) == limit
+    return len(statements)
+
+
+def test_list_query_count_does_not_grow_with_rows(client, count_queries, vet_and_tutor):
+    vet_headers, vet_id, _, tutor_id = vet_and_tutor
+
+    _seed_appointments(vet_id, tutor_id, 5)
+    small = _list_statement_count(client, vet_headers, count_queries, limit=5)
+
+    _seed_appointments(vet_id, tutor_id, 95, start=datetime(2030, 2, 4, 8, 0))
+    large = _list_statement_count(client, vet_headers, count_queries, limit=100)
+
+    # página + nomes de pets + nomes de usuários
+    assert small == large == 3
+
+
+def test_list_names_are_enriched(client, vet_and_tutor):
+    vet_headers, vet_id, tutor_headers, tutor_id = vet_and_tutor
+    _seed_appointments(vet_id, tutor_id, 2)
+
+    for headers in (vet_headers, tutor_headers):
+        items = client.get("/api/appointments?limit=10", headers=headers).json["items"]
+        assert {i["vet_name"] for i in items} == {"Dra. Ana"}
+        assert {i["tutor_name"] for i in items} == {"João"}
+        assert {i["pet_name"] for i in items} == {"Pet 0", "Pet 1"}
+
+
+def test_keyset_pages_cross_ties_without_gaps_or_duplicates(client, vet_and_tutor):
+    vet_headers, vet_id, _, tutor_id = vet_and_tutor
+    # 3 agendamentos por horário (só um ativo): o limite de página cai no
+    # meio de um empate
+    for status in ("PENDING", "CANCELLED", "COMPLETED"):
+        _seed_appointments(vet_id, tutor_id, 4, step=timedelta(hours=1), status=status)
+
+    seen = []
+    cursor = None
+    while True:
+        url = "/api/appointments?limit=5" + (f"&cursor={cursor}" if cursor else "")
+        body = client.get(url, headers=vet_headers).json
+        seen.extend((item["scheduled_at"], item["id"]) for item in body["items"])
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+
+    assert len(seen) == 12
+    assert len({item_id for _, item_id in seen}) == 12
+    assert seen == sorted(seen, reverse=True)
+
+
+def test_unpaginated_list_sets_next_cursor_header(client, vet_and_tutor):
+    vet_headers, vet_id, _, tutor_id = vet_and_tutor
+    _seed_appointments(vet_id, tutor_id, 101)
+
+    response = client.get("/api/appointments", headers=vet_headers)
+    assert response.status_code == 200
+    assert len(response.json) == 100
+    assert response.headers.get("X-Next-Cursor")
+
+
+def test_invalid_cursor_returns_400(client, vet_and_tutor):
+    vet_headers = vet_and_tutor[0]
+    response = client.get("/api/appointments?cursor=nao-e-cursor", headers=vet_headers)
+    assert response.status_code == 400
+
+
+def test_concurrent_bookings_for_the_same_slot_allow_only_one(app, vet_and_tutor):
+    _, vet_id, tutor_headers, tutor_id = vet_and_tutor
+    pet = Pet(name="Rex", owner_id=tutor_id)
+    db.session.add(pet)
+    db.session.commit()
+    body = {"pet_id": pet.id, "vet_id": vet_id, "scheduled_at": "2030-01-07T10:00:00"}
+
+    workers = 8
+    barrier = threading.Barrier(workers)
+    statuses = []
+
+    def book():
+        # um cliente por thread; a barreira solta todas as requisições juntas
+        client = app.test_client()
+        barrier.wait()
+        response = client.post("/api/appointments", json=body, headers=tutor_headers)
+        statuses.append(response.status_code)
+
+    threads = [threading.Thread(target=book) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(statuses) == [201] + [409] * (workers - 1)
+    assert Appointment.query.filter_by(vet_id=vet_id).count() == 1
+
+
+def test_confirm_returns_the_committed_row_and_notifies(client, vet_and_tutor):
+    vet_headers, vet_id, _, tutor_id = vet_and_tutor
+    _seed_appointments(vet_id, tutor_id, 1)
+    appointment = Appointment.query.one()
+    before = appointment.updated_at
+
+    response = client.patch(
+        f"/api/appointments/{appointment.id}/confirm", headers=vet_headers
+    )
+    assert response.status_code == 200, response.json
+
+    db.session.expire_all()
+    appointment = db.session.get(Appointment, appointment.id)
+    assert appointment.status == response.json["status"] == "CONFIRMED"
+    assert appointment.updated_at > before
+    assert response.json["updated_at"] == appointment.updated_at.isoformat()
+
+    titles = [n.title for n in Notification.query.filter_by(user_id=tutor_id)]
+    assert titles == ["Consulta confirmada"]
+
@@ -0,0 +1,195 @@
+# backend/tests/test_availability.py
+
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from extensions import db
+from models import Appointment, Pet
+from services.availability import merge_intervals, subtract_intervals
+
+
+@pytest.fixture
+def vet_and_pet(register):
+    vet_headers, vet_id = register("Dra. Ana", "ana@vet.com", "veterinarian")
+    tutor_headers, tutor_id = register("João", "joao@x.com")
+    pet = Pet(name="Rex", owner_id=tutor_id)
+    db.session.add(pet)
+    db.session.commit()
+    return vet_headers, vet_id, tutor_headers, pet.id
+
+
+def _set_schedule(client, headers, vet_id, **body):
+    return client.put(f"/api/vets/{vet_id}/schedule", json=body, headers=headers)
+
+
+def test_availability_accepts_offset_bounds(client, app, vet_and_pet):
+    vet_headers, vet_id, tutor_headers, _ = vet_and_pet
+    app.config["DISPLAY_TIMEZONE"] = "America/Sao_Paulo"
+    response = _set_schedule(
+        client,
+        vet_headers,
+        vet_id,
+        working_hours=[{"weekday": 0, "start": "08:00", "end": "10:00"}],
+    )
+    assert response.status_code == 200, response.json
+
+    # 2030-01-07 (segunda) 11:00Z == 08:00 em São Paulo
+    response = client.get(
+        f"/api/vets/{vet_id}/availability"
+        "?from=2030-01-07T11:00:00Z&to=2030-01-07T13:00:00%2B00:00",
+        headers=tutor_headers,
+    )
+    assert response.status_code == 200, response.json
+    assert response.json["from"] == "2030-01-07T08:00:00"
+    assert [slot["start"] for slot in response.json["slots"]] == [
+        "2030-01-07T08:00:00",
+        "2030-01-07T08:30:00",
+        "2030-01-07T09:00:00",
+        "2030-01-07T09:30:00",
+    ]
+
+
+def test_create_appointment_with_offset_is_stored_as_agenda_time(
+    client, app, vet_and_pet
+):
+    _, vet_id, tutor_headers, pet_id = vet_and_pet
+    app.config["DISPLAY_TIMEZONE"] = "America/Sao_Paulo"
+
+    response = client.post(
+        "/api/appointments",
+        json={
+            "pet_id": pet_id,
+            "vet_id": vet_id,
+            "scheduled_at": "2030-01-07T17:30:00Z",
+        },
+        headers=tutor_headers,
+    )
+    assert response.status_code == 201, response.json
+
+    appointment = db.session.get(Appointment, response.json["id"])
+    assert appointment.scheduled_at == datetime(2030, 1, 7, 14, 30)
+
+    # o mesmo instante, escrito em horário local, é o mesmo horário
+    response = client.post(
+        "/api/appointments",
+        json={
+            "pet_id": pet_id,
+            "vet_id": vet_id,
+            "scheduled_at": "2030-01-07T14:30:00-03:00",
+        },
+        headers=tutor_headers,
+    )
+    assert response.status_code == 409
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"working_hours": [1]},
+        {"working_hours": {"weekday": 0}},
+        {"breaks": ["12:00"]},
+    ],
+)
+def test_schedule_rejects_non_object_items(client, vet_and_pet, body):
+    vet_headers, vet_id, _, _ = vet_and_pet
+    response = _set_schedule(client, vet_headers, vet_id, **body)
+    assert response.status_code == 400
+    assert "lista de objetos" in response.json["message"]
+
+
+def _at(minutes):
+    """Segunda 2030-01-07 08:00 + `minutes`."""
+    return datetime(2030, 1, 7, 8, 0) + timedelta(minutes=minutes)
+
+
+def test_merge_intervals_joins_overlapping_and_touching():
+    m = _at
+    assert merge_intervals([(m(60), m(90)), (m(0), m(30)), (m(30), m(45)), (m(80), m(120))]) == [
+        (m(0), m(45)),
+        (m(60), m(120)),
+    ]
+
+
+def test_subtract_intervals_cuts_holes_out_of_window():
+    m = _at
+    window = (m(0), m(240))
+    holes = [(m(-30), m(30)), (m(120), m(180))]
+    assert subtract_intervals(window, holes) == [(m(30), m(120)), (m(180), m(240))]
+    assert subtract_intervals(window, [(m(-10), m(300))]) == []
+
+
+def test_free_slots_skip_breaks_and_booked_appointments(client, vet_and_pet):
+    vet_headers, vet_id, tutor_headers, pet_id = vet_and_pet
+    response = _set_schedule(
+        client,
+        vet_headers,
+        vet_id,
+        working_hours=[{"weekday": 0, "start": "08:00", "end": "12:00", "slot_minutes": 30}],
+        breaks=[{"weekday": 0, "start": "10:00", "end": "11:00"}],
+    )
+    assert response.status_code == 200, response.json
+    response = client.post(
+        "/api/appointments",
+        json={"pet_id": pet_id, "vet_id": vet_id, "scheduled_at": "2030-01-07T08:30:00"},
+        headers=tutor_headers,
+    )
+    assert response.status_code == 201, response.json
+
+    slots = client.get(
+        f"/api/vets/{vet_id}/availability?from=2030-01-07&to=2030-01-07",
+        headers=tutor_headers,
+    ).json["slots"]
+    assert [slot["start"][11:16] for slot in slots] == [
+        "08:00", "09:00", "09:30", "11:00", "11:30",
+    ]
+
+
+def _book(client, headers, vet_id, pet_id, when):
+    return client.post(
+        "/api/appointments",
+        json={"pet_id": pet_id, "vet_id": vet_id, "scheduled_at": when},
+        headers=headers,
+    )
+
+
+def test_booking_overlapping_an_existing_slot_conflicts(client, vet_and_pet):
+    vet_headers, vet_id, tutor_headers, pet_id = vet_and_pet
+    _set_schedule(
+        client,
+        vet_headers,
+        vet_id,
+        working_hours=[{"weekday": 0, "start": "08:00", "end": "12:00", "slot_minutes": 30}],
+    )
+    assert _book(client, tutor_headers, vet_id, pet_id, "2030-01-07T09:00:00").status_code == 201
+
+    # 10 minutos dentro do slot de 30 já ocupado
+    assert _book(client, tutor_headers, vet_id, pet_id, "2030-01-07T09:10:00").status_code == 409
+    # logo depois do fim, livre
+    assert _book(client, tutor_headers, vet_id, pet_id, "2030-01-07T09:30:00").status_code == 201
+
+
+def test_booking_outside_working_hours_is_rejected(client, vet_and_pet):
+    vet_headers, vet_id, tutor_headers, pet_id = vet_and_pet
+    _set_schedule(
+        client,
+        vet_headers,
+        vet_id,
+        working_hours=[{"weekday": 0, "start": "08:00", "end": "12:00", "slot_minutes": 30}],
+    )
+    # depois do fim da janela e numa terça sem atendimento
+    assert _book(client, tutor_headers, vet_id, pet_id, "2030-01-07T11:45:00").status_code == 400
+    assert _book(client, tutor_headers, vet_id, pet_id, "2030-01-08T09:00:00").status_code == 400
+
+
+def test_default_window_starts_now_in_agenda_time(client, app, vet_and_pet):
+    _, vet_id, tutor_headers, _ = vet_and_pet
+    # fuso bem longe do servidor: o "agora" precisa ser o da agenda
+    app.config["DISPLAY_TIMEZONE"] = "Pacific/Kiritimati"
+    expected = datetime.now(ZoneInfo("Pacific/Kiritimati")).replace(tzinfo=None)
+
+    response = client.get(f"/api/vets/{vet_id}/availability", headers=tutor_headers)
+    assert response.status_code == 200
+    start = datetime.fromisoformat(response.json["from"])
+    assert abs(start - expected) < timedelta(minutes=2)
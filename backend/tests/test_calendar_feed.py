@@ -0,0 +1,111 @@
+# backend/tests/test_calendar_feed.py
+
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from extensions import db
+from models import Appointment, Pet
+from services import calendar_feed
+
+
+@pytest.fixture
+def feed(client, register):
+    """Vet e tutor com um agendamento (segunda 09:00) e o link do feed do tutor."""
+    vet_headers, vet_id = register("Dra. Ana", "ana@vet.com", "veterinarian")
+    tutor_headers, tutor_id = register("João", "joao@x.com")
+    pet = Pet(name="Rex", owner_id=tutor_id)
+    db.session.add(pet)
+    db.session.flush()
+    db.session.add(
+        Appointment(
+            pet_id=pet.id,
+            tutor_id=tutor_id,
+            vet_id=vet_id,
+            scheduled_at=datetime(2030, 1, 7, 9, 0),
+        )
+    )
+    db.session.commit()
+
+    token = client.post(
+        "/api/appointments/calendar/token", headers=tutor_headers
+    ).json["token"]
+    return {
+        "url": f"/api/appointments/calendar.ics?token={token}",
+        "vet_headers": vet_headers,
+        "vet_id": vet_id,
+        "tutor_headers": tutor_headers,
+        "pet_id": pet.id,
+    }
+
+
+def _get(client, feed):
+    response = client.get(feed["url"])
+    assert response.status_code == 200
+    return response
+
+
+def _set_slot_minutes(client, feed, minutes):
+    response = client.put(
+        f"/api/vets/{feed['vet_id']}/schedule",
+        json={
+            "working_hours": [
+                {"weekday": 0, "start": "08:00", "end": "12:00", "slot_minutes": minutes}
+            ]
+        },
+        headers=feed["vet_headers"],
+    )
+    assert response.status_code == 200, response.json
+
+
+def test_event_uses_the_vet_slot_minutes(client, feed):
+    assert "DTEND:20300107T093000" in _get(client, feed).get_data(as_text=True)
+
+    _set_slot_minutes(client, feed, 45)
+    assert "DTEND:20300107T094500" in _get(client, feed).get_data(as_text=True)
+
+
+def test_unchanged_feed_returns_304(client, feed):
+    etag = _get(client, feed).headers["ETag"]
+    response = client.get(feed["url"], headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+
+def test_etag_changes_when_pet_is_renamed(client, feed):
+    etag = _get(client, feed).headers["ETag"]
+    response = client.put(
+        f"/api/pets/{feed['pet_id']}", json={"name": "Thor"}, headers=feed["tutor_headers"]
+    )
+    assert response.status_code == 200
+
+    response = client.get(feed["url"], headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert "Thor" in response.get_data(as_text=True)
+
+
+def test_etag_changes_when_vet_schedule_changes(client, feed):
+    etag = _get(client, feed).headers["ETag"]
+    _set_slot_minutes(client, feed, 60)
+
+    response = client.get(feed["url"], headers={"If-None-Match": etag})
+    assert response.status_code == 200
+
+
+def test_etag_changes_when_the_window_moves(client, feed, monkeypatch):
+    etag = _get(client, feed).headers["ETag"]
+    monkeypatch.setattr(calendar_feed, "FEED_PAST_DAYS", calendar_feed.FEED_PAST_DAYS - 1)
+
+    response = client.get(feed["url"], headers={"If-None-Match": etag})
+    assert response.status_code == 200
+
+
+def test_window_starts_at_agenda_midnight(app):
+    # UTC+14: o dia da agenda já virou enquanto o servidor (UTC) ainda está no anterior
+    app.config["DISPLAY_TIMEZONE"] = "Pacific/Kiritimati"
+    today = datetime.now(ZoneInfo("Pacific/Kiritimati")).date()
+
+    expected = datetime.combine(
+        today - timedelta(days=calendar_feed.FEED_PAST_DAYS), time.min
+    )
+    assert calendar_feed._feed_since() == expected
@@ -0,0 +1,135 @@
+# backend/tests/test_extractive_summary.py
+
+from datetime import date
+
+import pytest
+
+from extensions import db
+from models import Consultation, ConsultationSummary, Pet
+from services import ai_summary_service
+from services.extractive_summary import summarize_consultations
+from services.local_llm_client import FALLBACK_SUMMARY
+
+
+def _consultation(id, day, diagnosis, treatment, next_visit=None):
+    return Consultation(
+        id=id,
+        date=day,
+        diagnosis=diagnosis,
+        treatment=treatment,
+        next_visit=next_visit,
+    )
+
+
+def test_summary_groups_recurring_diagnoses_and_recent_treatments():
+    pet = Pet(name="Rex")
+    consultations = [
+        _consultation(2, date(2030, 3, 1), "Otite; dermatite", "Gotas otológicas",
+                      next_visit=date(2030, 4, 1)),
+        _consultation(1, date(2030, 1, 10), "otite.", "Gotas otológicas"),
+        _consultation(3, date(2030, 5, 2), "Dermatíte, OTITE", "Banho terapêutico"),
+    ]
+
+    text = summarize_consultations(pet, consultations)
+
+    paragraphs = text.split("\n\n")
+    assert paragraphs[0] == "Rex tem 3 consultas registradas, entre 10/01/2030 e 02/05/2030."
+    # acento e caixa não separam o mesmo diagnóstico; grafia mais recente vence
+    assert paragraphs[1] == "Diagnósticos recorrentes: OTITE (3x), Dermatíte (2x)."
+    assert paragraphs[2] == "Diagnóstico mais recente (02/05/2030): Dermatíte, OTITE."
+    # tratamento repetido aparece uma vez, com a data mais recente
+    assert paragraphs[3] == (
+        "Tratamentos realizados: Banho terapêutico (02/05/2030); "
+        "Gotas otológicas (01/03/2030)."
+    )
+    assert paragraphs[4] == "Próximo retorno sugerido: 01/04/2030."
+
+
+def test_summary_without_consultations():
+    assert summarize_consultations(Pet(name="Rex"), []) == (
+        "Não há consultas registradas para esse pet ainda."
+    )
+
+
+@pytest.fixture
+def pet_history(register):
+    _, vet_id = register("Dra. Ana", "ana@vet.com", "veterinarian")
+    _, tutor_id = register("João", "joao@x.com")
+    pet = Pet(name="Rex", owner_id=tutor_id)
+    db.session.add(pet)
+    db.session.flush()
+    db.session.add(
+        Consultation(
+            pet_id=pet.id,
+            tutor_id=tutor_id,
+            vet_id=vet_id,
+            date=date(2030, 1, 1),
+            diagnosis="otite",
+            treatment="gotas",
+        )
+    )
+    db.session.commit()
+    return pet, Consultation.query.filter_by(pet_id=pet.id).all()
+
+
+@pytest.fixture
+def llm_calls(monkeypatch):
+    """Substitui o LLM; cada item de `replies` é a resposta da próxima chamada."""
+    calls = []
+    replies = []
+
+    def fake_generate(prompt):
+        calls.append(prompt)
+        return replies.pop(0)
+
+    monkeypatch.setattr(ai_summary_service, "generate_summary_from_prompt", fake_generate)
+    return calls, replies
+
+
+def test_extractive_engine_never_calls_the_llm(app, pet_history, llm_calls):
+    app.config["SUMMARY_ENGINE"] = ai_summary_service.ENGINE_EXTRACTIVE
+    pet, consultations = pet_history
+    calls, _ = llm_calls
+
+    text = ai_summary_service.generate_consultations_summary(pet, consultations, "tutor:1")
+
+    assert text == summarize_consultations(pet, consultations)
+    assert calls == []
+    assert ConsultationSummary.query.count() == 0
+
+
+def test_llm_failure_falls_back_to_extractive_without_caching(app, pet_history, llm_calls):
+    app.config["SUMMARY_ENGINE"] = ai_summary_service.ENGINE_LLM_WITH_EXTRACTIVE_FALLBACK
+    pet, consultations = pet_history
+    calls, replies = llm_calls
+    replies.extend([FALLBACK_SUMMARY, "Resumo do modelo"])
+
+    first = ai_summary_service.generate_consultations_summary(pet, consultations, "tutor:1")
+    assert first == summarize_consultations(pet, consultations)
+    assert ConsultationSummary.query.count() == 0
+
+    # sem cache da falha: a próxima leitura tenta o modelo de novo e cacheia
+    second = ai_summary_service.generate_consultations_summary(pet, consultations, "tutor:1")
+    assert second == "Resumo do modelo"
+    assert len(calls) == 2
+    assert [r.summary for r in ConsultationSummary.query] == ["Resumo do modelo"]
+
+
+def test_llm_engine_returns_the_failure_text_as_is(app, pet_history, llm_calls):
+    app.config["SUMMARY_ENGINE"] = ai_summary_service.ENGINE_LLM
+    pet, consultations = pet_history
+    _, replies = llm_calls
+    replies.append(FALLBACK_SUMMARY)
+
+    text = ai_summary_service.generate_consultations_summary(pet, consultations, "tutor:1")
+
+    assert text == FALLBACK_SUMMARY
+    assert ConsultationSummary.query.count() == 0
+
+
+def test_unknown_engine_uses_the_default(app):
+    app.config["SUMMARY_ENGINE"] = "gpt"
+    assert (
+        ai_summary_service.summary_engine()
+        == ai_summary_service.ENGINE_LLM_WITH_EXTRACTIVE_FALLBACK
+    )
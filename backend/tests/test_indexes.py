@@ -0,0 +1,123 @@
+# backend/tests/test_indexes.py
+
+import re
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from extensions import db
+from models import Appointment, Consultation, Notification, Pet, PetVaccine, User
+
+
+# tabelas que as listagens filtram e que precisam de índice
+HOT_TABLES = (
+    "appointments",
+    "consultations",
+    "notifications",
+    "pets",
+    "pet_vaccines",
+    "users",
+)
+
+
+@pytest.fixture
+def seeded(register):
+    vet_headers, vet_id = register("Dra. Ana", "ana@vet.com", "veterinarian")
+    tutor_headers, tutor_id = register("João", "joao@x.com")
+
+    # volume suficiente para o planejador preferir índice a ler tudo
+    db.session.add_all(
+        User(name=f"Tutor {i}", email=f"t{i}@x.com", password_hash="-", role="tutor")
+        for i in range(200)
+    )
+    pets = [Pet(name=f"Pet {i}", owner_id=tutor_id) for i in range(200)]
+    db.session.add_all(pets)
+    db.session.flush()
+
+    start = datetime(2030, 1, 7, 8, 0)
+    for i, pet in enumerate(pets):
+        db.session.add(
+            Appointment(
+                pet_id=pet.id,
+                tutor_id=tutor_id,
+                vet_id=vet_id,
+                scheduled_at=start + timedelta(hours=i),
+                status="PENDING",
+            )
+        )
+        db.session.add(
+            Consultation(
+                pet_id=pet.id,
+                tutor_id=tutor_id,
+                vet_id=vet_id,
+                date=date(2030, 1, 1) + timedelta(days=i),
+                diagnosis="ok",
+                treatment="ok",
+            )
+        )
+        db.session.add(PetVaccine(pet_id=pet.id, name="V10", date=date(2030, 1, 1)))
+        db.session.add(
+            Notification(user_id=tutor_id, type="info", title="t", message="m")
+        )
+    db.session.commit()
+
+    # estatísticas para o planejador (ANALYZE vale para SQLite e PostgreSQL)
+    with db.engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+
+    return {
+        "vet": vet_headers,
+        "tutor": tutor_headers,
+        "pet_id": pets[0].id,
+    }
+
+
+def _full_scans(statement, parameters):
+    """Tabelas quentes lidas por varredura completa no plano de `statement`."""
+    with db.engine.connect() as conn:
+        if conn.dialect.name == "postgresql":
+            # com seqscan desligado, sobra seq scan só se não houver índice usável
+            conn.exec_driver_sql("SET enable_seqscan = off")
+            plan = [r[0] for r in conn.exec_driver_sql("EXPLAIN " + statement, parameters)]
+            pattern = re.compile(r"Seq Scan on (\w+)")
+        else:
+            plan = [
+                r[-1]
+                for r in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)
+            ]
+            # "SCAN t" sem USING INDEX = tabela inteira
+            pattern = re.compile(r"^SCAN (\w+)$")
+    scans = []
+    for line in plan:
+        match = pattern.search(line.strip())
+        if match and match.group(1) in HOT_TABLES:
+            scans.append(line.strip())
+    return scans
+
+
+@pytest.mark.parametrize(
+    "who, url",
+    [
+        ("vet", "/api/appointments?limit=10"),
+        ("tutor", "/api/appointments?limit=10"),
+        ("vet", "/api/consultations?limit=10"),
+        ("tutor", "/api/consultations?limit=10"),
+        ("tutor", "/api/notifications?limit=10"),
+        ("tutor", "/api/notifications/unread-count"),
+        ("tutor", "/api/pets?limit=10"),
+        ("tutor", "/api/pets/{pet_id}/vaccines"),
+        ("tutor", "/api/vets"),
+    ],
+)
+def test_list_endpoints_do_not_full_scan(client, count_queries, seeded, who, url):
+    """Todo SELECT emitido pela listagem usa índice nas tabelas quentes (EXPLAIN)."""
+    url = url.format(pet_id=seeded["pet_id"])
+    with count_queries() as statements:
+        response = client.get(url, headers=seeded[who])
+    assert response.status_code == 200, response.json
+
+    selects = [(s, p) for s, p in statements if s.lstrip().upper().startswith("SELECT")]
+    assert selects
+
+    for statement, parameters in selects:
+        assert _full_scans(statement, parameters) == [], statement
@@ -0,0 +1,69 @@
+# backend/tests/test_local_llm_client.py
+
+import time
+
+import pytest
+
+from services import local_llm_client
+
+
+class _TricklingClient:
+    """Modelo que nunca termina: um token a cada `interval` segundos."""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.closed = False
+
+    def chat(self, model, messages, stream):
+        assert stream is True
+
+        def chunks():
+            try:
+                while True:
+                    time.sleep(self.interval)
+                    yield {"message": {"content": "bla "}}
+            finally:
+                self.closed = True
+
+        return chunks()
+
+
+class _QuickClient:
+    def chat(self, model, messages, stream):
+        return iter(
+            [{"message": {"content": "Pet "}}, {"message": {"content": "saudável."}}]
+        )
+
+
+@pytest.fixture
+def trickling(app, monkeypatch):
+    app.config["LLM_TIMEOUT_SECONDS"] = 0.3
+    client = _TricklingClient()
+    monkeypatch.setattr(local_llm_client, "_get_client", lambda: client)
+    return client
+
+
+def test_generate_stops_at_total_deadline(trickling):
+    started = time.monotonic()
+    text = local_llm_client.generate_summary_from_prompt("prompt")
+
+    assert text == local_llm_client.FALLBACK_SUMMARY
+    assert time.monotonic() - started < 1.0
+    assert trickling.closed
+
+
+def test_stream_raises_after_partial_text_at_deadline(trickling):
+    pieces = []
+    started = time.monotonic()
+    with pytest.raises(local_llm_client.LLMTimeout):
+        for piece in local_llm_client.stream_summary_from_prompt("prompt"):
+            pieces.append(piece)
+
+    assert pieces
+    assert time.monotonic() - started < 1.0
+    assert trickling.closed
+
+
+def test_generate_joins_pieces_within_deadline(app, monkeypatch):
+    monkeypatch.setattr(local_llm_client, "_get_client", lambda: _QuickClient())
+    assert local_llm_client.generate_summary_from_prompt("prompt") == "Pet saudável."
@@ -0,0 +1,70 @@
+# backend/tests/test_notification_maintenance.py
+
+from datetime import datetime, timedelta
+
+from sqlalchemy.dialects import sqlite
+
+from extensions import db
+from models import Notification, NotificationArchive
+from services.notification_maintenance import (
+    MODE_ARCHIVE,
+    _duplicates_query,
+    prune_notifications,
+)
+
+
+def _add(user_id, days_ago, read=True, link="/tutor/appointment/1", title="t"):
+    n = Notification(
+        user_id=user_id,
+        type="appointment",
+        title=title,
+        message="m",
+        read=read,
+        link=link,
+        created_at=datetime.utcnow() - timedelta(days=days_ago),
+    )
+    db.session.add(n)
+    return n
+
+
+def test_prune_expires_and_collapses_only_inside_window(app, register):
+    _, user_id = register("João", "joao@x.com")
+
+    expired = _add(user_id, 100)
+    unread_old = _add(user_id, 100, read=False)
+    dup_old = _add(user_id, 30, title="repetida antiga")
+    dup_recent = _add(user_id, 2, title="repetida recente")  # dentro dos 7 dias
+    keeper = _add(user_id, 1, title="mais nova")
+    other_link = _add(user_id, 30, link="/tutor/appointment/2")
+    db.session.commit()
+    kept_ids = {unread_old.id, dup_recent.id, keeper.id, other_link.id}
+    expired_id, dup_old_id = expired.id, dup_old.id
+
+    result = prune_notifications(
+        older_than_days=90,
+        batch_size=1,
+        mode=MODE_ARCHIVE,
+        collapse=True,
+        collapse_older_than_days=7,
+        pause_seconds=0,
+    )
+
+    assert result["expired"] == 1
+    assert result["collapsed"] == 1
+    remaining = {n.id for n in Notification.query.all()}
+    assert remaining == kept_ids
+    archived = {a.id for a in NotificationArchive.query.all()}
+    assert archived == {expired_id, dup_old_id}
+
+
+def test_collapse_lookup_uses_the_collapse_index(app):
+    now = datetime.utcnow()
+    statement = _duplicates_query(now - timedelta(days=90), now - timedelta(days=7))
+    compiled = statement.compile(
+        dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    with db.engine.connect() as conn:
+        plan = " | ".join(
+            row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}")
+        )
+    assert "ix_notifications_user_id_type_read_created_at" in plan, plan
@@ -0,0 +1,98 @@
+# backend/tests/test_notification_stream.py
+
+import json
+
+import pytest
+
+from extensions import db
+from models import Notification
+from services import notification_bus
+from services.notification_bus import InMemoryBroker, unread_count_event
+from services.notifications_service import create_notification
+
+
+def test_broker_fans_out_to_every_connection_of_the_user():
+    broker = InMemoryBroker()
+    first, second = broker.subscribe(1), broker.subscribe(1)
+    other = broker.subscribe(2)
+
+    broker.publish(1, unread_count_event(3))
+
+    assert first.get_nowait() == second.get_nowait() == unread_count_event(3)
+    assert other.empty()
+
+
+def test_broker_unsubscribe_stops_delivery():
+    broker = InMemoryBroker()
+    kept, dropped = broker.subscribe(1), broker.subscribe(1)
+    assert broker.connection_count() == 2
+
+    broker.unsubscribe(1, dropped)
+    broker.publish(1, unread_count_event(1))
+
+    assert broker.connection_count() == 1
+    assert kept.get_nowait() == unread_count_event(1)
+    assert dropped.empty()
+
+    broker.unsubscribe(1, kept)
+    broker.unsubscribe(1, kept)  # de novo: não falha
+    assert broker.connection_count() == 0
+
+
+def test_broker_drops_events_for_a_full_connection():
+    broker = InMemoryBroker()
+    slow = broker.subscribe(1)
+    for count in range(InMemoryBroker.MAX_PENDING_EVENTS + 5):
+        broker.publish(1, unread_count_event(count))
+    assert slow.qsize() == InMemoryBroker.MAX_PENDING_EVENTS
+
+
+@pytest.fixture
+def broker(monkeypatch):
+    """Broker novo por teste (o do processo é global)."""
+    fresh = InMemoryBroker()
+    monkeypatch.setattr(notification_bus, "_broker", fresh)
+    return fresh
+
+
+def _parse(chunk):
+    text = chunk.decode() if isinstance(chunk, bytes) else chunk
+    if text.startswith(":"):
+        return text.strip(), None
+    lines = dict(line.split(": ", 1) for line in text.strip().splitlines())
+    return lines["event"], json.loads(lines["data"])
+
+
+def test_stream_sends_count_heartbeat_and_notifications(app, client, register, broker):
+    app.config["NOTIFICATIONS_SSE_HEARTBEAT_SECONDS"] = 0.05
+    headers, user_id = register("João", "joao@x.com")
+    db.session.add(Notification(user_id=user_id, type="info", title="antiga", message="m"))
+    db.session.commit()
+    token = headers["Authorization"].split(" ", 1)[1]
+
+    # EventSource não manda header: o token vai em ?jwt=
+    response = client.get(f"/api/notifications/stream?jwt={token}", buffered=False)
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+    chunks = iter(response.response)
+
+    assert _parse(next(chunks)) == ("unread_count", {"unread_count": 1})
+    assert broker.connection_count() == 1
+    assert _parse(next(chunks)) == (": heartbeat", None)
+
+    create_notification(user_id=user_id, type="info", title="nova", message="oi")
+    db.session.commit()
+
+    event, data = _parse(next(chunks))
+    assert event == "notification"
+    assert data["notification"]["title"] == "nova"
+    assert data["unread_count"] == 2
+
+    # cliente desconectou: o finally do generator tira a assinatura
+    response.close()
+    assert broker.connection_count() == 0
+
+
+def test_stream_requires_a_token(client, broker):
+    assert client.get("/api/notifications/stream").status_code == 401
+    assert broker.connection_count() == 0
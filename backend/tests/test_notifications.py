@@ -0,0 +1,171 @@
+# backend/tests/test_notifications.py
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from extensions import db
+from models import Notification
+from services import notification_bus
+from services.notification_bus import NotificationBroker
+from services.notifications_service import create_notification
+
+
+def _seed(user_id, count):
+    start = datetime(2030, 1, 1, 12, 0)
+    db.session.add_all(
+        Notification(
+            user_id=user_id,
+            type="info",
+            title=f"n{i}",
+            message="m",
+            created_at=start + timedelta(seconds=i),
+        )
+        for i in range(count)
+    )
+    db.session.commit()
+    return [n.id for n in Notification.query.order_by(Notification.id)]
+
+
+def test_since_delta_is_ascending_and_complete_past_the_page_cap(client, register):
+    headers, user_id = register("João", "joao@x.com")
+    ids = _seed(user_id, 250)
+
+    received = []
+    since = ids[9]
+    while True:
+        body = client.get(
+            f"/api/notifications?since={since}&limit=100", headers=headers
+        ).json
+        batch = [int(n["id"]) for n in body["items"]]
+        assert batch == sorted(batch)
+        received.extend(batch)
+        if not body["has_more"]:
+            break
+        since = batch[-1]
+
+    assert received == ids[10:]
+
+
+def test_unpaginated_since_flags_more_with_header(client, register):
+    headers, user_id = register("João", "joao@x.com")
+    ids = _seed(user_id, 150)
+
+    response = client.get(f"/api/notifications?since={ids[0]}", headers=headers)
+    items = [int(n["id"]) for n in response.json]
+    assert items == ids[1:101]
+    assert response.headers.get("X-Has-More") == "1"
+
+    rest = client.get(f"/api/notifications?since={items[-1]}", headers=headers)
+    assert [int(n["id"]) for n in rest.json] == ids[101:]
+    assert "X-Has-More" not in rest.headers
+
+
+def test_since_timestamp_and_invalid_value(client, register):
+    headers, user_id = register("João", "joao@x.com")
+    ids = _seed(user_id, 5)
+
+    response = client.get(
+        "/api/notifications?since=2030-01-01T12:00:02", headers=headers
+    )
+    assert [int(n["id"]) for n in response.json] == ids[3:]
+
+    assert client.get("/api/notifications?since=ontem", headers=headers).status_code == 400
+
+
+class RecordingBroker(NotificationBroker):
+    """Guarda o que foi publicado, para conferir quando a publicação acontece."""
+
+    def __init__(self):
+        self.published = []
+
+    def publish(self, user_id, event):
+        self.published.append((user_id, event))
+
+
+@pytest.fixture
+def broker(monkeypatch):
+    recording = RecordingBroker()
+    monkeypatch.setattr(notification_bus, "_broker", recording)
+    return recording
+
+
+def _queue_for(user_ids):
+    for user_id in user_ids:
+        create_notification(user_id=user_id, type="info", title="t", message="m")
+
+
+def test_rollback_discards_queued_notifications(client, register, broker):
+    _, user_id = register("João", "joao@x.com")
+
+    _queue_for([user_id, user_id])
+    db.session.rollback()
+    db.session.commit()
+
+    assert Notification.query.count() == 0
+    assert broker.published == []
+
+
+def test_commit_writes_recipients_with_one_select_and_one_insert(
+    client, register, count_queries, broker
+):
+    ids = [register(f"U{i}", f"u{i}@x.com")[1] for i in range(5)]
+
+    _queue_for(ids + [9999])  # destinatário inexistente é descartado
+    with count_queries() as statements:
+        db.session.commit()
+
+    sql = [s.lstrip().upper() for s, _ in statements]
+    assert sum(1 for s in sql if s.startswith("SELECT USERS.ID")) == 1
+    inserts = [s for s in sql if s.startswith("INSERT INTO NOTIFICATIONS")]
+    assert len(inserts) == 1
+    assert "RETURNING" in inserts[0]
+
+    stored = Notification.query.order_by(Notification.user_id).all()
+    assert [n.user_id for n in stored] == sorted(ids)
+
+
+def test_events_are_published_only_after_commit(client, register, broker):
+    _, user_id = register("João", "joao@x.com")
+    visible_when_published = []
+
+    def publish(uid, event):
+        # outra conexão só enxerga a linha se a transação já foi confirmada
+        with db.engine.connect() as conn:
+            visible_when_published.append(
+                conn.execute(db.select(db.func.count(Notification.id))).scalar()
+            )
+        broker.published.append((uid, event))
+
+    broker.publish = publish
+
+    _queue_for([user_id])
+    db.session.commit()
+
+    assert visible_when_published == [1]
+    assert [(uid, e["event"]) for uid, e in broker.published] == [
+        (user_id, "notification")
+    ]
+
+
+def test_failed_commit_publishes_nothing(client, register, broker):
+    _, user_id = register("João", "joao@x.com")
+
+    def _fail(session):
+        raise RuntimeError("commit falhou")
+
+    _queue_for([user_id])
+    # registrado depois do listener do outbox: o INSERT já aconteceu
+    event.listen(Session, "before_commit", _fail)
+    try:
+        with pytest.raises(RuntimeError):
+            db.session.commit()
+    finally:
+        event.remove(Session, "before_commit", _fail)
+    db.session.rollback()
+    db.session.commit()
+
+    assert broker.published == []
+    assert Notification.query.count() == 0
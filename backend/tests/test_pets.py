@@ -0,0 +1,138 @@
+# backend/tests/test_pets.py
+
+from datetime import date
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from extensions import db
+from models import Pet, PetBreed, PetVaccine
+from services.text_search import search_terms, word_match
+
+
+@pytest.fixture
+def tutor(register):
+    return register("João", "joao@x.com")
+
+
+def _seed_pets(owner_id, count):
+    """Cria `count` pets, cada um com duas raças e uma vacina."""
+    pets = [
+        Pet(
+            name=f"Pet {i}",
+            owner_id=owner_id,
+            breeds=[PetBreed(name="SRD"), PetBreed(name="Poodle")],
+            vaccines=[PetVaccine(name="V10", date=date(2025, 1, 1))],
+        )
+        for i in range(count)
+    ]
+    db.session.add_all(pets)
+    db.session.commit()
+    return pets
+
+
+def _list_statements(client, headers, count_queries, count):
+    with count_queries() as statements:
+        response = client.get(f"/api/pets?limit={count}", headers=headers)
+    assert response.status_code == 200
+    items = response.json["items"]
+    assert len(items) == count
+    assert all(sorted(item["breeds"]) == ["Poodle", "SRD"] for item in items)
+    return len(statements)
+
+
+def test_list_query_count_does_not_grow_with_pets(client, count_queries, tutor):
+    headers, tutor_id = tutor
+
+    _seed_pets(tutor_id, 3)
+    small = _list_statements(client, headers, count_queries, 3)
+
+    _seed_pets(tutor_id, 47)
+    large = _list_statements(client, headers, count_queries, 50)
+
+    # página de pets + raças de todos eles (IN)
+    assert small == large == 2
+
+
+def test_detail_loads_breeds_and_vaccines_in_fixed_queries(client, count_queries, tutor):
+    headers, tutor_id = tutor
+    pet = _seed_pets(tutor_id, 1)[0]
+
+    with count_queries() as statements:
+        response = client.get(f"/api/pets/{pet.id}", headers=headers)
+    assert response.status_code == 200
+    assert len(response.json["vaccines"]) == 1
+
+    # pet + raças + vacinas
+    assert len(statements) == 3
+
+
+def test_keyset_pages_cover_every_pet_once(client, tutor):
+    headers, tutor_id = tutor
+    pets = _seed_pets(tutor_id, 120)
+    # mesmo created_at para todos: o desempate é o id
+    for pet in pets:
+        pet.created_at = pets[0].created_at
+    db.session.commit()
+
+    seen = []
+    cursor = None
+    while True:
+        url = "/api/pets?limit=50" + (f"&cursor={cursor}" if cursor else "")
+        body = client.get(url, headers=headers).json
+        seen.extend(item["id"] for item in body["items"])
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+
+    assert sorted(seen) == sorted(pet.id for pet in pets)
+    assert seen == sorted(seen, reverse=True)
+
+
+def test_created_at_is_required():
+    assert Pet.__table__.c.created_at.nullable is False
+
+
+@pytest.mark.parametrize(
+    "query, terms",
+    [
+        ("%", []),
+        ("_ \\ %_", []),
+        ("Réx %", ["rex"]),
+        ("a%b jo_ão", ["ab", "joao"]),
+    ],
+)
+def test_search_terms_drop_words_that_were_only_wildcards(query, terms):
+    assert search_terms(query) == terms
+
+
+def test_wildcard_only_words_do_not_match_everything(client, tutor):
+    headers, tutor_id = tutor
+    db.session.add_all(
+        [
+            Pet(name="Rex", owner_id=tutor_id),
+            Pet(name="Thor", owner_id=tutor_id),
+            Pet(name="Mel", owner_id=tutor_id, breeds=[PetBreed(name="Shih-tzu")]),
+        ]
+    )
+    db.session.commit()
+
+    def names(q):
+        response = client.get("/api/pets", query_string={"q": q, "limit": 50}, headers=headers)
+        assert response.status_code == 200
+        return sorted(item["name"] for item in response.json["items"])
+
+    assert names("rex %") == ["Rex"]
+    assert names("_ THÓR") == ["Thor"]
+    assert names("shih") == ["Mel"]
+    assert names("joão") == ["Mel", "Rex", "Thor"]  # nome do tutor
+
+
+def test_word_match_adds_trigram_similarity_on_postgresql():
+    sql = str(
+        word_match(Pet.name_search, "toby", fuzzy=True).compile(dialect=postgresql.dialect())
+    )
+    assert "<%" in sql
+    # termos curtos ficam só no prefixo
+    short = str(word_match(Pet.name_search, "to", fuzzy=True).compile(dialect=postgresql.dialect()))
+    assert "<%" not in short
@@ -0,0 +1,69 @@
+# backend/tests/test_recurrence.py
+
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from extensions import db
+from models import Pet
+from services.recurrence import RecurrenceError, expand, parse_rrule
+
+
+MONDAY = datetime(2025, 11, 3, 14, 30)
+
+
+@pytest.mark.parametrize("until", ["20251124", "2025-11-24"])
+def test_date_only_until_includes_the_whole_day(until):
+    rule = parse_rrule(f"FREQ=WEEKLY;UNTIL={until}")
+    assert expand(MONDAY, rule)[-1] == datetime(2025, 11, 24, 14, 30)
+    assert len(expand(MONDAY, rule)) == 4
+
+
+def test_utc_until_is_converted_to_agenda_time():
+    zone = ZoneInfo("America/Sao_Paulo")
+    # 24/11 17:30Z == 14:30 em São Paulo: a última segunda entra
+    rule = parse_rrule("FREQ=WEEKLY;UNTIL=20251124T173000Z", zone)
+    assert rule.until == datetime(2025, 11, 24, 14, 30)
+    assert expand(MONDAY, rule)[-1] == datetime(2025, 11, 24, 14, 30)
+
+    # 24/11 17:00Z == 14:00: a última segunda fica de fora
+    rule = parse_rrule("FREQ=WEEKLY;UNTIL=2025-11-24T17:00:00+00:00", zone)
+    assert expand(MONDAY, rule)[-1] == datetime(2025, 11, 17, 14, 30)
+
+
+def test_utc_until_without_zone_is_rejected():
+    with pytest.raises(RecurrenceError):
+        parse_rrule("FREQ=WEEKLY;UNTIL=20300401T000000Z")
+
+
+def test_invalid_until_is_rejected():
+    with pytest.raises(RecurrenceError):
+        parse_rrule("FREQ=WEEKLY;UNTIL=amanha")
+
+
+def test_series_endpoint_accepts_utc_until(client, app, register):
+    app.config["DISPLAY_TIMEZONE"] = "America/Sao_Paulo"
+    _, vet_id = register("Dra. Ana", "ana@vet.com", "veterinarian")
+    tutor_headers, tutor_id = register("João", "joao@x.com")
+    pet = Pet(name="Rex", owner_id=tutor_id)
+    db.session.add(pet)
+    db.session.commit()
+
+    response = client.post(
+        "/api/appointments/series",
+        json={
+            "pet_id": pet.id,
+            "vet_id": vet_id,
+            "scheduled_at": "2030-01-07T14:30:00",
+            "rrule": "FREQ=WEEKLY;UNTIL=20300128T173000Z",
+        },
+        headers=tutor_headers,
+    )
+    assert response.status_code == 201, response.json
+    assert [a["scheduled_at"] for a in response.json["appointments"]] == [
+        "2030-01-07T14:30:00",
+        "2030-01-14T14:30:00",
+        "2030-01-21T14:30:00",
+        "2030-01-28T14:30:00",
+    ]
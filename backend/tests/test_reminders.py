@@ -0,0 +1,129 @@
+# backend/tests/test_reminders.py
+
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from extensions import db
+from models import Appointment, Consultation, Notification, Pet, PetVaccine, ReminderSent
+from services import reminders
+from services.reminders import run_reminders
+
+
+NOW = datetime(2030, 1, 7, 8, 0)
+
+
+@pytest.fixture
+def people(register):
+    _, vet_id = register("Dra. Ana", "ana@vet.com", "veterinarian")
+    _, tutor_id = register("João", "joao@x.com")
+    return vet_id, tutor_id
+
+
+def _pet(tutor_id, name="Rex"):
+    pet = Pet(name=name, owner_id=tutor_id)
+    db.session.add(pet)
+    db.session.flush()
+    return pet
+
+
+def _appointments(vet_id, tutor_id, count, first=NOW + timedelta(hours=2)):
+    for i in range(count):
+        pet = _pet(tutor_id, f"Pet {i}")
+        db.session.add(
+            Appointment(
+                pet_id=pet.id,
+                tutor_id=tutor_id,
+                vet_id=vet_id,
+                scheduled_at=first + timedelta(minutes=30 * i),
+            )
+        )
+    db.session.commit()
+
+
+def _titles(tutor_id):
+    return sorted(
+        title
+        for (title,) in db.session.query(Notification.title).filter_by(user_id=tutor_id)
+    )
+
+
+def test_rerun_sends_one_reminder_per_item(people):
+    vet_id, tutor_id = people
+    _appointments(vet_id, tutor_id, 1)
+    pet = _pet(tutor_id)
+    db.session.add(
+        PetVaccine(
+            pet_id=pet.id, name="V10", date=date(2029, 1, 7), next_dose=date(2030, 1, 10)
+        )
+    )
+    db.session.add(
+        Consultation(
+            pet_id=pet.id,
+            tutor_id=tutor_id,
+            vet_id=vet_id,
+            date=date(2029, 12, 1),
+            diagnosis="ok",
+            treatment="nenhum",
+            next_visit=date(2030, 1, 9),
+        )
+    )
+    db.session.commit()
+
+    first = run_reminders(now=NOW)
+    second = run_reminders(now=NOW)
+
+    assert (first["appointment"], first["vaccine"], first["next_visit"]) == (1, 1, 1)
+    assert (second["appointment"], second["vaccine"], second["next_visit"]) == (0, 0, 0)
+    assert _titles(tutor_id) == [
+        "Lembrete de consulta",
+        "Próxima dose de vacina",
+        "Retorno sugerido",
+    ]
+    assert ReminderSent.query.count() == 3
+
+
+def test_conflicting_batch_does_not_stall_the_following_ones(people, monkeypatch):
+    vet_id, tutor_id = people
+    _appointments(vet_id, tutor_id, 4)
+
+    original = reminders._send_batch
+    calls = []
+
+    def racing_send(source, rows):
+        if not calls:
+            # outro processo marca o primeiro item entre a leitura e o INSERT
+            item_id, due = rows[0][0], rows[0][1]
+            db.session.add(
+                ReminderSent(
+                    kind=source.kind, item_id=item_id, due_on=due.date(), user_id=tutor_id
+                )
+            )
+            db.session.commit()
+        calls.append(len(rows))
+        return original(source, rows)
+
+    monkeypatch.setattr(reminders, "_send_batch", racing_send)
+    result = run_reminders(batch_size=2, now=NOW)
+
+    # o 1º lote é desfeito inteiro; o 2º segue normalmente
+    assert calls[:2] == [2, 2]
+    assert result["appointment"] == 2
+    assert len(_titles(tutor_id)) == 2
+
+    # a próxima varredura manda o que sobrou do lote desfeito, e só ele
+    monkeypatch.setattr(reminders, "_send_batch", original)
+    assert run_reminders(batch_size=2, now=NOW)["appointment"] == 1
+    assert len(_titles(tutor_id)) == 3
+    assert ReminderSent.query.count() == 4
+
+
+def test_default_now_is_agenda_time(app, people):
+    vet_id, tutor_id = people
+    # fuso bem longe do servidor; a consulta é daqui a 1h no horário da agenda
+    app.config["DISPLAY_TIMEZONE"] = "Pacific/Kiritimati"
+    local_now = datetime.now(ZoneInfo("Pacific/Kiritimati")).replace(tzinfo=None)
+    _appointments(vet_id, tutor_id, 1, first=local_now + timedelta(hours=1))
+
+    assert run_reminders(appointment_lead_hours=2)["appointment"] == 1
@@ -0,0 +1,49 @@
+# backend/tests/test_single_flight.py
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from services.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    started = threading.Event()
+    executions = []
+
+    def slow():
+        executions.append(1)
+        started.set()
+        time.sleep(0.2)
+        return "resumo"
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        leader = pool.submit(flight.do, "pet:1", slow)
+        started.wait()
+        followers = [pool.submit(flight.do, "pet:1", slow) for _ in range(7)]
+        results = [leader.result()] + [f.result() for f in followers]
+
+    assert executions == [1]
+    assert results[0] == ("resumo", False)
+    assert all(r == ("resumo", True) for r in results[1:])
+    stats = flight.stats()
+    assert stats["executions"] == 1
+    assert stats["coalesced"] == 7
+    assert stats["in_flight"] == 0
+
+
+def test_record_is_safe_across_threads():
+    flight = SingleFlight()
+
+    def bump():
+        for _ in range(1000):
+            flight.record("cross_process_hits")
+
+    threads = [threading.Thread(target=bump) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert flight.stats()["cross_process_hits"] == 8000
@@ -0,0 +1,42 @@
+# backend/tests/test_summary_cache.py
+
+from extensions import db
+from models import ConsultationSummary, Pet
+from services import summary_cache
+
+
+def _pet(register):
+    _, tutor_id = register("João", "joao@x.com")
+    pet = Pet(name="Rex", owner_id=tutor_id)
+    db.session.add(pet)
+    db.session.commit()
+    return pet.id, tutor_id
+
+
+def test_store_does_not_commit_callers_pending_work(app, register):
+    pet_id, tutor_id = _pet(register)
+
+    # trabalho pendente (não confirmado) de quem chama
+    db.session.add(Pet(name="Pendente", owner_id=tutor_id))
+
+    summary_cache.store(pet_id, "tutor:1", "hash-1", "Resumo", 1)
+
+    db.session.rollback()
+    assert Pet.query.filter_by(name="Pendente").count() == 0
+    # o cache foi gravado mesmo assim, na transação própria
+    assert summary_cache.get_cached(pet_id, "tutor:1", "hash-1") == "Resumo"
+
+
+def test_store_replaces_scope_and_keeps_callers_session_usable(app, register):
+    pet_id, tutor_id = _pet(register)
+
+    summary_cache.store(pet_id, "tutor:1", "hash-1", "Antigo", 1)
+    summary_cache.store(pet_id, "tutor:1", "hash-2", "Novo", 2)
+
+    rows = ConsultationSummary.query.filter_by(pet_id=pet_id, scope="tutor:1").all()
+    assert [(r.content_hash, r.summary) for r in rows] == [("hash-2", "Novo")]
+
+    # a sessão de quem chamou continua em uso normal depois das gravações
+    db.session.add(Pet(name="Depois", owner_id=tutor_id))
+    db.session.commit()
+    assert Pet.query.filter_by(name="Depois").count() == 1
@@ -0,0 +1,187 @@
+# backend/tests/test_summary_jobs.py
+
+import time
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from extensions import db
+from models import Consultation, Pet, SummaryJob
+from services import summary_jobs
+
+
+@pytest.fixture
+def pet_with_consultation(register, monkeypatch):
+    # sem LLM nos testes: a geração devolve um texto fixo
+    monkeypatch.setattr(
+        summary_jobs,
+        "generate_consultations_summary",
+        lambda pet, consultations, scope: f"Resumo de {pet.name}",
+    )
+
+    vet_headers, vet_id = register("Dra. Ana", "ana@vet.com", "veterinarian")
+    tutor_headers, tutor_id = register("João", "joao@x.com")
+
+    pet = Pet(name="Rex", owner_id=tutor_id)
+    db.session.add(pet)
+    db.session.flush()
+    db.session.add(
+        Consultation(
+            pet_id=pet.id,
+            tutor_id=tutor_id,
+            vet_id=vet_id,
+            date=date(2030, 1, 1),
+            diagnosis="otite",
+            treatment="gotas",
+        )
+    )
+    db.session.commit()
+    return pet.id, tutor_headers, vet_headers
+
+
+def _wait_for_job(client, headers, job_id, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        body = client.get(f"/api/consultations/summary/jobs/{job_id}", headers=headers).json
+        if body["status"] in (summary_jobs.STATUS_DONE, summary_jobs.STATUS_ERROR):
+            return body
+        time.sleep(0.05)
+    raise AssertionError("job não terminou")
+
+
+def test_job_state_lives_in_the_database(app, client, pet_with_consultation):
+    pet_id, tutor_headers, vet_headers = pet_with_consultation
+
+    response = client.get(
+        f"/api/consultations/summary?pet_id={pet_id}", headers=tutor_headers
+    )
+    assert response.status_code == 202
+    job_id = response.json["job_id"]
+
+    body = _wait_for_job(client, tutor_headers, job_id)
+    assert body["status"] == summary_jobs.STATUS_DONE
+    assert body["summary"] == "Resumo de Rex"
+    assert body["consultation_count"] == 1
+
+    # o estado está no banco (visível para qualquer worker), não na memória
+    db.session.expire_all()
+    row = db.session.get(SummaryJob, job_id)
+    assert row.status == summary_jobs.STATUS_DONE
+    assert row.finished_at is not None
+
+    # outro usuário não enxerga o job; id desconhecido é 404
+    other = client.get(f"/api/consultations/summary/jobs/{job_id}", headers=vet_headers)
+    assert other.status_code == 403
+    missing = client.get("/api/consultations/summary/jobs/nao-existe", headers=tutor_headers)
+    assert missing.status_code == 404
+
+
+def test_finished_jobs_are_pruned_after_ttl(app, pet_with_consultation):
+    pet_id = pet_with_consultation[0]
+    old = datetime.utcnow() - timedelta(hours=1)
+    db.session.add(
+        SummaryJob(
+            id="antigo",
+            status=summary_jobs.STATUS_DONE,
+            pet_id=pet_id,
+            user_id=1,
+            created_at=old,
+            finished_at=old,
+        )
+    )
+    db.session.commit()
+
+    summary_jobs._prune_finished_jobs(datetime.utcnow())
+    db.session.commit()
+
+    assert db.session.get(SummaryJob, "antigo") is None
+
+
+def test_failure_marking_the_job_running_ends_in_error(
+    app, client, pet_with_consultation, monkeypatch
+):
+    pet_id, tutor_headers, _ = pet_with_consultation
+    original = summary_jobs._update_job
+
+    def flaky_update(job_id, **fields):
+        if fields.get("status") == summary_jobs.STATUS_RUNNING:
+            raise RuntimeError("banco indisponível")
+        original(job_id, **fields)
+
+    monkeypatch.setattr(summary_jobs, "_update_job", flaky_update)
+
+    response = client.get(
+        f"/api/consultations/summary?pet_id={pet_id}", headers=tutor_headers
+    )
+    assert response.status_code == 202
+
+    body = _wait_for_job(client, tutor_headers, response.json["job_id"])
+    assert body["status"] == summary_jobs.STATUS_ERROR
+
+
+@pytest.fixture
+def refresh_runs(app, monkeypatch):
+    """Debounce curto e _run_refresh trocado por um registro das chamadas."""
+    app.config["SUMMARY_REFRESH_DEBOUNCE_SECONDS"] = 0.2
+    app.config["SUMMARY_ENGINE"] = "llm_with_extractive_fallback"
+    monkeypatch.setattr(summary_jobs, "_refresh_timers", {})
+    monkeypatch.setattr(
+        summary_jobs, "_refresh_stats", {"scheduled": 0, "debounced": 0, "runs": 0}
+    )
+
+    runs = []
+    monkeypatch.setattr(
+        summary_jobs, "_run_refresh", lambda app, *key: runs.append(key)
+    )
+    return runs
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return
+        time.sleep(0.02)
+    raise AssertionError("condição não atingida")
+
+
+def test_writes_in_a_row_schedule_a_single_refresh(refresh_runs):
+    viewers = [(2, "tutor"), (1, "veterinarian")]
+    for _ in range(3):
+        summary_jobs.schedule_summary_refresh(7, viewers)
+
+    stats = summary_jobs.summary_refresh_stats()
+    assert stats["pending"] == 2
+    assert stats["debounced"] == 4
+
+    _wait_for(lambda: len(refresh_runs) == 2)
+    time.sleep(0.3)
+    assert sorted(refresh_runs) == [(7, 1, "veterinarian"), (7, 2, "tutor")]
+    assert summary_jobs.summary_refresh_stats()["pending"] == 0
+
+
+def test_extractive_engine_schedules_nothing(app, refresh_runs):
+    app.config["SUMMARY_ENGINE"] = "extractive"
+
+    summary_jobs.schedule_summary_refresh(7, [(2, "tutor")])
+
+    assert summary_jobs.summary_refresh_stats()["pending"] == 0
+    assert summary_jobs.summary_refresh_stats()["scheduled"] == 0
+
+
+def test_recording_consultations_debounces_the_refresh(
+    client, pet_with_consultation, refresh_runs
+):
+    pet_id, _, vet_headers = pet_with_consultation
+    for day in ("2030-02-01", "2030-02-02"):
+        response = client.post(
+            "/api/consultations",
+            json={"pet_id": pet_id, "date": day, "diagnosis": "otite", "treatment": "gotas"},
+            headers=vet_headers,
+        )
+        assert response.status_code == 201, response.json
+
+    # uma regeneração por visualizador (tutor e vet), não uma por escrita
+    _wait_for(lambda: len(refresh_runs) == 2)
+    time.sleep(0.3)
+    assert sorted(role for _, _, role in refresh_runs) == ["tutor", "veterinarian"]
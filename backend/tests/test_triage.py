@@ -0,0 +1,313 @@
+# backend/tests/test_triage.py
+
+import json
+import os
+import random
+import time
+
+import pytest
+
+from extensions import db
+from models import Pet, Triage
+from services import triage_rules
+from services.triage_rules import (
+    LEVEL_URGENT,
+    LEVEL_WARNING,
+    KeywordAutomaton,
+    RuleMatcher,
+    TriageRule,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_rule_cache(monkeypatch):
+    """Cada teste carrega as regras do zero (o cache é global do processo)."""
+    monkeypatch.setattr(triage_rules, "_rule_set", None)
+    monkeypatch.setattr(triage_rules, "_loaded_mtime", None)
+    monkeypatch.setattr(triage_rules, "_checked_at", 0.0)
+
+
+@pytest.fixture
+def tutor_pets(register):
+    headers, tutor_id = register("João", "joao@x.com")
+    pets = [
+        Pet(name="Rex", species="cachorro", owner_id=tutor_id),
+        Pet(name="Mia", species="Gato", owner_id=tutor_id),
+    ]
+    db.session.add_all(pets)
+    db.session.commit()
+    return headers, [p.id for p in pets]
+
+
+def test_batch_writes_triages_in_one_insert_returning(client, count_queries, tutor_pets):
+    headers, (dog_id, cat_id) = tutor_pets
+    items = [
+        {"pet_id": dog_id, "symptoms": "teve uma convulsão"},
+        {"pet_id": cat_id, "symptoms": "está vomitando"},
+        {"pet_id": dog_id, "symptoms": "brincando normalmente"},
+    ]
+
+    with count_queries() as statements:
+        response = client.post("/api/triage/batch", json={"items": items}, headers=headers)
+
+    assert response.status_code == 201, response.json
+    assert [i["risk_level"] for i in response.json["items"]] == ["urgent", "monitor", "ok"]
+    assert [i["pet_id"] for i in response.json["items"]] == [dog_id, cat_id, dog_id]
+
+    triage_statements = [s.upper() for s, _ in statements if "TRIAGES" in s.upper()]
+    # nenhum SELECT para recarregar as triagens: tudo vem do RETURNING
+    assert all(s.lstrip().startswith("INSERT") and "RETURNING" in s for s in triage_statements)
+    if db.engine.dialect.name == "postgresql":
+        # um único INSERT ... VALUES (...), (...) RETURNING
+        assert len(triage_statements) == 1
+    else:
+        # o SQLite não garante a ordem do RETURNING de um INSERT múltiplo; com
+        # sort_by_parameter_order o SQLAlchemy cai para um INSERT por linha
+        assert len(triage_statements) == 3
+    assert Triage.query.count() == 3
+
+
+@pytest.mark.parametrize("symptoms", [42, ["tosse"], {"a": 1}, "   ", None])
+def test_batch_rejects_non_text_symptoms_with_index(client, tutor_pets, symptoms):
+    headers, (dog_id, _) = tutor_pets
+    items = [
+        {"pet_id": dog_id, "symptoms": "tosse"},
+        {"pet_id": dog_id, "symptoms": symptoms},
+    ]
+    response = client.post("/api/triage/batch", json={"items": items}, headers=headers)
+    assert response.status_code == 400
+    assert response.json["index"] == 1
+    assert Triage.query.count() == 0
+
+
+def test_rescore_reports_drift_and_applies(app, tutor_pets):
+    _, (dog_id, _) = tutor_pets
+    tutor_id = db.session.get(Pet, dog_id).owner_id
+    # gravada por uma versão antiga que não conhecia "convuls"
+    db.session.add_all(
+        [
+            Triage(
+                pet_id=dog_id, tutor_id=tutor_id, symptoms="teve uma convulsão",
+                risk_level="ok", ai_summary="-", recommendations="-",
+                rule_set_version="antiga",
+            ),
+            Triage(
+                pet_id=dog_id, tutor_id=tutor_id, symptoms="tudo bem",
+                risk_level="ok", ai_summary="-", recommendations="-",
+                rule_set_version="antiga",
+            ),
+        ]
+    )
+    db.session.commit()
+    runner = app.test_cli_runner()
+
+    dry = runner.invoke(args=["triage", "rescore", "--workers", "1", "--chunk-size", "1"])
+    assert dry.exit_code == 0, dry.output
+    assert "2 triagens, 1 mudaram de risco" in dry.output
+    assert "ok->urgent: 1" in dry.output
+    assert "dry-run" in dry.output
+    db.session.expire_all()
+    assert {t.risk_level for t in Triage.query} == {"ok"}
+
+    applied = runner.invoke(args=["triage", "rescore", "--workers", "1", "--apply"])
+    assert applied.exit_code == 0, applied.output
+    db.session.expire_all()
+    version = triage_rules.get_rule_set().version
+    assert sorted(t.risk_level for t in Triage.query) == ["ok", "urgent"]
+    assert {t.rule_set_version for t in Triage.query} == {version}
+
+
+# --- matcher (autômato de termos) ---
+
+def test_automaton_finds_overlapping_patterns():
+    automaton = KeywordAutomaton(["he", "she", "his", "hers"])
+    found = {automaton.patterns[i] for i in automaton.find("ushers")}
+    assert found == {"he", "she", "hers"}
+
+
+def test_automaton_word_start_ignores_matches_inside_words():
+    automaton = KeywordAutomaton(["febre", "convuls"])
+    assert automaton.find("antifebre") == {0}
+    assert automaton.find("antifebre", word_start=True) == set()
+    assert automaton.find("teve convulsões, febre", word_start=True) == {0, 1}
+
+
+def _matcher():
+    return RuleMatcher(
+        [
+            TriageRule("convulsao", LEVEL_URGENT, ("convuls",)),
+            TriageRule("vomito", LEVEL_WARNING, ("vômit",)),
+            TriageRule("inapetencia", LEVEL_WARNING, ("não come", "sem comer")),
+            TriageRule("gastro", LEVEL_WARNING, ("vômit", "diarre"), weight=0.5),
+        ]
+    )
+
+
+def test_matcher_folds_accents_and_case():
+    match = _matcher().match("VOMITANDO e Nao Come desde ontem")
+    assert match.fired == {
+        "vomito": ["vomit"],
+        "inapetencia": ["nao come"],
+        "gastro": ["vomit"],
+    }
+    assert match.warning_score == 2.5
+    assert match.urgent_score == 0
+
+
+def test_matcher_attributes_shared_terms_to_every_rule():
+    match = _matcher().match("Teve uma convulsão, vômito e diarreia")
+    assert match.fired == {
+        "convulsao": ["convuls"],
+        "vomito": ["vomit"],
+        "gastro": ["vomit", "diarre"],
+    }
+    assert match.urgent_score == 1
+    assert match.warning_score == 2
+
+
+def test_matcher_respects_word_starts():
+    assert _matcher().match("anticonvulsivante").fired == {}
+    assert _matcher().match("está sem comer").fired == {"inapetencia": ["sem comer"]}
+
+
+def _best_of(fn, text, repeats=5, calls=200):
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for _ in range(calls):
+            fn(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def test_matcher_cost_is_flat_in_the_number_of_terms():
+    rng = random.Random(7)
+
+    def rules(count):
+        return [
+            TriageRule(
+                f"r{i}",
+                LEVEL_WARNING,
+                ("".join(rng.choice("bcdfghjlmnpqrstvxz") for _ in range(8)),),
+            )
+            for i in range(count)
+        ]
+
+    text = "Meu cachorro está vomitando desde ontem e não come nada, parece com febre." * 3
+    small = _best_of(RuleMatcher(rules(25)).match, text)
+    large = _best_of(RuleMatcher(rules(5000)).match, text)
+    # uma busca por termo seria ~200x mais cara; folga larga para máquinas lentas
+    assert large < small * 4
+
+
+def test_benchmark_command_runs(app):
+    result = app.test_cli_runner().invoke(
+        args=["triage", "benchmark", "--sizes", "25,200", "--iterations", "2"]
+    )
+    assert result.exit_code == 0, result.output
+    assert len(result.output.strip().splitlines()) == 3
+
+
+# --- arquivo de regras (recarga sem restart) ---
+
+BASE_RULES = os.path.join(os.path.dirname(os.path.dirname(__file__)), "triage_rules.json")
+
+
+@pytest.fixture
+def rules_file(app, tmp_path):
+    """Cópia editável do arquivo de regras, conferida a cada chamada."""
+    path = tmp_path / "rules.json"
+    app.config["TRIAGE_RULES_PATH"] = str(path)
+    app.config["TRIAGE_RULES_RELOAD_SECONDS"] = 0
+    with open(BASE_RULES, encoding="utf-8") as f:
+        base = json.load(f)
+
+    saves = []
+
+    def save(version=None, content=None, **changes):
+        data = {**base, **changes, "version": version or base["version"]}
+        path.write_text(content if content is not None else json.dumps(data), "utf-8")
+        # mtime sempre diferente, mesmo em sistemas de arquivo com 1s de resolução
+        saves.append(None)
+        stamp = time.time() + len(saves)
+        os.utime(path, (stamp, stamp))
+
+    save("v1")
+    return save
+
+
+def test_rules_reload_when_the_file_changes(rules_file):
+    assert triage_rules.get_rule_set().version == "v1"
+    rules_file("v2")
+    assert triage_rules.get_rule_set().version == "v2"
+
+
+def test_reload_waits_for_the_check_interval(app, rules_file):
+    assert triage_rules.get_rule_set().version == "v1"
+    app.config["TRIAGE_RULES_RELOAD_SECONDS"] = 60
+    rules_file("v2")
+    assert triage_rules.get_rule_set().version == "v1"
+
+
+def test_broken_file_keeps_the_previous_version(rules_file):
+    assert triage_rules.get_rule_set().version == "v1"
+
+    rules_file(content="{ não é json")
+    assert triage_rules.get_rule_set().version == "v1"
+    rules_file("v2", texts={})  # JSON válido, mas sem os textos por nível
+    assert triage_rules.get_rule_set().version == "v1"
+
+    rules_file("v3")
+    assert triage_rules.get_rule_set().version == "v3"
+
+
+def test_broken_file_on_first_load_raises(rules_file):
+    rules_file(content="[]")
+    with pytest.raises(Exception):
+        triage_rules.get_rule_set()
+
+
+def test_species_overrides_rules_thresholds_and_texts(rules_file):
+    rules_file(
+        "v2",
+        species={
+            "gato": {
+                "rules": [{"id": "obstrucao_urinaria", "level": "urgent", "terms": ["sem urinar"]}],
+                "thresholds": {"monitor": {"warning_score": 2}},
+                "texts": {"ok": {"ai_summary": "Gato tranquilo."}},
+            }
+        },
+    )
+    rule_set = triage_rules.get_rule_set()
+
+    assert rule_set.analyze("está sem urinar", "Gato")["risk_level"] == "urgent"
+    assert rule_set.analyze("está sem urinar", "cachorro")["risk_level"] == "ok"
+
+    # um sinal de alerta basta para o cão, o gato precisa de dois
+    assert rule_set.analyze("está com febre", "cachorro")["risk_level"] == "monitor"
+    cat = rule_set.analyze("está com febre", "gato")
+    assert cat["risk_level"] == "ok"
+    assert cat["ai_summary"] == "Gato tranquilo."
+    # o que a espécie não muda vem do padrão
+    assert cat["recommendations"] == rule_set.default.texts["ok"]["recommendations"]
+
+
+def test_triage_records_the_rule_set_version(client, register, rules_file):
+    headers, tutor_id = register("João", "joao@x.com")
+    pet = Pet(name="Rex", owner_id=tutor_id)
+    db.session.add(pet)
+    db.session.commit()
+
+    first = client.post(
+        "/api/triage/", json={"pet_id": pet.id, "symptoms": "febre"}, headers=headers
+    )
+    rules_file("v2")
+    second = client.post(
+        "/api/triage/batch",
+        json={"items": [{"pet_id": pet.id, "symptoms": "febre"}]},
+        headers=headers,
+    )
+    assert first.status_code == second.status_code == 201
+
+    versions = [t.rule_set_version for t in Triage.query.order_by(Triage.id)]
+    assert versions == ["v1", "v2"]
@@ -7,13 +7,58 @@ export type ConsultationSummaryResponse = {
   summary: string;
 };
 
+// resposta 202 quando o resumo ainda está sendo gerado no backend
+type ConsultationSummaryJob = {
+  job_id: string;
+  status: "pending" | "running" | "done" | "error";
+  pet_id: number;
+  summary?: string;
+  consultation_count?: number;
+  message?: string;
+};
+
+const JOB_POLL_INTERVAL_MS = 1500;
+// prazo do polling: LLM_TIMEOUT_SECONDS do backend (120s) + fila, com folga
+const JOB_POLL_TIMEOUT_MS = 5 * 60 * 1000;
+
+function sleep(ms: number) {
+  return new Promise((resolve) => setTimeout(resolve, ms));
+}
+
 export async function getConsultationSummary(
   petId: number
 ): Promise<ConsultationSummaryResponse> {
-  return apiRequest<ConsultationSummaryResponse>(
-    `/consultations/summary?pet_id=${petId}`,
-    {
-      method: "GET",
+  const first = await apiRequest<
+    ConsultationSummaryResponse | ConsultationSummaryJob
+  >(`/consultations/summary?pet_id=${petId}`, {
+    method: "GET",
+  });
+
+  if (!("job_id" in first)) {
+    return first;
+  }
+
+  // resumo não estava em cache: acompanha o job até terminar
+  let job: ConsultationSummaryJob = first;
+  const deadline = Date.now() + JOB_POLL_TIMEOUT_MS;
+  while (job.status === "pending" || job.status === "running") {
+    if (Date.now() >= deadline) {
+      throw new Error("O resumo automático está demorando demais. Tente novamente mais tarde.");
     }
-  );
+    await sleep(JOB_POLL_INTERVAL_MS);
+    job = await apiRequest<ConsultationSummaryJob>(
+      `/consultations/summary/jobs/${job.job_id}`,
+      { method: "GET" }
+    );
+  }
+
+  if (job.status === "error") {
+    throw new Error(job.message || "Não foi possível gerar o resumo automático.");
+  }
+
+  return {
+    pet_id: job.pet_id,
+    consultation_count: job.consultation_count ?? 0,
+    summary: job.summary ?? "",
+  };
 }
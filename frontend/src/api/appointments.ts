@@ -61,4 +61,15 @@ export async function confirmAppointment(id: number): Promise<Appointment> {
   return apiRequest<Appointment>(`/appointments/${id}/confirm`, {
     method: "PATCH",
   });
-}
\ No newline at end of file
+}
+export interface CalendarFeedToken {
+  token: string;
+  url: string; // link .ics para assinar no app de calendário
+}
+
+// gera (ou troca) o link do calendário; o link antigo deixa de funcionar
+export async function rotateCalendarFeedToken(): Promise<CalendarFeedToken> {
+  return apiRequest<CalendarFeedToken>("/appointments/calendar/token", {
+    method: "POST",
+  });
+}
@@ -19,6 +19,10 @@ export async function apiRequest<T>(
   if (token && !headers.has("Authorization")) {
     headers.set("Authorization", `Bearer ${token}`);
   }
+  // fuso do aparelho, para o backend formatar horários de exibição
+  if (!headers.has("X-Timezone")) {
+    headers.set("X-Timezone", Intl.DateTimeFormat().resolvedOptions().timeZone);
+  }
 
   const response = await fetch(`${API_BASE_URL}/api${path}`, {
     ...options,
@@ -7,7 +7,8 @@ export interface Notification {
   type: NotificationType;
   title: string;
   message: string;
-  time: string;
+  time: string; // texto de exibição, no fuso do aparelho
+  created_at: string;
   read: boolean;
   link?: string | null;
 }
@@ -21,6 +22,40 @@ export async function listNotifications(): Promise<Notification[]> {
   });
 }
 
+interface NotificationDelta {
+  items: Notification[];
+  has_more: boolean;
+}
+
+// só as notificações mais novas que a última vista (id), das mais antigas
+// para as mais novas; segue pedindo enquanto o backend avisar que tem mais
+export async function listNotificationsSince(
+  lastId: string | number
+): Promise<Notification[]> {
+  const all: Notification[] = [];
+  let since = String(lastId);
+
+  for (;;) {
+    const page = await apiRequest<NotificationDelta>(
+      `${BASE_PATH}?since=${encodeURIComponent(since)}&limit=100`,
+      { method: "GET" }
+    );
+    all.push(...page.items);
+    if (!page.has_more || page.items.length === 0) {
+      return all;
+    }
+    since = String(page.items[page.items.length - 1].id);
+  }
+}
+
+export async function getUnreadNotificationsCount(): Promise<number> {
+  const data = await apiRequest<{ unread_count: number }>(
+    `${BASE_PATH}/unread-count`,
+    { method: "GET" }
+  );
+  return data.unread_count;
+}
+
 export async function markNotificationAsRead(
   id: string | number
 ): Promise<void> {
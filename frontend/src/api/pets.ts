@@ -57,12 +57,52 @@ async function handleJsonResponse<T>(response: Response): Promise<T> {
 // Pets
 // ----------------------
 
-export async function listPets(): Promise<Pet[]> {
-  const response = await fetch(`${API_BASE_URL}/api/pets`, {
+export interface PetSearchParams {
+  q?: string;
+  species?: string;
+  owner?: string | number;   // id do tutor ou parte do nome
+  clinic?: number;
+  limit?: number;
+  cursor?: string | null;
+}
+
+export interface PetPage {
+  items: Pet[];
+  next_cursor: string | null;
+}
+
+// busca no servidor (sem acentos / maiúsculas), uma página por vez
+export async function searchPets(params: PetSearchParams = {}): Promise<PetPage> {
+  const query = new URLSearchParams();
+  Object.entries({ limit: 50, ...params }).forEach(([key, value]) => {
+    if (value !== undefined && value !== null && value !== "") {
+      query.set(key, String(value));
+    }
+  });
+
+  const response = await fetch(`${API_BASE_URL}/api/pets?${query.toString()}`, {
     method: "GET",
     headers: getAuthHeaders(),
   });
-  return handleJsonResponse<Pet[]>(response);
+  return handleJsonResponse<PetPage>(response);
+}
+
+// todos os pets do tutor logado (telas do tutor), seguindo o cursor página a
+// página. Para o vet a listagem cobre a clínica inteira: use searchPets,
+// uma página por vez.
+export async function listPets(
+  params: Omit<PetSearchParams, "limit" | "cursor"> = {}
+): Promise<Pet[]> {
+  const all: Pet[] = [];
+  let cursor: string | null = null;
+
+  do {
+    const page: PetPage = await searchPets({ ...params, limit: 500, cursor });
+    all.push(...page.items);
+    cursor = page.next_cursor;
+  } while (cursor);
+
+  return all;
 }
 
 export async function getPet(id: string | number): Promise<Pet> {
@@ -14,3 +14,31 @@ export async function listVets(): Promise<VetOption[]> {
     method: "GET",
   });
 }
+
+export interface AvailabilitySlot {
+  start: string;
+  end: string;
+}
+
+export interface VetAvailability {
+  vet_id: number;
+  from: string;
+  to: string;
+  slots: AvailabilitySlot[];
+}
+
+// horários livres do vet; from/to em ISO (data ou data/hora)
+export async function getVetAvailability(
+  vetId: number,
+  from?: string,
+  to?: string
+): Promise<VetAvailability> {
+  const params = new URLSearchParams();
+  if (from) params.set("from", from);
+  if (to) params.set("to", to);
+  const query = params.toString();
+  return apiRequest<VetAvailability>(
+    `/vets/${vetId}/availability${query ? `?${query}` : ""}`,
+    { method: "GET" }
+  );
+}
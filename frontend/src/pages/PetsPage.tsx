@@ -1,8 +1,9 @@
 import React, { useEffect, useState } from "react";
-import { createPet, listPets, Pet } from "../api/pets";
+import { createPet, searchPets, Pet } from "../api/pets";
 
 const PetsPage: React.FC = () => {
   const [pets, setPets] = useState<Pet[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(false);
   const [form, setForm] = useState({
     name: "",
@@ -17,8 +18,24 @@ const PetsPage: React.FC = () => {
     setLoading(true);
     setMessage(null);
     try {
-      const data = await listPets();
-      setPets(data);
+      // só a primeira página; o resto vem sob demanda (loadMore)
+      const page = await searchPets();
+      setPets(page.items);
+      setNextCursor(page.next_cursor);
+    } catch (err: any) {
+      setMessage(err.message ?? "Erro ao carregar pets");
+    } finally {
+      setLoading(false);
+    }
+  }
+
+  async function loadMore() {
+    if (!nextCursor) return;
+    setLoading(true);
+    try {
+      const page = await searchPets({ cursor: nextCursor });
+      setPets((current) => [...current, ...page.items]);
+      setNextCursor(page.next_cursor);
     } catch (err: any) {
       setMessage(err.message ?? "Erro ao carregar pets");
     } finally {
@@ -161,6 +178,15 @@ const PetsPage: React.FC = () => {
               </li>
             ))}
           </ul>
+          {nextCursor && (
+            <button
+              onClick={loadMore}
+              disabled={loading}
+              className="w-full text-sm px-3 py-1.5 rounded-lg border bg-white hover:bg-slate-100 disabled:opacity-60"
+            >
+              {loading ? "Carregando..." : "Carregar mais"}
+            </button>
+          )}
         </section>
       </div>
     </div>
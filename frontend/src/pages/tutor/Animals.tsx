@@ -6,7 +6,7 @@ import { Button } from '@/components/ui/button';
 import { Plus, Dog } from 'lucide-react';
 import { CardAnimal } from '@/components/cards/CardAnimal';
 import { toast } from 'sonner';
-import { listPets, Pet } from '@/api/pets';
+import { searchPets, Pet } from '@/api/pets';
 
 export interface Animal {
   id: string;
@@ -61,21 +61,25 @@ const Animals = () => {
   const navigate = useNavigate();
   const [animals, setAnimals] = useState<Animal[]>([]);
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
 
-  useEffect(() => {
-    const fetchAnimals = async () => {
-      try {
-        const pets = await listPets();
-        const mapped = pets.map(mapPetToAnimal);
-        setAnimals(mapped);
-      } catch (error) {
-        console.error(error);
-        toast.error('Erro ao carregar animais');
-      } finally {
-        setLoading(false);
-      }
-    };
+  // uma página por vez; "Carregar mais" busca a seguinte pelo cursor
+  const fetchAnimals = async (cursor: string | null = null) => {
+    try {
+      setLoading(true);
+      const page = await searchPets({ cursor });
+      const mapped = page.items.map(mapPetToAnimal);
+      setAnimals((current) => (cursor ? [...current, ...mapped] : mapped));
+      setNextCursor(page.next_cursor);
+    } catch (error) {
+      console.error(error);
+      toast.error('Erro ao carregar animais');
+    } finally {
+      setLoading(false);
+    }
+  };
 
+  useEffect(() => {
     fetchAnimals();
   }, []);
 
@@ -104,13 +108,25 @@ const Animals = () => {
             </p>
           </div>
         ) : animals.length > 0 ? (
-          animals.map((animal) => (
-            <CardAnimal
-              key={animal.id}
-              animal={animal}
-              onClick={() => navigate(`/tutor/animal/${animal.id}`)}
-            />
-          ))
+          <>
+            {animals.map((animal) => (
+              <CardAnimal
+                key={animal.id}
+                animal={animal}
+                onClick={() => navigate(`/tutor/animal/${animal.id}`)}
+              />
+            ))}
+            {nextCursor && (
+              <Button
+                variant="outline"
+                className="w-full"
+                disabled={loading}
+                onClick={() => fetchAnimals(nextCursor)}
+              >
+                {loading ? 'Carregando...' : 'Carregar mais'}
+              </Button>
+            )}
+          </>
         ) : (
           <div className="mobile-card text-center py-12">
             <Dog className="w-16 h-16 text-muted-foreground mx-auto mb-4 opacity-50" />
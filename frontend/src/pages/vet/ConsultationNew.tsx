@@ -15,7 +15,7 @@ import {
 } from "@/components/ui/select";
 import { toast } from "sonner";
 
-import { listPets, type Pet } from "@/api/pets";
+import { searchPets, type Pet } from "@/api/pets";
 import { createConsultation } from "@/api/consultations";
 import {
   listAppointments,
@@ -42,6 +42,7 @@ const ConsultationNew = () => {
   const [searchParams] = useSearchParams();
 
   const [animals, setAnimals] = useState<AnimalOption[]>([]);
+  const [petQuery, setPetQuery] = useState("");
   const [appointments, setAppointments] = useState<AppointmentOption[]>([]);
 
   const [loadingPets, setLoadingPets] = useState(true);
@@ -57,14 +58,18 @@ const ConsultationNew = () => {
     nextVisit: "",
   });
 
-  // carrega pets (ainda deixo aqui, caso queira permitir consulta sem agendamento no futuro)
+  // busca pets no servidor (uma página, filtrada pelo que o vet digitou);
+  // nada de baixar a tabela inteira
   useEffect(() => {
+    let cancelled = false;
+
     const loadPets = async () => {
       try {
         setLoadingPets(true);
-        const pets: Pet[] = await listPets();
+        const page = await searchPets({ q: petQuery, limit: 50 });
+        if (cancelled) return;
 
-        const mapped: AnimalOption[] = pets.map((p) => ({
+        const mapped: AnimalOption[] = page.items.map((p: Pet) => ({
           id: String(p.id),
           name: p.name,
         }));
@@ -74,12 +79,17 @@ const ConsultationNew = () => {
         console.error("Erro ao carregar pets", error);
         toast.error("Não foi possível carregar os animais");
       } finally {
-        setLoadingPets(false);
+        if (!cancelled) setLoadingPets(false);
       }
     };
 
-    void loadPets();
-  }, []);
+    // espera o vet parar de digitar
+    const timer = setTimeout(() => void loadPets(), petQuery ? 300 : 0);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [petQuery]);
 
 // carrega agendamentos do vet para vincular consulta
 useEffect(() => {
@@ -153,6 +163,19 @@ useEffect(() => {
     ? appointments.find((a) => a.id === formData.appointmentId)
     : undefined;
 
+  // o pet do agendamento aparece no select mesmo fora da página buscada
+  const animalOptions: AnimalOption[] =
+    selectedAppointment &&
+    !animals.some((a) => a.id === String(selectedAppointment.petId))
+      ? [
+          {
+            id: String(selectedAppointment.petId),
+            name: selectedAppointment.petName,
+          },
+          ...animals,
+        ]
+      : animals;
+
   // se o vet escolher um agendamento manualmente, sincroniza animal também
   const handleSelectAppointment = (value: string) => {
     const app = appointments.find((a) => a.id === value);
@@ -257,6 +280,15 @@ useEffect(() => {
           {/* Animal (agora fica só informativo quando vem de agendamento) */}
           <div className="space-y-2">
             <Label htmlFor="animal">Animal</Label>
+            {!selectedAppointment && (
+              <Input
+                id="animal-search"
+                placeholder="Buscar pelo nome do animal, raça ou tutor"
+                value={petQuery}
+                onChange={(e) => setPetQuery(e.target.value)}
+                className="h-12"
+              />
+            )}
             <Select
               value={formData.animalId}
               onValueChange={(value) =>
@@ -272,7 +304,7 @@ useEffect(() => {
                 />
               </SelectTrigger>
               <SelectContent>
-                {animals.map((animal) => (
+                {animalOptions.map((animal) => (
                   <SelectItem key={animal.id} value={animal.id}>
                     {animal.name}
                   </SelectItem>